@@ -0,0 +1,90 @@
+"""
+Punto de entrada único para las rutas más cortas entre todos los pares.
+
+Elige entre Floyd-Warshall (Θ(n³), mejor en grafos densos o pequeños) y
+Dijkstra desde cada origen (O(n·E·log n), mejor en redes dispersas) según
+el tamaño y la densidad del grafo. Ambos devuelven el mismo formato de
+matrices de distancias y predecesores.
+
+Si el grafo no es fuertemente conexo, Floyd-Warshall usa el motor
+'condensed', que no recorre los pares que nunca pueden conectarse.
+"""
+
+from src.floyd_warshall import floyd_warshall, np
+from src.dijkstra import dijkstra_all_pairs
+from src.compact import compact_matrices
+from src.components import ReachabilityIndex
+from src.stats import STATS
+
+# Dijkstra conviene cuando el grado medio es menor que n / ratio. Con NumPy
+# Floyd-Warshall es mucho más rápido, así que el umbral es más exigente.
+DIJKSTRA_RATIO_NUMPY = 100
+DIJKSTRA_RATIO_PYTHON = 10
+
+ALGORITHMS = ('floyd', 'dijkstra')
+
+
+def choose_algorithm(graph):
+    """
+    Elige el algoritmo de rutas más cortas según tamaño y densidad.
+
+    Args:
+        graph (Graph): El grafo (o una vista por clima)
+
+    Returns:
+        str: 'floyd' o 'dijkstra'
+    """
+    n = len(graph.vertices)
+    if n == 0:
+        return 'floyd'
+    average_degree = len(graph.csr().indices) / n
+    ratio = DIJKSTRA_RATIO_NUMPY if np is not None else DIJKSTRA_RATIO_PYTHON
+    return 'dijkstra' if average_degree * ratio <= n else 'floyd'
+
+
+def all_pairs_shortest_paths(graph, algorithm='auto', engine='auto', workers=1,
+                             dist_dtype=None, path_dtype=None):
+    """
+    Calcula las rutas más cortas entre todos los pares de vértices.
+
+    Args:
+        graph (Graph): El grafo (o una vista por clima)
+        algorithm (str): 'floyd', 'dijkstra' o 'auto' para elegir según
+            el tamaño y la densidad del grafo
+        engine (str): Motor de Floyd-Warshall (ver floyd_warshall); con
+            'auto' y NumPy se usa 'condensed' si el grafo no es fuertemente
+            conexo
+        workers (int): Procesos para Dijkstra o para el motor 'blocked'
+        dist_dtype (str): Si se indica (o path_dtype), el resultado se
+            devuelve en matrices compactas (ver src/compact.py) con
+            distancias 'float32' o 'float64'
+        path_dtype (str): Tipo de los predecesores compactos ('int16',
+            'uint16', 'int32'); None o 'auto' elige el más pequeño posible
+
+    Returns:
+        tuple: (matriz_distancias, matriz_caminos)
+
+    Raises:
+        ValueError: Si el algoritmo no existe
+    """
+    if algorithm == 'auto':
+        algorithm = choose_algorithm(graph)
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo de rutas desconocido: {algorithm}")
+
+    compact = dist_dtype is not None or path_dtype is not None
+    STATS.count(f'apsp.runs.{algorithm}')
+    with STATS.phase('apsp'):
+        if algorithm == 'dijkstra':
+            return dijkstra_all_pairs(graph, workers=workers, dist_dtype=dist_dtype, path_dtype=path_dtype)
+        # Con matrices compactas los motores de NumPy no crean listas intermedias
+        options = {'workers': workers} if engine == 'blocked' else {}
+        if engine == 'auto' and np is not None:
+            index = ReachabilityIndex(graph)
+            if not index.is_strongly_connected():
+                engine = 'condensed'
+                options['index'] = index
+        dist, path = floyd_warshall(graph, engine=engine, as_lists=not compact, **options)
+        if compact:
+            return compact_matrices(dist, path, dist_dtype or 'float64', path_dtype or 'auto')
+        return dist, path
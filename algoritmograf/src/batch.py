@@ -0,0 +1,222 @@
+"""
+Consultas origen-destino por lotes, sin menú interactivo.
+
+Permite resolver millones de pares de ciudades contra las matrices de
+distancias y caminos ya calculadas. Los pares se leen y se responden por
+bloques de tamaño fijo, de modo que la memoria usada no depende del
+número de consultas: la entrada puede ser un archivo o la entrada
+estándar y la salida se escribe a medida que se resuelve cada bloque,
+en CSV o en JSON por líneas.
+
+Dentro de cada bloque los nombres se traducen a índices con un
+diccionario y, si NumPy está disponible, todas las distancias del bloque
+se obtienen con una sola indexación vectorizada.
+"""
+
+import csv
+import json
+import sys
+from collections import namedtuple
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las distancias se leen una a una
+    np = None
+
+from src.floyd_warshall import INF, reconstruct_path
+from src.stats import STATS
+
+DEFAULT_BATCH_SIZE = 65536
+
+# Estados posibles de una consulta
+STATUS_OK = 'ok'
+STATUS_UNREACHABLE = 'unreachable'
+STATUS_UNKNOWN_CITY = 'unknown_city'
+
+# Resultado de una consulta: ciudades tal como se pidieron, estado,
+# distancia (None si no hay ruta) y camino (lista de ciudades o None)
+RouteResult = namedtuple('RouteResult', ['origin', 'destination', 'status', 'distance', 'path'])
+
+OUTPUT_FORMATS = ('csv', 'jsonl')
+
+
+def read_pairs(lines):
+    """
+    Interpreta pares origen-destino, uno por línea.
+
+    Las ciudades pueden separarse con espacios o con una coma. Se ignoran
+    las líneas vacías, los comentarios (# o //) y un encabezado
+    "origen,destino". Las líneas con otro formato se informan en la salida
+    de errores y se saltan.
+
+    Args:
+        lines (iterable): Líneas de texto (por ejemplo, un archivo abierto)
+
+    Yields:
+        tuple: (ciudad_origen, ciudad_destino)
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#') or line.startswith('//'):
+            continue
+        parts = line.split(',') if ',' in line else line.split()
+        parts = [part.strip() for part in parts]
+        if len(parts) != 2 or not all(parts):
+            print(f"Formato incorrecto en línea {line_number}: {line}", file=sys.stderr)
+            continue
+        if line_number == 1 and parts[0].lower() in ('origen', 'origin'):
+            continue
+        yield parts[0], parts[1]
+
+
+class BatchRouter:
+    """
+    Resuelve lotes de consultas origen-destino sobre matrices ya calculadas.
+
+    Attributes:
+        graph (Graph): Grafo con los nombres de las ciudades
+        dist (list): Matriz de distancias más cortas
+        path (list): Matriz de caminos (predecesores)
+        router (LazyRouter): Enrutador bajo demanda que sustituye a las
+            matrices (opcional)
+    """
+
+    def __init__(self, graph, dist=None, path=None, router=None):
+        """
+        Prepara el enrutador por lotes.
+
+        Args:
+            graph (Graph): Grafo con los nombres de las ciudades
+            dist (list): Matriz de distancias más cortas
+            path (list): Matriz de caminos (predecesores)
+            router (LazyRouter): Enrutador bajo demanda; si se da, las
+                matrices no son necesarias
+
+        Raises:
+            ValueError: Si no se dan matrices ni enrutador
+        """
+        if router is None and (dist is None or path is None):
+            raise ValueError("Se necesitan las matrices de rutas o un enrutador")
+        self.graph = graph
+        self.dist = dist
+        self.path = path
+        self.router = router
+        self._dist_array = None
+
+    def _distances(self, sources, targets):
+        """
+        Distancias de un bloque de pares de índices.
+
+        Con matrices compactas se indexa una vista de NumPy sin copiarlas;
+        con listas se leen sólo las celdas del bloque. En ningún caso se
+        crea una copia n×n de la matriz.
+        """
+        if np is None or not hasattr(self.dist, 'nbytes'):
+            dist = self.dist
+            return [dist[i][j] for i, j in zip(sources, targets)]
+        if self._dist_array is None:
+            # Vista sobre la matriz compacta, en su propio tipo
+            self._dist_array = np.asarray(self.dist)
+        block = self._dist_array[np.asarray(sources, dtype=np.intp),
+                                 np.asarray(targets, dtype=np.intp)]
+        return block.astype(np.float64).tolist()
+
+    def query(self, pairs, with_paths=True, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Resuelve pares origen-destino por bloques.
+
+        Args:
+            pairs (iterable): Tuplas (ciudad_origen, ciudad_destino)
+            with_paths (bool): Reconstruir también el camino de cada par
+            batch_size (int): Pares resueltos a la vez
+
+        Yields:
+            RouteResult: Un resultado por par, en el orden de entrada
+        """
+        vertices = self.graph.vertices
+        pairs = iter(pairs)
+        while True:
+            block = list(islice(pairs, batch_size))
+            if not block:
+                return
+
+            STATS.count('batch.queries', len(block))
+            with STATS.phase('batch.block'):
+                # Traducir nombres a índices, cada nombre distinto una sola vez
+                ids = {}
+                for origin, destination in block:
+                    if origin not in ids:
+                        ids[origin] = self.graph.vertex_index(origin)
+                    if destination not in ids:
+                        ids[destination] = self.graph.vertex_index(destination)
+                known = [k for k, (origin, destination) in enumerate(block)
+                         if ids[origin] != -1 and ids[destination] != -1]
+                sources = [ids[block[k][0]] for k in known]
+                targets = [ids[block[k][1]] for k in known]
+
+                if self.router is not None:
+                    routes = [self.router.route(i, j) for i, j in zip(sources, targets)]
+                    distances = [distance for distance, _ in routes]
+                    paths = [route for _, route in routes]
+                else:
+                    distances = self._distances(sources, targets)
+                    paths = None
+
+            found = dict(zip(known, range(len(known))))
+            for k, (origin, destination) in enumerate(block):
+                position = found.get(k)
+                if position is None:
+                    yield RouteResult(origin, destination, STATUS_UNKNOWN_CITY, None, None)
+                    continue
+                distance = distances[position]
+                if distance == INF:
+                    yield RouteResult(origin, destination, STATUS_UNREACHABLE, None, None)
+                    continue
+                route = None
+                if with_paths:
+                    if paths is not None:
+                        indices = paths[position]
+                    else:
+                        indices = reconstruct_path(self.path, sources[position], targets[position])
+                    route = [vertices[idx] for idx in indices]
+                yield RouteResult(origin, destination, STATUS_OK, distance, route)
+
+
+def write_results(results, stream, output_format='csv'):
+    """
+    Escribe resultados a medida que se producen.
+
+    En CSV el camino se escribe con las ciudades separadas por " -> " y
+    los campos vacíos indican que no hay distancia o camino. En JSON por
+    líneas cada resultado es un objeto con las mismas claves.
+
+    Args:
+        results (iterable): Resultados (RouteResult)
+        stream (file): Archivo de texto de salida
+        output_format (str): 'csv' o 'jsonl'
+
+    Returns:
+        int: Número de resultados escritos
+
+    Raises:
+        ValueError: Si el formato no existe
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Formato de salida desconocido: {output_format}")
+
+    count = 0
+    if output_format == 'csv':
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(RouteResult._fields)
+        for result in results:
+            writer.writerow((result.origin, result.destination, result.status,
+                             '' if result.distance is None else result.distance,
+                             '' if result.path is None else " -> ".join(result.path)))
+            count += 1
+    else:
+        for result in results:
+            stream.write(json.dumps(result._asdict(), ensure_ascii=False))
+            stream.write('\n')
+            count += 1
+    return count
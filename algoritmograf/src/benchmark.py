@@ -0,0 +1,361 @@
+"""
+Pruebas de rendimiento con redes sintéticas y comparación con referencias.
+
+Mide cómo escalan las operaciones principales (lectura del archivo,
+rutas entre todos los pares, cambio de clima y centro del grafo) sobre
+las familias de src/generators.py, para tamaños de 10 a 10 000 ciudades.
+De cada operación se guarda el tiempo y el pico de memoria (tracemalloc)
+en un archivo JSON que sirve de referencia para comparaciones futuras.
+
+Uso:
+    python -m src.benchmark run --output referencia.json
+    python -m src.benchmark run --sizes 10 100 --compare referencia.json
+    python -m src.benchmark compare referencia.json actual.json --threshold 0.2
+
+Antes de medir una operación se proyecta su tiempo a partir del tamaño
+anterior de la misma familia (p. ej. ×(n'/n)³ para las rutas entre todos
+los pares); si la proyección supera el tiempo máximo se omite. Los casos
+con más aristas que el máximo indicado (p. ej. grafos densos de 10 000
+ciudades) también se omiten.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+from src.generators import FAMILIES, generate_edges, write_edge_file
+from src.utils import read_graph_from_file, find_graph_center
+from src.floyd_warshall import floyd_warshall, np
+from src.apsp import all_pairs_shortest_paths
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_MAX_SECONDS = 60.0
+DEFAULT_MAX_EDGES = 2_000_000
+DEFAULT_THRESHOLD = 0.2
+
+# Diferencias por debajo de estos valores se consideran ruido
+MIN_SECONDS_DELTA = 0.005
+MIN_BYTES_DELTA = 64 * 1024
+
+OPERATIONS = ('read_graph_from_file', 'set_weather_condition', 'floyd_warshall',
+              'all_pairs_shortest_paths', 'find_graph_center')
+
+# Exponente con que crece el tiempo de cada operación con n, para proyectar
+# el coste del tamaño siguiente antes de medirlo
+_GROWTH = {
+    'read_graph_from_file': 1,
+    'set_weather_condition': 1,
+    'floyd_warshall': 3,
+    'all_pairs_shortest_paths': 3,
+    'find_graph_center': 2,
+}
+
+# Aristas aproximadas de cada familia para n ciudades
+_ESTIMATED_EDGES = {
+    'sparse': lambda n: 3 * n,
+    'grid': lambda n: 4 * n,
+    'dense': lambda n: n * (n - 1) // 2,
+}
+
+
+class _Case:
+    """
+    Estado compartido por las operaciones de una familia y un tamaño.
+    """
+
+    def __init__(self, family, n, directory, seed):
+        self.family = family
+        self.n = n
+        self.filename = os.path.join(directory, f"{family}_{n}.txt")
+        self.edges = write_edge_file(generate_edges(family, n, seed), self.filename)
+        self.graph = None
+        self.dist = None
+
+    def load(self):
+        with redirect_stdout(io.StringIO()):
+            return read_graph_from_file(self.filename)
+
+    def ensure_graph(self):
+        if self.graph is None:
+            self.graph = self.load()
+        return self.graph
+
+    def ensure_distances(self):
+        if self.dist is None:
+            self.dist, _ = all_pairs_shortest_paths(self.ensure_graph())
+        return self.dist
+
+
+def _operation(case, name):
+    """
+    Prepara una operación y devuelve la función a medir.
+    """
+    if name == 'read_graph_from_file':
+        def run():
+            case.graph = case.load()
+        return run
+    graph = case.ensure_graph()
+    if name == 'set_weather_condition':
+        def run():
+            graph.set_weather_condition('tormenta')
+            graph.set_weather_condition('normal')
+        return run
+    if name == 'floyd_warshall':
+        # Sin convertir a listas: a gran escala sólo medirían la conversión
+        return lambda: floyd_warshall(graph, as_lists=False)
+    if name == 'all_pairs_shortest_paths':
+        def run():
+            case.dist, _ = all_pairs_shortest_paths(graph)
+        return run
+    if name == 'find_graph_center':
+        dist = case.ensure_distances()
+        return lambda: find_graph_center(dist, graph)
+    raise ValueError(f"Operación desconocida: {name}")
+
+
+def measure(function, memory=True):
+    """
+    Mide el tiempo y, opcionalmente, el pico de memoria de una función.
+
+    El tiempo se toma en una ejecución sin tracemalloc, que la haría más
+    lenta; el pico de memoria, en una segunda ejecución con tracemalloc.
+
+    Args:
+        function (callable): Función sin argumentos
+        memory (bool): Medir también el pico de memoria
+
+    Returns:
+        tuple: (segundos, bytes de pico o None)
+    """
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
+
+
+def projected_seconds(last, n, name):
+    """
+    Tiempo previsto de una operación en n ciudades.
+
+    Args:
+        last (tuple): (n, segundos) de la última medición, o None
+        n (int): Número de ciudades a proyectar
+        name (str): Operación (ver OPERATIONS)
+
+    Returns:
+        float: Segundos previstos; 0 si no hay medición previa
+    """
+    if last is None:
+        return 0.0
+    last_n, seconds = last
+    return seconds * (n / last_n) ** _GROWTH[name]
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, families=FAMILIES, operations=OPERATIONS,
+                   max_seconds=DEFAULT_MAX_SECONDS, max_edges=DEFAULT_MAX_EDGES,
+                   memory=True, seed=0, progress=None):
+    """
+    Ejecuta las pruebas de rendimiento.
+
+    Args:
+        sizes (iterable): Números de ciudades a probar
+        families (iterable): Familias de src/generators.py
+        operations (iterable): Operaciones a medir (ver OPERATIONS)
+        max_seconds (float): Tiempo máximo proyectado de una operación; si
+            se prevé superarlo en un tamaño, ése no se mide
+        max_edges (int): Máximo de aristas de un caso; los mayores se omiten
+        memory (bool): Medir también el pico de memoria
+        seed (int): Semilla de los generadores
+        progress (file): Archivo donde informar de cada medición (opcional)
+
+    Returns:
+        dict: {'meta': {...}, 'results': [...]} listo para guardar como JSON
+
+    Raises:
+        ValueError: Si alguna familia u operación no existe
+    """
+    for family in families:
+        if family not in FAMILIES:
+            raise ValueError(f"Familia de grafos desconocida: {family}")
+    for name in operations:
+        if name not in OPERATIONS:
+            raise ValueError(f"Operación desconocida: {name}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for family in families:
+            previous = {}  # Operación -> (n, segundos) de la última medición
+            for n in sorted(sizes):
+                skip_all = _ESTIMATED_EDGES[family](n) > max_edges
+                case = None if skip_all else _Case(family, n, directory, seed)
+                for name in operations:
+                    record = {'family': family, 'n': n, 'operation': name,
+                              'edges': None if case is None else case.edges,
+                              'seconds': None, 'peak_bytes': None, 'status': 'ok'}
+                    if case is None:
+                        record['status'] = 'skipped: too many edges'
+                    elif projected_seconds(previous.get(name), n, name) > max_seconds:
+                        record['status'] = 'skipped: projected to exceed max seconds'
+                    else:
+                        seconds, peak = measure(_operation(case, name), memory)
+                        record['seconds'] = seconds
+                        record['peak_bytes'] = peak
+                        previous[name] = (n, seconds)
+                    results.append(record)
+                    if progress is not None:
+                        print(format_record(record), file=progress, flush=True)
+                if case is not None:
+                    os.remove(case.filename)
+
+    return {'meta': environment(), 'results': results}
+
+
+def environment():
+    """
+    Datos del entorno en que se tomaron las medidas.
+
+    Returns:
+        dict: Versión de Python, de NumPy, plataforma y fecha
+    """
+    return {
+        'python': platform.python_version(),
+        'numpy': None if np is None else np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def format_record(record):
+    """
+    Una línea legible con el resultado de una medición.
+    """
+    label = f"{record['family']:<6} n={record['n']:<6} {record['operation']:<26}"
+    if record['status'] != 'ok':
+        return f"{label} {record['status']}"
+    peak = record['peak_bytes']
+    memory = '' if peak is None else f" {peak / 2**20:10.2f} MiB"
+    return f"{label} {record['seconds']:10.4f} s{memory}"
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Busca regresiones de tiempo o memoria respecto a una referencia.
+
+    Una medida es una regresión si supera a la de referencia en más de la
+    fracción threshold y la diferencia no es despreciable.
+
+    Args:
+        baseline (dict): Resultados de referencia (de run_benchmarks)
+        current (dict): Resultados actuales
+        threshold (float): Aumento relativo permitido (0.2 = 20 %)
+
+    Returns:
+        list: Diccionarios con family, n, operation, metric, baseline,
+              current y ratio de cada regresión
+    """
+    reference = {(r['family'], r['n'], r['operation']): r
+                 for r in baseline['results'] if r['status'] == 'ok'}
+    regressions = []
+    for record in current['results']:
+        base = reference.get((record['family'], record['n'], record['operation']))
+        if base is None or record['status'] != 'ok':
+            continue
+        for metric, min_delta in (('seconds', MIN_SECONDS_DELTA), ('peak_bytes', MIN_BYTES_DELTA)):
+            old, new = base.get(metric), record.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > min_delta:
+                regressions.append({'family': record['family'], 'n': record['n'],
+                                    'operation': record['operation'], 'metric': metric,
+                                    'baseline': old, 'current': new,
+                                    'ratio': new / old if old else float('inf')})
+    return regressions
+
+
+def _print_regressions(regressions, threshold):
+    """
+    Muestra las regresiones encontradas.
+    """
+    if not regressions:
+        print(f"Sin regresiones por encima del {threshold:.0%}.")
+        return
+    print(f"Regresiones por encima del {threshold:.0%}:")
+    for item in regressions:
+        print(f"  {item['family']:<6} n={item['n']:<6} {item['operation']:<26} "
+              f"{item['metric']:<10} {item['baseline']:.4g} -> {item['current']:.4g} "
+              f"(x{item['ratio']:.2f})")
+
+
+def _load(filename):
+    with open(filename, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    Returns:
+        int: 0 si no hay regresiones, 1 si las hay
+    """
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento con redes sintéticas")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="ejecutar las pruebas y guardar los resultados")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    run_parser.add_argument('--families', nargs='+', choices=FAMILIES, default=list(FAMILIES))
+    run_parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=list(OPERATIONS))
+    run_parser.add_argument('--max-seconds', type=float, default=DEFAULT_MAX_SECONDS)
+    run_parser.add_argument('--max-edges', type=int, default=DEFAULT_MAX_EDGES)
+    run_parser.add_argument('--no-memory', dest='memory', action='store_false',
+                            help="no medir el pico de memoria (más rápido)")
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--output', help="archivo JSON donde guardar los resultados")
+    run_parser.add_argument('--compare', metavar='REFERENCIA',
+                            help="comparar con un archivo JSON de referencia")
+    run_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    compare_parser = commands.add_parser('compare', help="comparar dos archivos de resultados")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        regressions = compare(_load(args.baseline), _load(args.current), args.threshold)
+        _print_regressions(regressions, args.threshold)
+        return 1 if regressions else 0
+
+    results = run_benchmarks(args.sizes, args.families, args.operations, args.max_seconds,
+                             args.max_edges, args.memory, args.seed, progress=sys.stdout)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"Resultados guardados en {args.output}")
+    if args.compare:
+        regressions = compare(_load(args.compare), results, args.threshold)
+        _print_regressions(regressions, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Floyd-Warshall por bloques (tiles) en varios núcleos.
+
+La matriz n×n se divide en bloques de tamaño fijo y cada ronda kb se
+resuelve en tres fases:
+1. El bloque diagonal (kb, kb)
+2. Los bloques de la fila kb y de la columna kb
+3. El resto de bloques
+
+Los bloques de una misma fase son independientes entre sí, por lo que se
+reparten en un pool de procesos que trabaja sobre memoria compartida
+(distancias y predecesores), sin copiar las matrices entre procesos.
+"""
+
+import os
+from multiprocessing import Pool, shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él este motor no está disponible
+    np = None
+
+from src.stats import STATS
+
+DEFAULT_TILE_SIZE = 64
+
+# Vistas de las matrices compartidas dentro de cada proceso trabajador
+_worker_state = {}
+
+
+def _relax_tile(dist, path, rows, cols, ks):
+    """
+    Relaja un bloque de la matriz usando los vértices intermedios ks.
+
+    Args:
+        dist (numpy.ndarray): Matriz de distancias (se modifica en sitio)
+        path (numpy.ndarray): Matriz de predecesores (se modifica en sitio)
+        rows (slice): Filas del bloque
+        cols (slice): Columnas del bloque
+        ks (range): Vértices intermedios de la ronda actual
+    """
+    block = dist[rows, cols]
+    block_path = path[rows, cols]
+    for k in ks:
+        candidate = dist[rows, k][:, np.newaxis] + dist[k, cols]
+        improved = candidate < block
+        np.copyto(block, candidate, where=improved)
+        np.copyto(block_path, np.broadcast_to(path[k, cols].copy(), block.shape), where=improved)
+
+
+def _tile_range(block_index, tile_size, n):
+    """
+    Convierte un índice de bloque en el rango de vértices que cubre.
+    """
+    start = block_index * tile_size
+    return slice(start, min(start + tile_size, n))
+
+
+def _run_task(dist, path, task):
+    """
+    Ejecuta una tarea de una fase sobre las matrices dadas.
+
+    Una tarea es (kb, ib, jbs, tile_size): relaja los bloques (ib, jb) para
+    cada jb de jbs usando como intermedios los vértices del bloque kb.
+    """
+    kb, ib, jbs, tile_size = task
+    n = dist.shape[0]
+    k_slice = _tile_range(kb, tile_size, n)
+    ks = range(k_slice.start, k_slice.stop)
+    rows = _tile_range(ib, tile_size, n)
+    for jb in jbs:
+        _relax_tile(dist, path, rows, _tile_range(jb, tile_size, n), ks)
+
+
+def _init_worker(dist_name, path_name, n):
+    """
+    Inicializa un proceso trabajador enlazando la memoria compartida.
+    """
+    dist_shm = shared_memory.SharedMemory(name=dist_name)
+    path_shm = shared_memory.SharedMemory(name=path_name)
+    _worker_state['shm'] = (dist_shm, path_shm)
+    _worker_state['dist'] = np.ndarray((n, n), dtype=np.float64, buffer=dist_shm.buf)
+    _worker_state['path'] = np.ndarray((n, n), dtype=np.int64, buffer=path_shm.buf)
+
+
+def _worker_task(task):
+    """
+    Punto de entrada de cada tarea en el pool de procesos.
+    """
+    _run_task(_worker_state['dist'], _worker_state['path'], task)
+
+
+def _phase_tasks(kb, num_blocks, tile_size):
+    """
+    Genera las tareas de las fases 2 y 3 para la ronda kb.
+
+    Returns:
+        tuple: (tareas_fase_2, tareas_fase_3)
+    """
+    others = [b for b in range(num_blocks) if b != kb]
+    # Fase 2: cada bloque de la fila kb y cada bloque de la columna kb
+    phase2 = [(kb, kb, [jb], tile_size) for jb in others]
+    phase2 += [(kb, ib, [kb], tile_size) for ib in others]
+    # Fase 3: una tarea por fila de bloques para reducir la comunicación
+    phase3 = [(kb, ib, others, tile_size) for ib in others]
+    return phase2, phase3
+
+
+def _blocked_rounds(dist, path, tile_size, run_phase):
+    """
+    Recorre las rondas del algoritmo por bloques.
+
+    Args:
+        dist (numpy.ndarray): Matriz de distancias
+        path (numpy.ndarray): Matriz de predecesores
+        tile_size (int): Tamaño de bloque
+        run_phase (callable): Función que ejecuta una lista de tareas
+    """
+    n = dist.shape[0]
+    num_blocks = (n + tile_size - 1) // tile_size
+    for kb in range(num_blocks):
+        # Fase 1: bloque diagonal, siempre en el proceso principal
+        _run_task(dist, path, (kb, kb, [kb], tile_size))
+        phase2, phase3 = _phase_tasks(kb, num_blocks, tile_size)
+        run_phase(phase2)
+        run_phase(phase3)
+
+
+def blocked_floyd_warshall(graph, tile_size=DEFAULT_TILE_SIZE, workers=None, as_lists=True):
+    """
+    Floyd-Warshall por bloques usando varios procesos y memoria compartida.
+
+    Args:
+        graph (Graph): El grafo a analizar
+        tile_size (int): Tamaño de los bloques (vértices por lado)
+        workers (int): Número de procesos; None usa todos los núcleos y
+            1 ejecuta todo en el proceso actual
+        as_lists (bool): Si es False devuelve arreglos de NumPy en lugar
+            de listas
+
+    Returns:
+        tuple: (matriz_distancias, matriz_caminos) para las rutas más cortas
+
+    Raises:
+        ImportError: Si NumPy no está instalado
+        ValueError: Si tile_size o workers no son positivos
+    """
+    if np is None:
+        raise ImportError("El motor 'blocked' requiere tener NumPy instalado")
+    if tile_size < 1:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("El número de procesos debe ser positivo")
+
+    n = len(graph.vertices)
+    if n == 0:
+        return [], []
+
+    # Las mejoras ocurren dentro de los procesos trabajadores y no se cuentan
+    STATS.count('apsp.relaxations_attempted', n ** 3)
+    initial = np.array(graph.adjacency_matrix, dtype=np.float64)
+    num_blocks = (n + tile_size - 1) // tile_size
+
+    # Con un solo proceso o un solo bloque no compensa crear el pool
+    if workers == 1 or num_blocks == 1:
+        dist = initial
+        path = np.where(np.isinf(dist), -1, np.arange(n)[:, np.newaxis])
+        _blocked_rounds(dist, path, tile_size,
+                        lambda tasks: [_run_task(dist, path, t) for t in tasks])
+        if not as_lists:
+            return dist, path
+        return dist.tolist(), path.tolist()
+
+    dist_shm = shared_memory.SharedMemory(create=True, size=initial.nbytes)
+    path_shm = shared_memory.SharedMemory(create=True, size=n * n * np.dtype(np.int64).itemsize)
+    dist = path = None
+    try:
+        dist = np.ndarray((n, n), dtype=np.float64, buffer=dist_shm.buf)
+        path = np.ndarray((n, n), dtype=np.int64, buffer=path_shm.buf)
+        dist[:] = initial
+        path[:] = np.where(np.isinf(initial), -1, np.arange(n)[:, np.newaxis])
+        del initial
+
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(dist_shm.name, path_shm.name, n)) as pool:
+            _blocked_rounds(dist, path, tile_size,
+                            lambda tasks: pool.map(_worker_task, tasks))
+
+        if not as_lists:
+            # Copiar fuera de la memoria compartida antes de liberarla
+            return dist.copy(), path.copy()
+        return dist.tolist(), path.tolist()
+    finally:
+        # Las vistas deben soltarse antes de cerrar la memoria compartida
+        dist = path = None
+        dist_shm.close()
+        dist_shm.unlink()
+        path_shm.close()
+        path_shm.unlink()
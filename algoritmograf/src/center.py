@@ -0,0 +1,235 @@
+"""
+Excentricidades, centro, radio y diámetro del grafo.
+
+La excentricidad de una ciudad es la mayor distancia más corta desde ella
+a cualquier otra (infinita si alguna es inalcanzable). El centro es la
+ciudad de menor excentricidad, el radio esa excentricidad mínima y el
+diámetro la máxima.
+
+Cada excentricidad es una reducción por fila de la matriz de distancias
+(el máximo de la fila sin la diagonal). CenterIndex las guarda y, tras una
+actualización incremental de rutas, sólo recalcula las filas que cambiaron.
+"""
+
+import heapq
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las filas se reducen con max()
+    np = None
+
+from src.components import strongly_connected_components
+from src.stats import STATS
+
+INF = float('inf')
+
+
+def row_eccentricity(row, i):
+    """
+    Excentricidad del vértice i a partir de su fila de distancias.
+
+    La diagonal no cuenta: suele ser 0, pero con un lazo es la longitud
+    del ciclo más corto que vuelve a i.
+
+    Args:
+        row: Fila i de la matriz de distancias (lista o vista compacta)
+        i (int): Índice del vértice
+
+    Returns:
+        float: Mayor distancia de i a otro vértice; 0 si no hay otros
+    """
+    if len(row) <= 1:
+        return 0.0
+    eccentricity = max(row)
+    if row[i] == eccentricity and eccentricity > 0:
+        # Sólo si la diagonal es el máximo hay que repetir sin ella
+        eccentricity = max(max(row[:i], default=0.0), max(row[i + 1:], default=0.0))
+    return eccentricity
+
+
+def eccentricities(dist):
+    """
+    Excentricidades de todos los vértices.
+
+    Con NumPy y una matriz compacta (ver src/compact.py) la reducción se
+    hace sobre la matriz completa sin copiarla; en otro caso, fila a fila.
+
+    Args:
+        dist: Matriz de distancias más cortas
+
+    Returns:
+        list: Excentricidad de cada vértice
+    """
+    n = len(dist)
+    if np is None or n <= 1 or not hasattr(dist, 'nbytes'):
+        return [row_eccentricity(dist[i], i) for i in range(n)]
+
+    matrix = np.asarray(dist)
+    result = matrix.max(axis=1).astype(np.float64)
+    diagonal = matrix.diagonal()
+    for i in np.nonzero((diagonal == result) & (diagonal > 0))[0].tolist():
+        result[i] = row_eccentricity(dist[i], i)
+    return result.tolist()
+
+
+def graph_center(dist):
+    """
+    Índice del vértice de menor excentricidad.
+
+    Args:
+        dist: Matriz de distancias más cortas
+
+    Returns:
+        int: Índice del centro, o None si ningún vértice alcanza a todos
+    """
+    return CenterIndex(dist).center()
+
+
+class CenterIndex:
+    """
+    Excentricidades de una matriz de distancias, mantenidas bajo demanda.
+
+    Attributes:
+        dist: Matriz de distancias cuyas excentricidades se guardan
+    """
+
+    def __init__(self, dist):
+        """
+        Calcula las excentricidades de la matriz.
+
+        Args:
+            dist: Matriz de distancias más cortas (listas o compacta)
+        """
+        self.dist = dist
+        with STATS.phase('center.compute'):
+            self._eccentricities = eccentricities(dist)
+
+    @classmethod
+    def from_eccentricities(cls, dist, values):
+        """
+        Crea el índice con excentricidades ya calculadas, sin leer la matriz.
+
+        Args:
+            dist: Matriz de distancias a la que corresponden
+            values (list): Excentricidad de cada vértice
+
+        Returns:
+            CenterIndex: El índice
+        """
+        index = cls.__new__(cls)
+        index.dist = dist
+        index._eccentricities = list(values)
+        return index
+
+    def refresh(self, rows=None):
+        """
+        Recalcula las excentricidades tras un cambio en la matriz.
+
+        Args:
+            rows (iterable): Filas modificadas; None (o un cambio en el
+                número de vértices) las recalcula todas
+        """
+        with STATS.phase('center.refresh'):
+            if rows is None or len(self._eccentricities) != len(self.dist):
+                self._eccentricities = eccentricities(self.dist)
+                return
+            for i in rows:
+                self._eccentricities[i] = row_eccentricity(self.dist[i], i)
+
+    def eccentricities(self):
+        """
+        Returns:
+            list: Excentricidad de cada vértice (copia)
+        """
+        return list(self._eccentricities)
+
+    def eccentricity(self, i):
+        """
+        Returns:
+            float: Excentricidad del vértice i
+        """
+        return self._eccentricities[i]
+
+    def center(self):
+        """
+        Vértice de menor excentricidad; ante empates, el de menor índice.
+
+        Returns:
+            int: Índice del centro, o None si ningún vértice alcanza a todos
+        """
+        best = self.radius()
+        if best == INF:
+            return None
+        return self._eccentricities.index(best)
+
+    def radius(self):
+        """
+        Returns:
+            float: Menor excentricidad (infinita si el grafo está vacío o
+                   ningún vértice alcanza a todos)
+        """
+        return min(self._eccentricities, default=INF)
+
+    def diameter(self):
+        """
+        Returns:
+            float: Mayor excentricidad (infinita si el grafo no es
+                   fuertemente conexo)
+        """
+        return max(self._eccentricities, default=INF)
+
+    def top_k(self, k):
+        """
+        Los k vértices más centrales.
+
+        Args:
+            k (int): Número de vértices
+
+        Returns:
+            list: Tuplas (índice, excentricidad) de menor a mayor
+                  excentricidad; ante empates, por índice
+        """
+        best = heapq.nsmallest(k, range(len(self._eccentricities)),
+                               key=self._eccentricities.__getitem__)
+        return [(i, self._eccentricities[i]) for i in best]
+
+    def component_centers(self, graph):
+        """
+        Centro de cada componente fuertemente conexa.
+
+        Cuando el grafo no es fuertemente conexo casi todas las
+        excentricidades son infinitas; dentro de cada componente no.
+
+        Args:
+            graph (Graph): El grafo (o la vista por clima) de la matriz
+
+        Returns:
+            list: Tuplas (índice_centro, excentricidad, componente) de la
+                  componente más grande a la más pequeña
+        """
+        # Vista sin copiar de una matriz compacta; con listas, fila a fila
+        matrix = None
+        if np is not None and hasattr(self.dist, 'nbytes'):
+            matrix = np.asarray(self.dist)
+        result = []
+        for component in strongly_connected_components(graph):
+            if len(component) == 1:
+                result.append((component[0], 0.0, component))
+                continue
+            if matrix is not None:
+                # Copia sólo de la submatriz de la componente, sin la diagonal
+                members = np.asarray(component)
+                block = matrix[np.ix_(members, members)].astype(np.float64, copy=False)
+                np.fill_diagonal(block, -INF)
+                local = block.max(axis=1)
+                best = int(local.argmin())
+                result.append((component[best], float(local[best]), component))
+                continue
+            best = None
+            for i in component:
+                row = self.dist[i]
+                eccentricity = max(row[j] for j in component if j != i)
+                if best is None or eccentricity < best[1]:
+                    best = (i, eccentricity)
+            result.append((best[0], best[1], component))
+        return result
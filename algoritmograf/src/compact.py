@@ -0,0 +1,303 @@
+"""
+Almacenamiento compacto de las matrices de distancias y predecesores.
+
+Una matriz de listas de Python ocupa un puntero de 8 bytes por celda más
+el objeto float o int al que apunta (24-32 bytes), además de la cabecera
+de cada lista. Aquí cada matriz es un único arreglo plano del módulo
+array con un tipo fijo:
+- distancias: 'float64' (resultados idénticos) o 'float32' (la mitad de
+  memoria; exacto para tiempos enteros de hasta 2**24)
+- predecesores: 'int16' o 'int32' con -1 para "sin camino", o 'uint16'
+  con el centinela 0xFFFF, que admite hasta 65535 vértices
+
+m[i] devuelve una vista de la fila i sin copiarla, de modo que el código
+que usa m[i][j] con matrices de listas funciona sin cambios.
+"""
+
+from array import array
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sólo acelera la conversión
+    np = None
+
+INF = float('inf')
+
+# Tipo de la matriz -> código de tipo del módulo array
+DISTANCE_DTYPES = {'float32': 'f', 'float64': 'd'}
+PREDECESSOR_DTYPES = {'int16': 'h', 'uint16': 'H', 'int32': 'i'}
+
+# Valor guardado para "sin camino" en cada tipo de predecesores
+_SENTINELS = {'h': -1, 'H': 0xFFFF, 'i': -1}
+
+# Mayor número de vértices que admite cada tipo de predecesores
+_MAX_VERTICES = {'int16': 0x7FFF, 'uint16': 0xFFFF, 'int32': 0x7FFFFFFF}
+
+
+def choose_predecessor_dtype(n):
+    """
+    Elige el tipo de predecesores más pequeño para n vértices.
+
+    Args:
+        n (int): Número de vértices
+
+    Returns:
+        str: 'int16' o 'int32'
+    """
+    return 'int16' if n <= _MAX_VERTICES['int16'] else 'int32'
+
+
+def _encode_predecessors(values, typecode):
+    """
+    Sustituye -1 por el centinela del tipo si no es -1.
+    """
+    if _SENTINELS.get(typecode, -1) == -1:
+        return values
+    return (value & 0xFFFF for value in values)
+
+
+class _PredecessorRow:
+    """
+    Fila de predecesores que traduce el centinela a -1.
+    """
+
+    def __init__(self, view, sentinel):
+        self._view = view
+        self._sentinel = sentinel
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, col):
+        value = self._view[col]
+        return -1 if value == self._sentinel else value
+
+    def __setitem__(self, col, value):
+        self._view[col] = self._sentinel if value == -1 else value
+
+    def __iter__(self):
+        sentinel = self._sentinel
+        return (-1 if value == sentinel else value for value in self._view)
+
+    def tolist(self):
+        return list(self)
+
+
+class _CompactMatrix:
+    """
+    Matriz cuadrada n×n guardada en un arreglo plano de tipo fijo.
+    """
+
+    def __init__(self, n, typecode, fill, data=None):
+        self._n = n
+        self._typecode = typecode
+        self._fill = fill
+        if data is None:
+            data = array(typecode, [fill]) * (n * n)
+        elif data.typecode != typecode or len(data) != n * n:
+            raise ValueError("Los datos no corresponden a una matriz n×n del tipo pedido")
+        self._data = data
+
+    def __len__(self):
+        return self._n
+
+    def _row_view(self, row):
+        if not 0 <= row < self._n:
+            raise IndexError("Índice de vértice fuera de rango")
+        start = row * self._n
+        return memoryview(self._data)[start:start + self._n]
+
+    def __iter__(self):
+        for row in range(self._n):
+            yield self[row]
+
+    def __array__(self, dtype=None, copy=None):
+        # Vista n×n de NumPy sobre el mismo arreglo; sólo se copia si se
+        # pide otro tipo o una copia explícita
+        matrix = np.frombuffer(self._data, dtype=self._data.typecode).reshape(self._n, self._n)
+        if dtype is not None and np.dtype(dtype) != matrix.dtype:
+            return matrix.astype(dtype)
+        return matrix.copy() if copy else matrix
+
+    @property
+    def nbytes(self):
+        """
+        Bytes ocupados por los valores de la matriz.
+        """
+        return len(self._data) * self._data.itemsize
+
+    def grow(self, n):
+        """
+        Amplía la matriz hasta n×n vértices en sitio.
+
+        Los vértices nuevos quedan aislados, igual que en grow_matrices:
+        sólo se alcanzan a sí mismos. Las vistas de filas obtenidas antes
+        dejan de reflejar la matriz.
+
+        Args:
+            n (int): Nuevo número de vértices
+        """
+        old_n = self._n
+        if n <= old_n:
+            return
+        data = array(self._typecode, [self._fill]) * (n * n)
+        for row in range(old_n):
+            data[row * n:row * n + old_n] = self._data[row * old_n:(row + 1) * old_n]
+        for row in range(old_n, n):
+            data[row * n + row] = self._diagonal(row)
+        self._data = data
+        self._n = n
+
+    def set_row(self, row, values):
+        """
+        Sobrescribe una fila completa.
+
+        Args:
+            row (int): Índice de la fila
+            values (iterable): n valores, con -1 para "sin camino" en los
+                predecesores
+        """
+        start = row * self._n
+        self._data[start:start + self._n] = array(self._typecode, _encode_predecessors(values, self._typecode))
+
+    def to_list(self):
+        """
+        Devuelve la matriz completa como listas de Python.
+        """
+        return [self[row].tolist() for row in range(self._n)]
+
+
+class DistanceMatrix(_CompactMatrix):
+    """
+    Matriz de distancias más cortas con tipo 'float32' o 'float64'.
+
+    Attributes:
+        dtype (str): Tipo de los valores
+    """
+
+    def __init__(self, n, dtype='float64', data=None):
+        """
+        Crea una matriz n×n, por defecto con todas las distancias infinitas.
+
+        Args:
+            n (int): Número de vértices
+            dtype (str): 'float32' o 'float64'
+            data (array): Valores fila por fila (opcional), con el código
+                de tipo de dtype
+
+        Raises:
+            ValueError: Si el tipo no existe o data no tiene n×n valores
+        """
+        if dtype not in DISTANCE_DTYPES:
+            raise ValueError(f"Tipo de distancias desconocido: {dtype}")
+        super().__init__(n, DISTANCE_DTYPES[dtype], INF, data)
+        self.dtype = dtype
+
+    def __getitem__(self, row):
+        return self._row_view(row)
+
+    def _diagonal(self, row):
+        return 0.0
+
+    def get(self, i, j):
+        """
+        Distancia más corta de i a j.
+        """
+        return self._data[i * self._n + j]
+
+
+class PredecessorMatrix(_CompactMatrix):
+    """
+    Matriz de predecesores con tipo 'int16', 'uint16' o 'int32'.
+
+    Las lecturas devuelven -1 para "sin camino" sea cual sea el centinela
+    guardado.
+
+    Attributes:
+        dtype (str): Tipo de los valores
+    """
+
+    def __init__(self, n, dtype='int32', data=None):
+        """
+        Crea una matriz n×n, por defecto sin ningún camino.
+
+        Args:
+            n (int): Número de vértices
+            dtype (str): 'int16', 'uint16' o 'int32'
+            data (array): Valores fila por fila (opcional), con el código
+                de tipo de dtype y el centinela en lugar de -1
+
+        Raises:
+            ValueError: Si el tipo no existe, no admite n vértices o data
+                no tiene n×n valores
+        """
+        if dtype not in PREDECESSOR_DTYPES:
+            raise ValueError(f"Tipo de predecesores desconocido: {dtype}")
+        if n > _MAX_VERTICES[dtype]:
+            raise ValueError(f"El tipo '{dtype}' admite como máximo {_MAX_VERTICES[dtype]} vértices")
+        typecode = PREDECESSOR_DTYPES[dtype]
+        super().__init__(n, typecode, _SENTINELS[typecode], data)
+        self.dtype = dtype
+        self.sentinel = _SENTINELS[typecode]
+
+    def __getitem__(self, row):
+        view = self._row_view(row)
+        if self.sentinel == -1:
+            return view
+        return _PredecessorRow(view, self.sentinel)
+
+    def _diagonal(self, row):
+        return row
+
+    def get(self, i, j):
+        """
+        Predecesor de j en el camino más corto desde i, o -1 si no hay camino.
+        """
+        value = self._data[i * self._n + j]
+        return -1 if value == self.sentinel else value
+
+    def grow(self, n):
+        if n > _MAX_VERTICES[self.dtype]:
+            raise ValueError(f"El tipo '{self.dtype}' admite como máximo {_MAX_VERTICES[self.dtype]} vértices")
+        super().grow(n)
+
+
+def compact_matrices(dist, path, dist_dtype='float64', path_dtype='auto'):
+    """
+    Convierte matrices de distancias y predecesores al formato compacto.
+
+    Args:
+        dist: Matriz de distancias (listas de Python o arreglo de NumPy)
+        path: Matriz de predecesores (listas de Python o arreglo de NumPy)
+        dist_dtype (str): 'float32' o 'float64'
+        path_dtype (str): 'int16', 'uint16', 'int32' o 'auto' para el más
+            pequeño que admita el número de vértices
+
+    Returns:
+        tuple: (DistanceMatrix, PredecessorMatrix)
+
+    Raises:
+        ValueError: Si algún tipo no existe o no admite el número de vértices
+    """
+    n = len(dist)
+    if path_dtype == 'auto':
+        path_dtype = choose_predecessor_dtype(n)
+    if dist_dtype not in DISTANCE_DTYPES:
+        raise ValueError(f"Tipo de distancias desconocido: {dist_dtype}")
+    if path_dtype not in PREDECESSOR_DTYPES:
+        raise ValueError(f"Tipo de predecesores desconocido: {path_dtype}")
+    dist_code = DISTANCE_DTYPES[dist_dtype]
+    path_code = PREDECESSOR_DTYPES[path_dtype]
+
+    if np is not None and isinstance(dist, np.ndarray):
+        dist_data = array(dist_code)
+        dist_data.frombytes(dist.astype(dist_code, copy=False).tobytes())
+        # Al convertir a uint16, -1 pasa a ser 0xFFFF, que es el centinela
+        path_data = array(path_code)
+        path_data.frombytes(np.asarray(path).astype(path_code).tobytes())
+    else:
+        dist_data = array(dist_code, chain.from_iterable(dist))
+        path_data = array(path_code, _encode_predecessors(chain.from_iterable(path), path_code))
+
+    return DistanceMatrix(n, dist_dtype, dist_data), PredecessorMatrix(n, path_dtype, path_data)
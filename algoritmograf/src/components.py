@@ -0,0 +1,219 @@
+"""
+Componentes fuertemente conexas del grafo y alcanzabilidad entre ciudades.
+
+Dos ciudades están en la misma componente si cada una puede llegar a la
+otra. Se calculan con el algoritmo de Tarjan en O(V + E) sobre la
+representación CSR, en versión iterativa para no agotar la pila de
+Python en redes grandes.
+
+Al contraer cada componente a un nodo queda un grafo acíclico (la
+condensación). ReachabilityIndex guarda su clausura transitiva con un
+conjunto de bits por componente, así que "¿se puede llegar de A a B?" se
+responde en O(1), y los orígenes que llegan a una ciudad (o los destinos
+alcanzables desde ella) se obtienen sin recorrer el grafo. Ocupa C² bits
+para C componentes: 1/64 de lo que ocupa una matriz de distancias.
+
+Ejemplo:
+    index = ReachabilityIndex(graph)
+    index.reachable(0, 42)  # False: la distancia será infinita
+"""
+
+from itertools import chain
+
+from src.stats import STATS
+
+INF = float('inf')
+
+
+def _tarjan(n, indptr, indices, weights):
+    """
+    Algoritmo de Tarjan sobre aristas en formato CSR.
+
+    Las aristas con tiempo infinito (cerradas con el clima actual) no
+    conectan sus extremos, igual que en la matriz de distancias.
+
+    Returns:
+        list: Componentes (listas ordenadas de vértices) en orden
+              topológico inverso: las aristas entre componentes van siempre
+              de una componente a otra anterior en la lista
+    """
+    order = [-1] * n  # Orden de descubrimiento de cada vértice
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        # Pila de llamadas explícita: (vértice, siguiente posición en su lista)
+        calls = [(root, indptr[root])]
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+
+        while calls:
+            u, pos = calls[-1]
+            if pos < indptr[u + 1]:
+                calls[-1] = (u, pos + 1)
+                if weights[pos] == INF:
+                    continue
+                v = indices[pos]
+                if order[v] == -1:
+                    order[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                    calls.append((v, indptr[v]))
+                elif on_stack[v]:
+                    low[u] = min(low[u], order[v])
+                continue
+
+            calls.pop()
+            if calls:
+                parent = calls[-1][0]
+                low[parent] = min(low[parent], low[u])
+            if low[u] == order[u]:
+                component = []
+                while True:
+                    v = stack.pop()
+                    on_stack[v] = False
+                    component.append(v)
+                    if v == u:
+                        break
+                component.sort()
+                components.append(component)
+
+    return components
+
+
+def strongly_connected_components(graph):
+    """
+    Calcula las componentes fuertemente conexas.
+
+    Args:
+        graph (Graph): El grafo (o una vista por clima)
+
+    Returns:
+        list: Una lista ordenada de índices de vértices por componente, de
+              la componente más grande a la más pequeña
+    """
+    indptr, indices, weights = graph.csr()
+    components = _tarjan(len(graph.vertices), indptr, indices, weights)
+    components.sort(key=lambda component: (-len(component), component[0]))
+    return components
+
+
+class ReachabilityIndex:
+    """
+    Condensación del grafo y clausura transitiva en conjuntos de bits.
+
+    La componente c es la posición c de components; el bit d de un
+    conjunto indica la componente d. Como las componentes están en orden
+    topológico inverso, cada componente sólo alcanza componentes de índice
+    menor o igual.
+
+    Attributes:
+        version (int): Versión del grafo con que se construyó
+        components (list): Vértices de cada componente, en orden
+            topológico inverso
+        component (list): Componente de cada vértice
+        successors (list): Componentes a las que llega directamente cada
+            componente (aristas de la condensación)
+    """
+
+    def __init__(self, graph):
+        """
+        Calcula las componentes y la clausura de la condensación.
+
+        Args:
+            graph (Graph): El grafo (o una vista por clima)
+        """
+        n = len(graph.vertices)
+        self.version = getattr(graph, 'version', None)
+        indptr, indices, weights = graph.csr()
+        with STATS.phase('reachability.build'):
+            self.components = _tarjan(n, indptr, indices, weights)
+            component = [0] * n
+            for c, members in enumerate(self.components):
+                for v in members:
+                    component[v] = c
+            self.component = component
+
+            successors = [set() for _ in self.components]
+            for u in range(n):
+                cu = component[u]
+                for pos in range(indptr[u], indptr[u + 1]):
+                    cv = component[indices[pos]]
+                    if cv != cu and weights[pos] != INF:
+                        successors[cu].add(cv)
+            self.successors = [sorted(targets) for targets in successors]
+
+            # Los sucesores de c ya están cerrados (índice menor): un OR por arista
+            descendants = []
+            for c, targets in enumerate(self.successors):
+                bits = 1 << c
+                for d in targets:
+                    bits |= descendants[d]
+                descendants.append(bits)
+            ancestors = [1 << c for c in range(len(self.components))]
+            for c in reversed(range(len(self.components))):
+                for d in self.successors[c]:
+                    ancestors[d] |= ancestors[c]
+            self._descendants = descendants
+            self._ancestors = ancestors
+        STATS.count('reachability.components', len(self.components))
+
+    def is_strongly_connected(self):
+        """
+        Returns:
+            bool: True si todas las ciudades se alcanzan entre sí
+        """
+        return len(self.components) <= 1
+
+    def reachable(self, source, target):
+        """
+        Indica si existe algún camino de source a target, en O(1).
+
+        Args:
+            source (int): Índice del vértice de origen
+            target (int): Índice del vértice de destino
+
+        Returns:
+            bool: True si target es alcanzable desde source (siempre
+                  desde sí mismo)
+        """
+        return bool(self._descendants[self.component[source]] >> self.component[target] & 1)
+
+    def descendants(self, source):
+        """
+        Vértices alcanzables desde source (incluido él mismo).
+
+        Returns:
+            list: Índices de vértices ordenados
+        """
+        return self._members(self._descendants[self.component[source]])
+
+    def ancestors(self, target):
+        """
+        Vértices desde los que se alcanza target (incluido él mismo).
+
+        Son los únicos orígenes cuyas rutas pueden cambiar al modificar una
+        arista que sale de target.
+
+        Returns:
+            list: Índices de vértices ordenados
+        """
+        return self._members(self._ancestors[self.component[target]])
+
+    def _members(self, bits):
+        """
+        Vértices de las componentes de un conjunto de bits.
+        """
+        components = self.components
+        # bin() da los bits del más significativo al menos: se invierte
+        digits = bin(bits)[:1:-1]
+        return sorted(chain.from_iterable(
+            components[c] for c, digit in enumerate(digits) if digit == '1'))
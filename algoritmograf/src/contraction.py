@@ -0,0 +1,328 @@
+"""
+Jerarquías de contracción para consultas origen-destino muy rápidas.
+
+El preprocesamiento contrae las ciudades de una en una, de la menos a la
+más importante. Al contraer v, cada camino u -> v -> x entre vecinos aún no
+contraídos se reemplaza por un atajo u -> x, salvo que una búsqueda local
+(de testigos) encuentre otro camino igual de corto que no pase por v. La
+importancia de una ciudad es la diferencia entre los atajos que añadiría y
+las aristas que quita, más los vecinos ya contraídos; se recalcula de forma
+perezosa antes de contraer.
+
+El resultado son dos grafos "hacia arriba" (hacia ciudades de mayor rango):
+el de aristas salientes, para la búsqueda desde el origen, y el de aristas
+entrantes, para la búsqueda desde el destino. Una consulta es un Dijkstra
+bidireccional que sólo sube por la jerarquía, y los atajos del camino
+encontrado se expanden recursivamente a las aristas originales. La memoria
+es lineal en aristas más atajos.
+
+Las distancias coinciden con las de floyd_warshall, incluida la diagonal
+(el ciclo más corto que vuelve a una ciudad con lazo).
+
+Ejemplo:
+    hierarchies = build_hierarchies(graph)  # Una jerarquía por condición climática
+    distance, path = hierarchies['nieve'].route(0, 42)
+"""
+
+import heapq
+from itertools import chain
+
+from src.graph import WEATHER_CONDITIONS
+from src.stats import STATS
+
+INF = float('inf')
+
+# Ciudades que puede asentar cada búsqueda de testigos
+DEFAULT_WITNESS_LIMIT = 64
+
+
+class ContractionHierarchy:
+    """
+    Jerarquía de contracción de un grafo con una condición climática.
+
+    Attributes:
+        n (int): Número de vértices
+        condition (str): Condición climática (None: los tiempos actuales)
+        version (int): Versión del grafo con que se construyó
+        shortcuts (int): Atajos añadidos durante la contracción
+        rank (list): Orden de contracción de cada vértice
+    """
+
+    def __init__(self, graph, condition=None, witness_limit=DEFAULT_WITNESS_LIMIT):
+        """
+        Construye la jerarquía.
+
+        Args:
+            graph (Graph): El grafo (o una vista por clima)
+            condition (str): Condición climática; None usa los tiempos actuales
+                (o los de la vista, que ya tiene su condición)
+            witness_limit (int): Ciudades que asienta cada búsqueda de testigos;
+                un límite menor acelera el preprocesamiento a cambio de más atajos
+        """
+        self.n = len(graph.vertices)
+        self.condition = condition
+        self.version = getattr(graph, 'version', None)
+        self.witness_limit = witness_limit
+        if condition is None:
+            # Las vistas por clima sólo aceptan csr() y csr(reverse=True)
+            self.condition = getattr(graph, 'condition', None)
+            csr, in_csr = graph.csr(), graph.csr(reverse=True)
+        else:
+            csr, in_csr = graph.csr(condition), graph.csr(condition, reverse=True)
+        with STATS.phase('hierarchy.build'):
+            self._build(csr, in_csr)
+        STATS.count('hierarchy.shortcuts', self.shortcuts)
+
+    def _build(self, csr, in_csr):
+        """
+        Contrae todos los vértices y guarda los grafos hacia arriba.
+        """
+        n = self.n
+        indptr, indices, weights = csr
+        out = [{} for _ in range(n)]  # Por vértice: destino -> tiempo
+        inn = [{} for _ in range(n)]  # Por vértice: origen -> tiempo
+        self._loops = {}  # Vértice con lazo -> (tiempo del lazo, aristas entrantes)
+        for u in range(n):
+            for pos in range(indptr[u], indptr[u + 1]):
+                v, w = indices[pos], weights[pos]
+                if u == v:
+                    # Aunque esté cerrado: la diagonal de Floyd-Warshall lo refleja
+                    self._loops[u] = w
+                    continue
+                if w == INF:
+                    continue
+                out[u][v] = inn[v][u] = w
+        in_indptr, in_indices, in_weights = in_csr
+        for v, w in list(self._loops.items()):
+            entering = [(in_indices[pos], in_weights[pos])
+                        for pos in range(in_indptr[v], in_indptr[v + 1]) if in_indices[pos] != v]
+            self._loops[v] = (w, entering)
+
+        self.rank = [-1] * n
+        self._up = [None] * n  # Aristas salientes hacia vértices de mayor rango
+        self._down = [None] * n  # Aristas entrantes desde vértices de mayor rango
+        # u * n + x -> vértice intermedio del atajo u -> x. Una arista deja de
+        # cambiar al contraer uno de sus extremos, así que al terminar cada
+        # entrada es la del atajo que quedó en la jerarquía.
+        self._middle = {}
+        self.shortcuts = 0
+        deleted = [0] * n  # Vecinos ya contraídos de cada vértice
+        level = [0] * n  # Profundidad en la jerarquía de cada vértice
+
+        def priority(v, shortcuts):
+            # Diferencia de aristas, más vecinos contraídos y profundidad para
+            # repartir la contracción por todo el grafo
+            return 2 * (len(shortcuts) - len(out[v]) - len(inn[v])) + deleted[v] + level[v]
+
+        heap = [(priority(v, self._shortcuts(v, out, inn)), v) for v in range(n)]
+        heapq.heapify(heap)
+        for rank in range(n):
+            while True:
+                _, v = heapq.heappop(heap)
+                shortcuts = self._shortcuts(v, out, inn)
+                value = priority(v, shortcuts)
+                # Actualización perezosa: contraer sólo si sigue siendo el menos importante
+                if not heap or value <= heap[0][0]:
+                    break
+                heapq.heappush(heap, (value, v))
+            for u in chain(out[v], inn[v]):
+                level[u] = max(level[u], level[v] + 1)
+                deleted[u] += 1
+            self._contract(v, rank, shortcuts, out, inn)
+
+    def _witness_search(self, source, skip, limit, targets, out):
+        """
+        Dijkstra local desde source sin pasar por skip, hasta la distancia
+        limit o hasta asentar todos los destinos targets.
+
+        Returns:
+            dict: Distancias encontradas
+        """
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        settled = 0
+        pending = len(targets)
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if d > limit or settled >= self.witness_limit:
+                break
+            settled += 1
+            if u in targets:
+                pending -= 1
+                if not pending:
+                    break
+            for x, w in out[u].items():
+                if x == skip:
+                    continue
+                candidate = d + w
+                if candidate < dist.get(x, INF):
+                    dist[x] = candidate
+                    heapq.heappush(heap, (candidate, x))
+        return dist
+
+    def _shortcuts(self, v, out, inn):
+        """
+        Atajos (u, x, tiempo) necesarios para contraer v.
+        """
+        outgoing = out[v]
+        if not outgoing or not inn[v]:
+            return []
+        max_out = max(outgoing.values())
+        shortcuts = []
+        for u, w_uv in inn[v].items():
+            dist = self._witness_search(u, v, w_uv + max_out, outgoing, out)
+            for x, w_vx in outgoing.items():
+                if x != u and dist.get(x, INF) > w_uv + w_vx:
+                    shortcuts.append((u, x, w_uv + w_vx))
+        return shortcuts
+
+    def _contract(self, v, rank, shortcuts, out, inn):
+        """
+        Contrae v: guarda sus aristas hacia arriba, lo quita y añade los atajos.
+        """
+        self.rank[v] = rank
+        self._up[v] = list(out[v].items())
+        self._down[v] = list(inn[v].items())
+        for x in out[v]:
+            del inn[x][v]
+        for u in inn[v]:
+            del out[u][v]
+        out[v] = inn[v] = None
+
+        n = self.n
+        for u, x, w in shortcuts:
+            if w < out[u].get(x, INF):
+                if x not in out[u]:
+                    self.shortcuts += 1
+                out[u][x] = inn[x][u] = w
+                self._middle[u * n + x] = v
+
+    def distance(self, source, target):
+        """
+        Distancia más corta entre dos vértices.
+        """
+        return self.route(source, target)[0]
+
+    def route(self, source, target):
+        """
+        Ruta más corta entre dos vértices.
+
+        Args:
+            source (int): Índice del vértice de origen
+            target (int): Índice del vértice de destino
+
+        Returns:
+            tuple: (distancia, lista de índices del camino); (inf, []) si no hay ruta
+        """
+        if source == target:
+            return self._cycle(source)
+
+        pop = heapq.heappop
+        push = heapq.heappush
+        up, down = self._up, self._down
+        forward, backward = {source: 0.0}, {target: 0.0}
+        forward_pred, backward_pred = {source: -1}, {target: -1}
+        forward_heap, backward_heap = [(0.0, source)], [(0.0, target)]
+        best = INF
+        meeting = -1
+
+        # Las dos búsquedas suben alternándose; cada una se detiene cuando
+        # su frontera ya no puede mejorar el mejor camino encontrado
+        while forward_heap or backward_heap:
+            if forward_heap:
+                if forward_heap[0][0] >= best:
+                    forward_heap = []
+                else:
+                    d, u = pop(forward_heap)
+                    if d <= forward[u]:
+                        other = backward.get(u)
+                        if other is not None and d + other < best:
+                            best = d + other
+                            meeting = u
+                        for v, w in up[u]:
+                            candidate = d + w
+                            if candidate < forward.get(v, INF):
+                                forward[v] = candidate
+                                forward_pred[v] = u
+                                push(forward_heap, (candidate, v))
+            if backward_heap:
+                if backward_heap[0][0] >= best:
+                    backward_heap = []
+                else:
+                    d, u = pop(backward_heap)
+                    if d <= backward[u]:
+                        other = forward.get(u)
+                        if other is not None and d + other < best:
+                            best = d + other
+                            meeting = u
+                        for v, w in down[u]:
+                            candidate = d + w
+                            if candidate < backward.get(v, INF):
+                                backward[v] = candidate
+                                backward_pred[v] = u
+                                push(backward_heap, (candidate, v))
+
+        if meeting == -1:
+            return INF, []
+
+        # Vértices de la jerarquía: origen -> encuentro -> destino
+        upward = [meeting]
+        while forward_pred[upward[-1]] != -1:
+            upward.append(forward_pred[upward[-1]])
+        upward.reverse()
+        while backward_pred[upward[-1]] != -1:
+            upward.append(backward_pred[upward[-1]])
+
+        path = [source]
+        for u, v in zip(upward, upward[1:]):
+            self._unpack(u, v, path)
+        return best, path
+
+    def _unpack(self, u, v, path):
+        """
+        Añade a path los vértices de la arista (o atajo) u -> v, sin u.
+        """
+        n = self.n
+        stack = [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            middle = self._middle.get(a * n + b, -1)
+            if middle == -1:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+    def _cycle(self, source):
+        """
+        Diagonal de floyd_warshall: 0 sin lazo; con lazo, el ciclo más corto
+        (inf si el lazo está cerrado y no hay otro ciclo).
+        """
+        if source not in self._loops:
+            return 0.0, [source]
+        best, entering = self._loops[source]
+        path = [source, source] if best < INF else []
+        for x, w in entering:
+            distance, route = self.route(source, x)
+            if distance + w < best:
+                best = distance + w
+                path = route + [source]
+        return best, path
+
+
+def build_hierarchies(graph, conditions=WEATHER_CONDITIONS, witness_limit=DEFAULT_WITNESS_LIMIT):
+    """
+    Una jerarquía por condición climática, a partir de weather_times.
+
+    Args:
+        graph (Graph): El grafo
+        conditions (iterable): Condiciones a preprocesar
+        witness_limit (int): Ver ContractionHierarchy
+
+    Returns:
+        dict: Condición -> ContractionHierarchy
+    """
+    return {condition: ContractionHierarchy(graph, condition, witness_limit)
+            for condition in conditions}
@@ -1,10 +1,40 @@
-def floyd_warshall(graph):
+"""
+Algoritmo de Floyd-Warshall para caminos más cortos entre todos los pares.
+
+Se ofrecen varios motores con el mismo contrato de salida:
+- 'python': implementación de referencia con listas de Python
+- 'numpy': versión vectorizada que procesa cada paso k sobre toda la matriz
+- 'blocked': versión por bloques repartida en varios procesos
+  (ver src/blocked_floyd.py)
+- 'condensed': versión vectorizada que en cada paso k sólo toca el bloque
+  de orígenes que llegan a k por destinos alcanzables desde k (ver
+  src/components.py); en redes poco conexas evita casi todo el trabajo
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él sólo existe el motor de referencia
+    np = None
+
+from src.blocked_floyd import blocked_floyd_warshall
+from src.center import graph_center
+from src.components import ReachabilityIndex
+from src.stats import STATS
+
+INF = float('inf')
+
+# Fracción de la matriz a partir de la cual el motor 'condensed' procesa el
+# paso completo: indexar un bloque tan grande cuesta más que lo que ahorra
+CONDENSED_FULL_STEP_FRACTION = 0.25
+
+
+def _floyd_warshall_python(graph):
     """
-    Implementa el algoritmo de Floyd-Warshall para encontrar los caminos más cortos.
-    
+    Motor de referencia de Floyd-Warshall con listas de Python.
+
     Args:
         graph (Graph): El grafo a analizar
-        
+
     Returns:
         tuple: (matriz_distancias, matriz_caminos) para las rutas más cortas
     """
@@ -16,28 +46,205 @@ def floyd_warshall(graph):
         dist.append(graph.adjacency_matrix[i].copy())
     
     # Matriz para reconstruir caminos
-    path = [[-1 if dist[i][j] == float('inf') else i for j in range(n)] for i in range(n)]
+    path = [[-1 if dist[i][j] == INF else i for j in range(n)] for i in range(n)]
     
     # Algoritmo de Floyd-Warshall
+    rows_relaxed = 0
+    improved = 0
     for k in range(n):
+        dist_k = dist[k]
+        path_k = path[k]
         for i in range(n):
+            dist_ik = dist[i][k]
+            if dist_ik == INF:
+                continue
+            rows_relaxed += 1
+            dist_i = dist[i]
+            path_i = path[i]
             for j in range(n):
-                if dist[i][k] != float('inf') and dist[k][j] != float('inf'):
-                    if dist[i][j] > dist[i][k] + dist[k][j]:
-                        dist[i][j] = dist[i][k] + dist[k][j]
-                        path[i][j] = path[k][j]
+                candidate = dist_ik + dist_k[j]
+                if dist_i[j] > candidate:
+                    dist_i[j] = candidate
+                    path_i[j] = path_k[j]
+                    improved += 1
     
+    STATS.count('apsp.relaxations_attempted', rows_relaxed * n)
+    STATS.count('apsp.relaxations_succeeded', improved)
     return dist, path
 
-def reconstruct_path(next_node, start, end):
+
+def _floyd_warshall_numpy(graph, as_lists=True):
+    """
+    Motor vectorizado de Floyd-Warshall con NumPy.
+
+    Cada paso k se resuelve como un mínimo por difusión (broadcast) sobre
+    toda la matriz, actualizando a la vez la matriz de predecesores.
+
+    Args:
+        graph (Graph): El grafo a analizar
+        as_lists (bool): Si es False devuelve los arreglos de NumPy sin
+            convertirlos a listas
+
+    Returns:
+        tuple: (matriz_distancias, matriz_caminos) como listas de Python
+    """
+    n = len(graph.vertices)
+    if n == 0:
+        return [], []
+
+    dist = np.array(graph.adjacency_matrix, dtype=np.float64)
+    path = np.where(np.isinf(dist), -1, np.arange(n)[:, np.newaxis])
+
+    # Contar las mejoras cuesta una pasada más por paso: sólo si se mide
+    counting = STATS.enabled
+    succeeded = 0
+    for k in range(n):
+        # inf + x sigue siendo inf, así que nunca mejora una distancia
+        candidate = dist[:, k, np.newaxis] + dist[k, :]
+        improved = candidate < dist
+        np.copyto(dist, candidate, where=improved)
+        np.copyto(path, np.broadcast_to(path[k, :].copy(), (n, n)), where=improved)
+        if counting:
+            succeeded += int(np.count_nonzero(improved))
+
+    STATS.count('apsp.relaxations_attempted', n ** 3)
+    STATS.count('apsp.relaxations_succeeded', succeeded)
+
+    if not as_lists:
+        return dist, path
+    return dist.tolist(), path.tolist()
+
+
+def _floyd_warshall_condensed(graph, as_lists=True, index=None):
+    """
+    Motor vectorizado que omite los bloques de pares inalcanzables.
+
+    El paso k sólo puede mejorar dist[i][j] si i llega a k y k llega a j.
+    Con el índice de alcanzabilidad cada paso se limita a ese bloque (o a
+    la matriz completa si el bloque ocupa casi toda); las distancias y los
+    caminos son idénticos a los del motor 'numpy'.
+
+    Args:
+        graph (Graph): El grafo a analizar
+        as_lists (bool): Si es False devuelve los arreglos de NumPy
+        index (ReachabilityIndex): Índice del grafo, si ya se calculó
+
+    Returns:
+        tuple: (matriz_distancias, matriz_caminos)
+    """
+    if index is None:
+        index = ReachabilityIndex(graph)
+    if index.is_strongly_connected():
+        # Todos los bloques son la matriz completa
+        return _floyd_warshall_numpy(graph, as_lists)
+
+    n = len(graph.vertices)
+    dist = np.array(graph.adjacency_matrix, dtype=np.float64)
+    path = np.where(np.isinf(dist), -1, np.arange(n)[:, np.newaxis])
+
+    blocks = {}  # Componente -> (orígenes que llegan a ella, destinos alcanzables)
+    attempted = 0
+    succeeded = 0
+    for k in range(n):
+        component = index.component[k]
+        if component not in blocks:
+            blocks[component] = (np.asarray(index.ancestors(k), dtype=np.intp),
+                                 np.asarray(index.descendants(k), dtype=np.intp))
+        rows, cols = blocks[component]
+        if len(rows) == 1 or len(cols) == 1:
+            # Sólo k de un lado: dist[k][k] + x nunca mejora x
+            continue
+        size = len(rows) * len(cols)
+        attempted += size
+        if size > CONDENSED_FULL_STEP_FRACTION * n * n:
+            candidate = dist[:, k, np.newaxis] + dist[k, :]
+            improved = candidate < dist
+            np.copyto(dist, candidate, where=improved)
+            np.copyto(path, np.broadcast_to(path[k, :].copy(), (n, n)), where=improved)
+            if STATS.enabled:
+                succeeded += int(np.count_nonzero(improved))
+            continue
+        candidate = dist[rows, k][:, np.newaxis] + dist[k, cols]
+        improved = candidate < dist[np.ix_(rows, cols)]
+        r, c = np.nonzero(improved)
+        if len(r):
+            i, j = rows[r], cols[c]
+            dist[i, j] = candidate[r, c]
+            path[i, j] = path[k, j]
+            succeeded += len(r)
+
+    STATS.count('apsp.relaxations_attempted', attempted)
+    STATS.count('apsp.relaxations_succeeded', succeeded)
+
+    if not as_lists:
+        return dist, path
+    return dist.tolist(), path.tolist()
+
+
+ENGINES = {
+    'python': _floyd_warshall_python,
+    'numpy': _floyd_warshall_numpy,
+    'blocked': blocked_floyd_warshall,
+    'condensed': _floyd_warshall_condensed,
+}
+
+# Motores que dependen de NumPy
+_NUMPY_ENGINES = ('numpy', 'blocked', 'condensed')
+
+
+def available_engines():
+    """
+    Lista los motores de Floyd-Warshall utilizables en este entorno.
+
+    Returns:
+        list: Nombres de los motores disponibles
+    """
+    return [name for name in ENGINES if name not in _NUMPY_ENGINES or np is not None]
+
+
+def floyd_warshall(graph, engine='auto', as_lists=True, **options):
+    """
+    Implementa el algoritmo de Floyd-Warshall para encontrar los caminos más cortos.
+    
+    Args:
+        graph (Graph): El grafo a analizar
+        engine (str): Motor a utilizar ('python', 'numpy', 'blocked',
+            'condensed' o 'auto', que elige 'numpy' si está instalado y
+            'python' en caso contrario)
+        as_lists (bool): Si es False, los motores de NumPy devuelven sus
+            arreglos sin convertirlos a listas (útil para pasarlos a
+            compact_matrices sin crear las listas intermedias)
+        **options: Parámetros propios del motor, p. ej. tile_size y workers
+            para 'blocked'
+        
+    Returns:
+        tuple: (matriz_distancias, matriz_caminos) para las rutas más cortas
+
+    Raises:
+        ValueError: Si el motor no existe
+        ImportError: Si se pide un motor de NumPy sin tener NumPy instalado
+    """
+    if engine == 'auto':
+        engine = 'numpy' if np is not None else 'python'
+    if engine not in ENGINES:
+        raise ValueError(f"Motor de Floyd-Warshall desconocido: {engine}")
+    if engine in _NUMPY_ENGINES and np is None:
+        raise ImportError(f"El motor '{engine}' requiere tener NumPy instalado")
+    if engine in _NUMPY_ENGINES:
+        options['as_lists'] = as_lists
+    return ENGINES[engine](graph, **options)
+
+def reconstruct_path(path, start, end):
     """
     Reconstruye el camino más corto entre dos vértices.
     
-    Utiliza la matriz next_node generada por el algoritmo de Floyd-Warshall
-    para reconstruir el camino desde el vértice start hasta el vértice end.
+    Utiliza la matriz de predecesores generada por floyd_warshall (path[i][j]
+    es el vértice anterior a j en el camino desde i) para reconstruir el
+    camino desde el vértice start hasta el vértice end. Sólo lee la fila
+    de start, así que sirve igual con listas o con matrices compactas.
     
     Args:
-        next_node (list): Matriz con información para reconstruir caminos
+        path (list): Matriz de predecesores
         start (int): Índice del vértice de inicio
         end (int): Índice del vértice de destino
         
@@ -45,35 +252,35 @@ def reconstruct_path(next_node, start, end):
         list: Lista ordenada de vértices que forman el camino más corto,
               o lista vacía si no existe un camino
     """
-    if next_node[start][end] is None:
+    if start == end:
+        return [start]
+    row = path[start]
+    if row[end] == -1:
         return []
-    path = []
-    while start != end:
-        path.append(start)
-        start = next_node[start][end]
-    path.append(end)
-    return path
+    route = [end]
+    current = end
+    while current != start:
+        current = row[current]
+        # Un predecesor ausente o un ciclo indican una matriz inconsistente
+        if current == -1 or len(route) > len(row):
+            return []
+        route.append(current)
+    route.reverse()
+    return route
 
 def calculate_graph_center(distance):
     """
     Calcula el centro del grafo.
     
     El centro del grafo es el vértice que tiene la menor excentricidad,
-    donde la excentricidad es la distancia máxima a cualquier otro vértice.
+    donde la excentricidad es la distancia máxima a cualquier otro vértice
+    (ver src/center.py).
     
     Args:
         distance (list): Matriz de distancias más cortas entre todos los pares
         
     Returns:
-        int: Índice del vértice que es el centro del grafo
+        int: Índice del vértice que es el centro del grafo, o None si
+             ningún vértice alcanza a todos los demás
     """
-    center = None
-    min_max_distance = float('inf')
-
-    for i in range(len(distance)):
-        max_distance = max(distance[i])
-        if max_distance < min_max_distance:
-            min_max_distance = max_distance
-            center = i
-
-    return center
+    return graph_center(distance)
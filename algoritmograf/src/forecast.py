@@ -0,0 +1,384 @@
+"""
+Rutas dependientes del tiempo sobre un pronóstico del clima.
+
+Un pronóstico es una secuencia de ventanas de tiempo. Cada ventana empieza
+en una hora dada (en las mismas unidades que los tiempos de viaje) y dura
+hasta el comienzo de la siguiente; la última no termina. En cada ventana
+hay una condición general y, opcionalmente, condiciones por región (ver
+Graph.define_region) y por arista.
+
+El tiempo de un tramo depende del momento en que se recorre: se avanza por
+la arista al ritmo de la ventana vigente y, si la ventana cambia a mitad de
+camino, el resto se recorre al ritmo de la nueva. Si el tramo está cerrado
+(tiempo infinito) se espera en la ciudad a que se abra. Con este modelo
+salir más tarde nunca permite llegar antes (propiedad FIFO), y Dijkstra
+sobre tiempos de llegada da la llegada más temprana.
+
+Los tiempos de cada ventana se calculan una vez por versión del grafo, en
+el orden de la CSR, y se reutilizan en todas las consultas.
+
+Ejemplo:
+    forecast = Forecast([
+        ForecastWindow(0, 'normal'),
+        ForecastWindow(6, 'lluvia', regions={'sierra': 'nieve'}),
+        ForecastWindow(12, 'normal', edges={('Lima', 'Quito'): 'tormenta'}),
+    ])
+    route = TimeDependentRouter(graph, forecast).route('BuenosAires', 'Quito', departure=2)
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+from bisect import bisect_right
+from collections import namedtuple
+from contextlib import redirect_stdout
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él los tiempos se eligen arista a arista
+    np = None
+
+from src.graph import WEATHER_CONDITIONS
+from src.stats import STATS
+
+INF = float('inf')
+
+# Índice de cada condición dentro de los tiempos de una arista
+_CONDITION_INDEX = {condition: idx for idx, condition in enumerate(WEATHER_CONDITIONS)}
+
+
+class ForecastWindow(namedtuple('ForecastWindow', ['start', 'weather', 'regions', 'edges'])):
+    """
+    Ventana de un pronóstico.
+
+    Attributes:
+        start (float): Comienzo de la ventana
+        weather (str): Condición general
+        regions (dict): Región -> condición
+        edges (dict): (origen, destino) -> condición; tiene prioridad sobre la región
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, start, weather='normal', regions=None, edges=None):
+        return super().__new__(cls, float(start), weather, dict(regions or {}), dict(edges or {}))
+
+
+# Un tramo de una ruta: ciudades, hora de salida, hora de llegada y condición al salir
+TimedLeg = namedtuple('TimedLeg', ['origin', 'destination', 'departure', 'arrival', 'weather'])
+
+# Resultado de una consulta dependiente del tiempo
+TimedRoute = namedtuple('TimedRoute', ['departure', 'arrival', 'path', 'legs'])
+
+
+class Forecast:
+    """
+    Secuencia de ventanas de tiempo ordenadas por comienzo.
+
+    Attributes:
+        windows (tuple): Ventanas (ForecastWindow)
+        starts (list): Comienzo de cada ventana
+    """
+
+    def __init__(self, windows):
+        """
+        Args:
+            windows (iterable): Ventanas en orden estrictamente creciente de comienzo
+
+        Raises:
+            ValueError: Si no hay ventanas, no están ordenadas o alguna
+                condición no existe
+        """
+        self.windows = tuple(windows)
+        if not self.windows:
+            raise ValueError("El pronóstico debe tener al menos una ventana")
+        self.starts = [window.start for window in self.windows]
+        if any(a >= b for a, b in zip(self.starts, self.starts[1:])):
+            raise ValueError("Las ventanas del pronóstico deben estar en orden creciente")
+        for window in self.windows:
+            conditions = [window.weather, *window.regions.values(), *window.edges.values()]
+            for condition in conditions:
+                if condition not in WEATHER_CONDITIONS:
+                    raise ValueError(f"Condición climática no válida: {condition}")
+
+    def window_at(self, time):
+        """
+        Índice de la ventana vigente en un momento; antes del primer
+        comienzo rige la primera ventana.
+        """
+        return max(bisect_right(self.starts, time) - 1, 0)
+
+    def __len__(self):
+        return len(self.windows)
+
+
+class TimeDependentRouter:
+    """
+    Llegada más temprana con Dijkstra dependiente del tiempo.
+
+    Attributes:
+        graph (Graph): El grafo
+        forecast (Forecast): Pronóstico del clima
+    """
+
+    def __init__(self, graph, forecast):
+        """
+        Args:
+            graph (Graph): El grafo; sus regiones se usan para las condiciones por región
+            forecast (Forecast): Pronóstico del clima
+
+        Raises:
+            ValueError: Si el pronóstico usa regiones o tramos que no existen
+        """
+        self.graph = graph
+        self.forecast = forecast
+        self._version = None
+        self._csr = None
+        self._window_weights = None
+        self._window_columns = None
+        self._refresh()
+
+    def _refresh(self):
+        """
+        Recalcula los tiempos de cada ventana si cambió el grafo o sus regiones.
+        """
+        version = (self.graph.version, self.graph.region_version)
+        if self._version == version:
+            return
+        with STATS.phase('forecast.weights'):
+            indptr, indices, _ = self.graph.csr(WEATHER_CONDITIONS[0])
+            times = [self.graph.csr(condition).weights for condition in WEATHER_CONDITIONS]
+            columns = [self._columns(window, indptr, indices) for window in self.forecast.windows]
+            if np is not None and len(indices):
+                stacked = np.stack([np.frombuffer(column_times, dtype=np.float64)
+                                    for column_times in times])
+                positions = np.arange(len(indices))
+                weights = [stacked[np.frombuffer(column, dtype=np.int8), positions].tolist()
+                           for column in columns]
+            else:
+                weights = [[times[c][pos] for pos, c in enumerate(column)] for column in columns]
+        self._csr = (indptr, indices)
+        self._window_columns = columns
+        self._window_weights = weights
+        self._version = version
+
+    def _columns(self, window, indptr, indices):
+        """
+        Índice de la condición de cada posición de la CSR durante una ventana.
+        """
+        graph = self.graph
+        columns = bytearray([_CONDITION_INDEX[window.weather]]) * len(indices)
+        regions = graph.regions()
+        for region, condition in window.regions.items():
+            if region not in regions:
+                raise ValueError(f"Región desconocida: {region}")
+            column = _CONDITION_INDEX[condition]
+            for city in regions[region]:
+                u = graph.vertex_index(city)
+                columns[indptr[u]:indptr[u + 1]] = bytes([column]) * (indptr[u + 1] - indptr[u])
+        for (from_vertex, to_vertex), condition in window.edges.items():
+            u = graph.vertex_index(from_vertex)
+            v = graph.vertex_index(to_vertex)
+            slot = -1
+            if u != -1 and v != -1:
+                slot = next((pos for pos in range(indptr[u], indptr[u + 1]) if indices[pos] == v), -1)
+            if slot == -1:
+                raise ValueError(f"No existe tráfico directo entre {from_vertex} y {to_vertex}")
+            columns[slot] = _CONDITION_INDEX[condition]
+        return columns
+
+    def _traverse(self, pos, time, window):
+        """
+        Hora de llegada al recorrer la arista pos saliendo en time.
+
+        Returns:
+            float: Llegada (INF si el tramo no vuelve a abrirse)
+        """
+        starts = self.forecast.starts
+        weights = self._window_weights
+        remaining = 1.0  # Fracción del tramo por recorrer
+        while True:
+            end = starts[window + 1] if window + 1 < len(starts) else INF
+            duration = weights[window][pos]
+            if duration < INF:
+                finish = time + remaining * duration
+                if finish <= end:
+                    return finish
+                remaining -= (end - time) / duration
+            if end == INF:
+                return INF
+            time = end
+            window += 1
+
+    def earliest_arrivals(self, source, departure):
+        """
+        Llegada más temprana a cada vértice saliendo de source.
+
+        Args:
+            source (int): Índice del vértice de origen
+            departure (float): Hora de salida
+
+        Returns:
+            tuple: (llegadas, predecesores) como listas de longitud n
+        """
+        self._refresh()
+        indptr, indices = self._csr
+        n = len(self.graph.vertices)
+        arrival = [INF] * n
+        pred = [-1] * n
+        arrival[source] = departure
+        pred[source] = source
+        settled = [False] * n
+        heap = [(departure, source)]
+        window_at = self.forecast.window_at
+        attempted = 0
+
+        while heap:
+            t, u = heapq.heappop(heap)
+            if settled[u]:
+                continue
+            settled[u] = True
+            window = window_at(t)
+            start, end = indptr[u], indptr[u + 1]
+            attempted += end - start
+            for pos in range(start, end):
+                v = indices[pos]
+                if settled[v]:
+                    continue
+                candidate = self._traverse(pos, t, window)
+                if candidate < arrival[v]:
+                    arrival[v] = candidate
+                    pred[v] = u
+                    heapq.heappush(heap, (candidate, v))
+
+        STATS.count('forecast.relaxations_attempted', attempted)
+        return arrival, pred
+
+    def route(self, from_vertex, to_vertex, departure=0.0):
+        """
+        Ruta de llegada más temprana entre dos ciudades.
+
+        Args:
+            from_vertex (str): Ciudad origen
+            to_vertex (str): Ciudad destino
+            departure (float): Hora de salida
+
+        Returns:
+            TimedRoute: Salida, llegada (INF si no hay ruta), ciudades y
+                tramos; path y legs están vacíos si no hay ruta
+
+        Raises:
+            ValueError: Si alguna ciudad no existe
+        """
+        source = self.graph.vertex_index(from_vertex)
+        target = self.graph.vertex_index(to_vertex)
+        if source == -1 or target == -1:
+            raise ValueError("Ciudad origen o destino no existe en el grafo")
+        with STATS.phase('forecast.route'):
+            arrival, pred = self.earliest_arrivals(source, departure)
+        if arrival[target] == INF:
+            return TimedRoute(departure, INF, [], [])
+
+        sequence = [target]
+        while sequence[-1] != source:
+            sequence.append(pred[sequence[-1]])
+        sequence.reverse()
+
+        indptr, indices = self._csr
+        vertices = self.graph.vertices
+        legs = []
+        for u, v in zip(sequence, sequence[1:]):
+            pos = next(pos for pos in range(indptr[u], indptr[u + 1]) if indices[pos] == v)
+            window = self.forecast.window_at(arrival[u])
+            legs.append(TimedLeg(vertices[u], vertices[v], arrival[u], arrival[v],
+                                 WEATHER_CONDITIONS[self._window_columns[window][pos]]))
+        return TimedRoute(departure, arrival[target], [vertices[idx] for idx in sequence], legs)
+
+
+def load_forecast(filename):
+    """
+    Lee un pronóstico de un archivo JSON.
+
+    El archivo es una lista de objetos con las claves start, weather
+    (opcional), regions ({región: condición}) y edges
+    ([[origen, destino, condición], ...]).
+
+    Args:
+        filename (str): Ruta del archivo
+
+    Returns:
+        Forecast: El pronóstico
+
+    Raises:
+        ValueError: Si el formato no es válido
+    """
+    with open(filename, encoding='utf-8') as file:
+        data = json.load(file)
+    if not isinstance(data, list):
+        raise ValueError("El archivo de pronóstico debe contener una lista")
+    windows = []
+    for position, item in enumerate(data, 1):
+        try:
+            windows.append(ForecastWindow(
+                item['start'],
+                item.get('weather', 'normal'),
+                {str(region): condition for region, condition in item.get('regions', {}).items()},
+                {(str(a), str(b)): condition for a, b, condition in item.get('edges', ())},
+            ))
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise ValueError(f"Ventana {position} con formato incorrecto") from None
+    return Forecast(windows)
+
+
+def display_route(route):
+    """
+    Muestra una ruta dependiente del tiempo tramo a tramo.
+
+    Args:
+        route (TimedRoute): Resultado de TimeDependentRouter.route
+    """
+    if route.arrival == INF:
+        print("No existe una ruta con el pronóstico dado.")
+        return
+    print(f"Ruta: {' -> '.join(route.path)}")
+    print(f"Salida: {route.departure:.2f}  Llegada: {route.arrival:.2f}  "
+          f"Duración: {route.arrival - route.departure:.2f}")
+    for leg in route.legs:
+        print(f"  {leg.origin} -> {leg.destination}: {leg.departure:.2f} -> {leg.arrival:.2f} ({leg.weather})")
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    from src.utils import read_graph_from_file
+
+    parser = argparse.ArgumentParser(description="Rutas dependientes del pronóstico del clima")
+    parser.add_argument('forecast', help="archivo JSON con el pronóstico")
+    parser.add_argument('origin')
+    parser.add_argument('destination')
+    parser.add_argument('--departure', type=float, default=0.0, help="hora de salida")
+    parser.add_argument('--graph', default=os.path.join(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))), 'data', 'logistica.txt'), help="archivo de aristas")
+    parser.add_argument('--region', nargs='+', action='append', default=[],
+                        metavar=('NOMBRE', 'CIUDAD'), help="definir una región")
+    args = parser.parse_args(argv)
+
+    with redirect_stdout(sys.stderr):
+        graph = read_graph_from_file(args.graph)
+    try:
+        for name, *cities in args.region:
+            graph.define_region(name, cities)
+        router = TimeDependentRouter(graph, load_forecast(args.forecast))
+        route = router.route(args.origin, args.destination, args.departure)
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    display_route(route)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
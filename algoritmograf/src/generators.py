@@ -0,0 +1,158 @@
+"""
+Generadores de redes sintéticas para pruebas de rendimiento.
+
+Cada generador produce aristas (origen, destino, normal, lluvia, nieve,
+tormenta) con el formato de Graph.add_edge y es determinista para una
+semilla dada. Los tiempos con mal clima nunca son menores que con clima
+normal, como en los datos reales.
+
+Familias:
+- 'sparse': red aleatoria dispersa con grado medio fijo
+- 'grid': cuadrícula tipo red vial, con tramos en ambos sentidos
+- 'dense': grafo denso con una fracción fija de todos los pares
+"""
+
+import math
+import random
+
+from src.graph import Graph
+
+# Factor mínimo y máximo sobre el tiempo normal para lluvia, nieve y tormenta
+_WEATHER_FACTORS = ((1.1, 1.5), (1.3, 2.0), (1.5, 3.0))
+
+FAMILIES = ('sparse', 'grid', 'dense')
+
+
+def _weather_times(rng, normal):
+    """
+    Cuatro tiempos de una arista a partir del tiempo con clima normal.
+    """
+    return (normal, *(round(normal * rng.uniform(low, high), 2) for low, high in _WEATHER_FACTORS))
+
+
+def sparse_edges(n, average_degree=3, seed=0):
+    """
+    Red aleatoria dispersa: cada ciudad tiene average_degree salidas.
+
+    Args:
+        n (int): Número de ciudades
+        average_degree (int): Aristas que salen de cada ciudad
+        seed (int): Semilla del generador
+
+    Yields:
+        tuple: (origen, destino, normal, lluvia, nieve, tormenta)
+    """
+    rng = random.Random(seed)
+    for i in range(n):
+        for _ in range(average_degree if n > 1 else 0):
+            j = rng.randrange(n - 1)
+            j += j >= i  # Sin lazos
+            yield (f"C{i}", f"C{j}", *_weather_times(rng, round(rng.uniform(1, 20), 2)))
+
+
+def grid_edges(n, seed=0):
+    """
+    Cuadrícula de unas √n × √n ciudades, con tramos en ambos sentidos.
+
+    Imita una red vial: cada ciudad conecta con sus vecinas y el tiempo
+    de cada tramo varía poco alrededor de un valor base.
+
+    Args:
+        n (int): Número aproximado de ciudades (se redondea a una cuadrícula)
+        seed (int): Semilla del generador
+
+    Yields:
+        tuple: (origen, destino, normal, lluvia, nieve, tormenta)
+    """
+    rng = random.Random(seed)
+    cols = max(1, math.isqrt(n))
+    rows = max(1, -(-n // cols))
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in ((0, 1), (1, 0)):
+                r2, c2 = r + dr, c + dc
+                if r2 >= rows or c2 >= cols:
+                    continue
+                normal = round(rng.uniform(4, 6), 2)
+                times = _weather_times(rng, normal)
+                yield (f"G{r}_{c}", f"G{r2}_{c2}", *times)
+                yield (f"G{r2}_{c2}", f"G{r}_{c}", *times)
+
+
+def dense_edges(n, density=0.5, seed=0):
+    """
+    Grafo denso: cada par ordenado de ciudades distintas tiene arista con
+    probabilidad density.
+
+    Args:
+        n (int): Número de ciudades
+        density (float): Fracción de pares con arista (0 a 1)
+        seed (int): Semilla del generador
+
+    Yields:
+        tuple: (origen, destino, normal, lluvia, nieve, tormenta)
+    """
+    rng = random.Random(seed)
+    for i in range(n):
+        for j in range(n):
+            if i != j and rng.random() < density:
+                yield (f"D{i}", f"D{j}", *_weather_times(rng, round(rng.uniform(1, 50), 2)))
+
+
+def generate_edges(family, n, seed=0):
+    """
+    Aristas de una red sintética de la familia indicada.
+
+    Args:
+        family (str): 'sparse', 'grid' o 'dense'
+        n (int): Número (aproximado en 'grid') de ciudades
+        seed (int): Semilla del generador
+
+    Returns:
+        generator: Aristas con el formato de Graph.add_edge
+
+    Raises:
+        ValueError: Si la familia no existe
+    """
+    if family == 'sparse':
+        return sparse_edges(n, seed=seed)
+    if family == 'grid':
+        return grid_edges(n, seed=seed)
+    if family == 'dense':
+        return dense_edges(n, seed=seed)
+    raise ValueError(f"Familia de grafos desconocida: {family}")
+
+
+def generate_graph(family, n, seed=0):
+    """
+    Construye un grafo sintético de la familia indicada.
+
+    Args:
+        family (str): 'sparse', 'grid' o 'dense'
+        n (int): Número (aproximado en 'grid') de ciudades
+        seed (int): Semilla del generador
+
+    Returns:
+        Graph: El grafo generado
+    """
+    return Graph.from_edges(generate_edges(family, n, seed))
+
+
+def write_edge_file(edges, filename):
+    """
+    Escribe aristas en el formato de texto de data/logistica.txt.
+
+    Args:
+        edges (iterable): Aristas (origen, destino, normal, lluvia, nieve, tormenta)
+        filename (str): Ruta del archivo a escribir
+
+    Returns:
+        int: Número de aristas escritas
+    """
+    count = 0
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write("Ciudad1 Ciudad2 tiempoNormal tiempoLluvia tiempoNieve tiempoTormenta\n")
+        for from_vertex, to_vertex, *times in edges:
+            file.write(f"{from_vertex} {to_vertex} {' '.join(map(str, times))}\n")
+            count += 1
+    return count
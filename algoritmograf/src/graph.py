@@ -1,58 +1,326 @@
+from array import array
+from collections import namedtuple
+from itertools import chain
+from collections.abc import Mapping
+from math import isnan
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él el clima por región se aplica arista a arista
+    np = None
+
+from src.name_index import NameIndex, normalize_name
+from src.stats import STATS
+
+# Condiciones climáticas admitidas, en el orden de los tiempos de cada arista
+WEATHER_CONDITIONS = ('normal', 'lluvia', 'nieve', 'tormenta')
+
+# Índice de cada condición dentro del bloque de 4 tiempos de una arista
+_CONDITION_INDEX = {condition: idx for idx, condition in enumerate(WEATHER_CONDITIONS)}
+
+INF = float('inf')
+
+# A partir de cuántas aristas se reasigna el clima con NumPy
+_VECTOR_MIN_EDGES = 64
+
+# Representación CSR (filas comprimidas) de las aristas del grafo
+CSRAdjacency = namedtuple('CSRAdjacency', ['indptr', 'indices', 'weights'])
+
+# Cambios aplicados por una transacción: versiones antes y después, aristas
+# (origen, destino) -> (tiempos anteriores, tiempos nuevos), con None si la
+# arista no existía o se eliminó, y la nueva condición climática (None si
+# no cambió)
+GraphDelta = namedtuple('GraphDelta', ['previous_version', 'version', 'edges', 'weather'])
+
+
+class _AdjacencyRow:
+    """
+    Fila de sólo lectura de la matriz de adyacencia, calculada bajo demanda.
+    """
+
+    def __init__(self, graph, row, condition):
+        self._graph = graph
+        self._row = row
+        self._condition = condition
+
+    def __len__(self):
+        return len(self._graph.vertices)
+
+    def __getitem__(self, col):
+        edge = self._graph._out[self._row].get(col)
+        if edge is None:
+            return 0.0 if col == self._row else INF
+        return self._graph._edge_weight(edge, self._condition)
+
+    def __iter__(self):
+        return iter(self.copy())
+
+    def __eq__(self, other):
+        return self.copy() == list(other)
+
+    def copy(self):
+        """
+        Devuelve la fila como una lista de Python.
+        """
+        row = [INF] * len(self._graph.vertices)
+        row[self._row] = 0.0
+        for col, edge in self._graph._out[self._row].items():
+            row[col] = self._graph._edge_weight(edge, self._condition)
+        return row
+
+
+class _AdjacencyMatrixView:
+    """
+    Vista densa de sólo lectura sobre el almacenamiento disperso del grafo.
+
+    Permite el acceso matrix[i][j] sin guardar la matriz n×n en memoria.
+    """
+
+    def __init__(self, graph, condition=None):
+        self._graph = graph
+        self._condition = condition
+
+    def __len__(self):
+        return len(self._graph.vertices)
+
+    def __getitem__(self, row):
+        if not 0 <= row < len(self._graph.vertices):
+            raise IndexError("Índice de vértice fuera de rango")
+        return _AdjacencyRow(self._graph, row, self._condition)
+
+    def __iter__(self):
+        for row in range(len(self._graph.vertices)):
+            yield _AdjacencyRow(self._graph, row, self._condition)
+
+    def __array__(self, dtype=None, copy=None):
+        # Conversión directa a NumPy sin pasar por listas de Python
+        import numpy as np
+        n = len(self._graph.vertices)
+        matrix = np.full((n, n), INF, dtype=dtype or np.float64)
+        np.fill_diagonal(matrix, 0.0)
+        for u, v, weight in self._graph.edges(self._condition):
+            matrix[u, v] = weight
+        return matrix
+
+    def to_list(self):
+        """
+        Devuelve la matriz completa como listas de Python.
+        """
+        return [row.copy() for row in self]
+
+
+class _WeatherTimesView(Mapping):
+    """
+    Vista de sólo lectura (ciudad_origen, ciudad_destino) -> tiempos por clima.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def _edge_id(self, key):
+        try:
+            from_vertex, to_vertex = key
+        except (TypeError, ValueError):
+            return None
+        from_idx = self._graph.vertex_index(from_vertex)
+        to_idx = self._graph.vertex_index(to_vertex)
+        if from_idx == -1 or to_idx == -1:
+            return None
+        return self._graph._out[from_idx].get(to_idx)
+
+    def __getitem__(self, key):
+        edge = self._edge_id(key)
+        if edge is None:
+            raise KeyError(key)
+        return self._graph._edge_times(edge)
+
+    def __contains__(self, key):
+        return self._edge_id(key) is not None
+
+    def __iter__(self):
+        vertices = self._graph.vertices
+        for u, v, _ in self._graph.edges():
+            yield (vertices[u], vertices[v])
+
+    def __len__(self):
+        return self._graph.get_edge_count()
+
+
+class _WeatherGraphView:
+    """
+    Vista de sólo lectura del grafo con los tiempos de una condición fija.
+
+    Expone la misma interfaz de lectura que Graph (vertices,
+    adjacency_matrix, edges y csr) para los algoritmos de rutas.
+    """
+
+    def __init__(self, graph, condition):
+        self.graph = graph
+        self.condition = condition
+        self.vertices = graph.vertices
+        self.adjacency_matrix = _AdjacencyMatrixView(graph, condition)
+
+    def edges(self):
+        return self.graph.edges(self.condition)
+
+    def csr(self, reverse=False):
+        return self.graph.csr(self.condition, reverse)
+
+
 class Graph:
     """
-    Clase que implementa un grafo dirigido usando matriz de adyacencia.
-    
+    Clase que implementa un grafo dirigido con almacenamiento disperso.
+
+    Las aristas se guardan en listas de adyacencia (un diccionario destino ->
+    arista por vértice) y los cuatro tiempos de cada arista en un único
+    arreglo compacto de E×4 valores. La matriz de adyacencia densa sólo
+    existe como vista calculada bajo demanda.
+
+    Los nombres de ciudades no distinguen mayúsculas/minúsculas: "lima" y
+    "Lima" son la misma ciudad, que conserva la escritura con que se agregó.
+
+    El clima puede asignarse a todo el grafo (set_weather_condition), a una
+    región (set_region_weather) o a una arista (set_edge_weather). Cada
+    arista guarda el índice de su condición y su tiempo actual se obtiene de
+    su bloque de 4 tiempos; al cambiar el clima sólo se recalculan las
+    aristas cuya condición cambió, con una sola indexación de NumPy.
+
     Attributes:
         vertices (list): Lista de nombres de ciudades (vértices)
-        adjacency_matrix (list): Matriz de adyacencia con tiempos de viaje
-        weather_times (dict): Diccionario con tiempos para diferentes condiciones
+        adjacency_matrix (view): Vista matrix[i][j] con los tiempos de viaje actuales
+        weather_times (view): Vista (origen, destino) -> tiempos por condición
         current_weather (str): Condición climática actual
+        version (int): Contador que aumenta con cada cambio de vértices o aristas
+        region_version (int): Contador que aumenta al definir una región
     """
-    
+
     def __init__(self):
         """
         Inicializa un grafo vacío.
         """
-        self.vertices = []
-        self.adjacency_matrix = []
-        self.weather_times = {}  # Para almacenar tiempos en diferentes condiciones
+        self._names = NameIndex()  # Nombre normalizado -> índice
+        self.vertices = self._names.names
         self.current_weather = 'normal'  # Condición climática por defecto
-    
+        self.version = 0  # Se incrementa al modificar vértices o aristas
+
+        self._out = []  # Por vértice: índice destino -> id de arista
+        self._edge_from = array('i')  # Vértice origen de cada arista (-1 si está libre)
+        self._edge_to = array('i')  # Vértice destino de cada arista
+        self._times = array('d')  # 4 tiempos por arista, en el orden de WEATHER_CONDITIONS
+        self._weights = array('d')  # Tiempo de cada arista con el clima actual
+        self._conditions = array('b')  # Índice de la condición de cada arista
+        self._off_weather = 0  # Aristas con una condición distinta de current_weather
+        self._regions = {}  # Región -> índices de sus ciudades
+        self._vertex_region = {}  # Índice de ciudad -> región
+        self._region_weather = {}  # Región -> condición asignada
+        self.weather_version = 0  # Se incrementa con cada cambio de clima
+        self.region_version = 0  # Se incrementa al definir o redefinir una región
+        self._free_edges = []  # Ids de aristas eliminadas para reutilizar
+        self._csr_cache = {}
+        self._csr_version = -1
+
+    @classmethod
+    def from_edges(cls, edges):
+        """
+        Construye un grafo a partir de una lista de aristas.
+
+        Args:
+            edges (iterable): Tuplas (origen, destino, normal, lluvia, nieve, tormenta)
+
+        Returns:
+            Graph: Grafo con todas las aristas cargadas
+        """
+        graph = cls()
+        graph.add_edges_from(edges)
+        return graph
+
+    @property
+    def adjacency_matrix(self):
+        return _AdjacencyMatrixView(self)
+
+    @property
+    def weather_times(self):
+        return _WeatherTimesView(self)
+
+    def _edge_weight(self, edge, condition=None):
+        """
+        Tiempo de una arista con el clima actual o con la condición dada.
+        """
+        if condition is None or (condition == self.current_weather and not self._off_weather):
+            return self._weights[edge]
+        return self._times[4 * edge + _CONDITION_INDEX[condition]]
+
+    def _edge_times(self, edge):
+        """
+        Diccionario condición -> tiempo de una arista.
+        """
+        base = 4 * edge
+        return {condition: self._times[base + idx] for idx, condition in enumerate(WEATHER_CONDITIONS)}
+
+    def _intern(self, vertex):
+        """
+        Devuelve el índice de un vértice, agregándolo si no existe.
+        """
+        idx, added = self._names.add(vertex)
+        if added:
+            self._out.append({})
+        return idx
+
+    def _store_edge(self, from_idx, to_idx, times):
+        """
+        Guarda o sobrescribe una arista con sus cuatro tiempos.
+        """
+        edge = self._out[from_idx].get(to_idx)
+        if edge is None:
+            # Una arista nueva toma el clima de la región de su origen
+            column = self._default_condition(from_idx)
+            if self._free_edges:
+                edge = self._free_edges.pop()
+                self._edge_from[edge] = from_idx
+                self._edge_to[edge] = to_idx
+                self._conditions[edge] = column
+            else:
+                edge = len(self._edge_from)
+                self._edge_from.append(from_idx)
+                self._edge_to.append(to_idx)
+                self._times.extend((INF, INF, INF, INF))
+                self._weights.append(INF)
+                self._conditions.append(column)
+            if column != _CONDITION_INDEX[self.current_weather]:
+                self._off_weather += 1
+            self._out[from_idx][to_idx] = edge
+        base = 4 * edge
+        self._times[base:base + 4] = array('d', times)
+        self._weights[edge] = self._times[base + self._conditions[edge]]
+        return edge
+
+    def _default_condition(self, from_idx):
+        """
+        Índice de la condición de una arista nueva que sale de from_idx.
+        """
+        region = self._vertex_region.get(from_idx)
+        return _CONDITION_INDEX[self._region_weather.get(region, self.current_weather)]
+
     def add_vertex(self, vertex):
         """
         Agrega un nuevo vértice (ciudad) al grafo.
-        
+
         Args:
             vertex (str): Nombre de la ciudad
-            
+
         Returns:
             bool: True si se agregó, False si ya existía
         """
-        if vertex not in self.vertices:
-            self.vertices.append(vertex)
-            
-            # Expandir la matriz de adyacencia
-            if len(self.adjacency_matrix) == 0:
-                self.adjacency_matrix = [[float('inf')]]
-            else:
-                # Agregar una columna de infinitos a cada fila existente
-                for row in self.adjacency_matrix:
-                    row.append(float('inf'))
-                
-                # Agregar una nueva fila de infinitos
-                new_row = [float('inf')] * len(self.vertices)
-                self.adjacency_matrix.append(new_row)
-            
-            # Distancia a sí mismo es 0
-            self.adjacency_matrix[len(self.vertices) - 1][len(self.vertices) - 1] = 0
-            
+        if vertex not in self._names:
+            self._intern(vertex)
+            self.version += 1
             return True
         return False
-    
+
     def add_edge(self, from_vertex, to_vertex, normal_time, rain_time, snow_time, storm_time):
         """
         Agrega una arista entre dos vértices con tiempos para diferentes condiciones.
-        
+
         Args:
             from_vertex (str): Ciudad origen
             to_vertex (str): Ciudad destino
@@ -60,116 +328,611 @@ class Graph:
             rain_time (float): Tiempo con lluvia
             snow_time (float): Tiempo con nieve
             storm_time (float): Tiempo con tormenta
-            
+
         Returns:
             bool: True si se agregó correctamente
         """
         # Agregar vértices si no existen
-        if from_vertex not in self.vertices:
-            self.add_vertex(from_vertex)
-        if to_vertex not in self.vertices:
-            self.add_vertex(to_vertex)
-        
-        from_idx = self.vertices.index(from_vertex)
-        to_idx = self.vertices.index(to_vertex)
-        
-        # Almacenar todos los tiempos
-        edge_key = (from_vertex, to_vertex)
-        self.weather_times[edge_key] = {
-            'normal': normal_time,
-            'lluvia': rain_time,
-            'nieve': snow_time,
-            'tormenta': storm_time
-        }
-        
-        # Establecer el tiempo actual según el clima actual
-        self.adjacency_matrix[from_idx][to_idx] = self.weather_times[edge_key][self.current_weather]
-        
+        from_idx = self._intern(from_vertex)
+        to_idx = self._intern(to_vertex)
+
+        # Almacenar todos los tiempos; el tiempo actual depende del clima
+        self._store_edge(from_idx, to_idx, (normal_time, rain_time, snow_time, storm_time))
+
+        self.version += 1
         return True
-    
+
+    def add_edges_from(self, edges):
+        """
+        Agrega muchas aristas en una sola pasada.
+
+        Equivale a llamar a add_edge por cada arista, pero incrementa la
+        versión del grafo una sola vez.
+
+        Args:
+            edges (iterable): Tuplas (origen, destino, normal, lluvia, nieve, tormenta)
+
+        Returns:
+            int: Número de aristas procesadas
+        """
+        intern = self._intern
+        store = self._store_edge
+        count = 0
+        for from_vertex, to_vertex, normal_time, rain_time, snow_time, storm_time in edges:
+            store(intern(from_vertex), intern(to_vertex), (normal_time, rain_time, snow_time, storm_time))
+            count += 1
+        self.version += 1
+        return count
+
+    def add_edge_columns(self, sources, targets, times):
+        """
+        Agrega aristas dadas por columnas, reservando el espacio de una vez.
+
+        Es la vía rápida para cargas masivas: los nombres se registran
+        primero y los tiempos se copian en bloque al arreglo E×4. Si una
+        arista aparece varias veces, prevalece la última.
+
+        Args:
+            sources (list): Ciudades origen
+            targets (list): Ciudades destino
+            times (array): 4 tiempos por arista, en el orden de WEATHER_CONDITIONS
+
+        Returns:
+            int: Número de aristas procesadas
+        """
+        # Registrar los nombres en orden de aparición y traducirlos a índices
+        intern = self._intern
+        ids = {name: intern(name) for name in dict.fromkeys(chain.from_iterable(zip(sources, targets)))}
+        from_ids = list(map(ids.__getitem__, sources))
+        to_ids = list(map(ids.__getitem__, targets))
+
+        # Última fila de cada par (origen, destino), en orden de primera aparición
+        last_row = dict(zip(zip(from_ids, to_ids), range(len(from_ids))))
+
+        base = len(self._edge_from)
+        out = self._out
+        new_from = []
+        new_to = []
+        rows = []  # Fila de origen de cada arista nueva
+        for (u, v), row in last_row.items():
+            if v in out[u]:
+                self._store_edge(u, v, times[4 * row:4 * row + 4])
+                continue
+            out[u][v] = base + len(rows)
+            new_from.append(u)
+            new_to.append(v)
+            rows.append(row)
+
+        self._edge_from.extend(array('i', new_from))
+        self._edge_to.extend(array('i', new_to))
+        if len(rows) == len(sources):
+            self._times.extend(times)
+        else:
+            for row in rows:
+                self._times.extend(times[4 * row:4 * row + 4])
+        column = _CONDITION_INDEX[self.current_weather]
+        self._weights.extend(self._times[4 * base + column::4])
+        self._conditions.extend(array('b', [column]) * len(rows))
+        if self._region_weather:
+            # Las aristas nuevas que salen de una región con clima propio
+            by_condition = {}
+            for edge, u in enumerate(new_from, base):
+                region_column = self._default_condition(u)
+                if region_column != column:
+                    by_condition.setdefault(region_column, []).append(edge)
+            for region_column, edges in by_condition.items():
+                self._assign_conditions(edges, region_column)
+
+        self.version += 1
+        return len(sources)
+
+    @classmethod
+    def from_arrays(cls, vertices, edge_from, edge_to, times):
+        """
+        Construye un grafo a partir de arreglos de índices ya resueltos.
+
+        Es la operación inversa de edge_arrays; no hay que buscar ningún
+        nombre por arista.
+
+        Args:
+            vertices (list): Nombres de ciudades, en el orden de sus índices
+            edge_from (array): Índice del vértice origen de cada arista
+            edge_to (array): Índice del vértice destino de cada arista
+            times (array): 4 tiempos por arista, en el orden de WEATHER_CONDITIONS
+
+        Returns:
+            Graph: Grafo con los vértices y aristas dados
+        """
+        graph = cls()
+        for vertex in vertices:
+            graph._intern(vertex)
+        out = graph._out
+        for edge, (u, v) in enumerate(zip(edge_from, edge_to)):
+            out[u][v] = edge
+        graph._edge_from = array('i', edge_from)
+        graph._edge_to = array('i', edge_to)
+        graph._times = array('d', times)
+        column = _CONDITION_INDEX[graph.current_weather]
+        graph._weights = graph._times[column::4]
+        graph._conditions = array('b', [column]) * len(graph._edge_from)
+        graph.version += 1
+        return graph
+
+    def edge_arrays(self):
+        """
+        Devuelve las aristas como arreglos compactos, sin huecos libres.
+
+        Returns:
+            tuple: (edge_from, edge_to, times) con el formato de from_arrays
+        """
+        if not self._free_edges:
+            return array('i', self._edge_from), array('i', self._edge_to), array('d', self._times)
+        edge_from = array('i')
+        edge_to = array('i')
+        times = array('d')
+        for edge, u in enumerate(self._edge_from):
+            if u != -1:
+                edge_from.append(u)
+                edge_to.append(self._edge_to[edge])
+                times.extend(self._times[4 * edge:4 * edge + 4])
+        return edge_from, edge_to, times
+
+    def copy(self):
+        """
+        Copia independiente del grafo, con el mismo clima (también por
+        región y por arista).
+
+        Los índices de los vértices se conservan; los ids de aristas no.
+
+        Returns:
+            Graph: Grafo nuevo que puede modificarse sin afectar a éste
+        """
+        graph = Graph.from_arrays(self.vertices, *self.edge_arrays())
+        graph.set_weather_condition(self.current_weather)
+        graph._regions = {name: list(members) for name, members in self._regions.items()}
+        graph._vertex_region = dict(self._vertex_region)
+        graph._region_weather = dict(self._region_weather)
+        if self._off_weather:
+            column = _CONDITION_INDEX[self.current_weather]
+            by_condition = {}
+            for edge, edge_column in enumerate(self._conditions):
+                u = self._edge_from[edge]
+                if edge_column != column and u != -1:
+                    by_condition.setdefault(edge_column, []).append(graph._out[u][self._edge_to[edge]])
+            for edge_column, edges in by_condition.items():
+                graph._assign_conditions(edges, edge_column)
+        return graph
+
     def remove_edge(self, from_vertex, to_vertex):
         """
         Elimina una arista entre dos vértices.
-        
+
         Args:
             from_vertex (str): Ciudad origen
             to_vertex (str): Ciudad destino
-            
+
         Returns:
             bool: True si se eliminó la arista
         """
-        # Convertir a minúsculas para hacer la comparación insensible a mayúsculas/minúsculas
-        from_vertex_lower = from_vertex.lower()
-        to_vertex_lower = to_vertex.lower()
-        
-        # Buscar los vértices en el grafo
-        from_idx = -1
-        to_idx = -1
-        for idx, city in enumerate(self.vertices):
-            if city.lower() == from_vertex_lower:
-                from_idx = idx
-            if city.lower() == to_vertex_lower:
-                to_idx = idx
-        
+        # Buscar los vértices en el índice de nombres (sin distinguir mayúsculas)
+        from_idx = self._names.lookup(from_vertex)
+        to_idx = self._names.lookup(to_vertex)
+
         # Verificar si los vértices existen
         if from_idx == -1 or to_idx == -1:
             print(f"Error: Una o ambas ciudades no existen en el grafo.")
             print(f"Ciudades disponibles: {', '.join(self.vertices)}")
             return False
-        
+
         # Verificar si existe una arista entre estos vértices
-        if self.adjacency_matrix[from_idx][to_idx] == float('inf'):
+        edge = self._out[from_idx].get(to_idx)
+        if edge is None:
             print(f"Error: No existe tráfico directo entre {self.vertices[from_idx]} y {self.vertices[to_idx]}.")
             return False
-        
-        # Eliminar la arista
-        self.adjacency_matrix[from_idx][to_idx] = float('inf')
-        
-        # Obtener los nombres originales de las ciudades
-        orig_from = self.vertices[from_idx]
-        orig_to = self.vertices[to_idx]
-        
-        # Eliminar del diccionario de tiempos
-        edge_key = (orig_from, orig_to)
-        if edge_key in self.weather_times:
-            del self.weather_times[edge_key]
-            
+
+        self._delete_edge(from_idx, to_idx)
+        self.version += 1
         return True
-    
+
+    def _delete_edge(self, from_idx, to_idx):
+        """
+        Quita una arista existente y deja su espacio libre para reutilizarlo.
+        """
+        edge = self._out[from_idx].pop(to_idx)
+        self._edge_from[edge] = -1
+        self._edge_to[edge] = -1
+        self._times[4 * edge:4 * edge + 4] = array('d', (INF, INF, INF, INF))
+        self._weights[edge] = INF
+        column = _CONDITION_INDEX[self.current_weather]
+        if self._conditions[edge] != column:
+            self._off_weather -= 1
+            self._conditions[edge] = column
+        self._free_edges.append(edge)
+
+    def transaction(self, on_commit=None):
+        """
+        Agrupa varios cambios para aplicarlos juntos (ver GraphTransaction).
+
+        Args:
+            on_commit (callable): Función que recibe el GraphDelta aplicado
+
+        Returns:
+            GraphTransaction: Transacción vacía sobre este grafo
+        """
+        return GraphTransaction(self, on_commit)
+
     def set_weather_condition(self, condition):
         """
-        Cambia la condición climática y actualiza los tiempos en la matriz.
-        
+        Cambia la condición climática de todo el grafo y actualiza los tiempos actuales.
+
+        Descarta el clima asignado a regiones o aristas.
+
         Args:
             condition (str): Condición climática ('normal', 'lluvia', 'nieve', 'tormenta')
-            
+
         Returns:
             bool: True si se cambió correctamente
         """
-        if condition not in ['normal', 'lluvia', 'nieve', 'tormenta']:
+        if condition not in WEATHER_CONDITIONS:
             return False
-            
-        self.current_weather = condition
-        
-        # Actualizar todas las aristas con los nuevos tiempos
-        for edge_key, times in self.weather_times.items():
-            from_vertex, to_vertex = edge_key
-            from_idx = self.vertices.index(from_vertex)
-            to_idx = self.vertices.index(to_vertex)
-            
-            self.adjacency_matrix[from_idx][to_idx] = times[condition]
-            
+
+        with STATS.phase('weather.switch'):
+            self.current_weather = condition
+            self._region_weather.clear()
+
+            # Copiar la columna de tiempos de la condición en un solo paso
+            column = _CONDITION_INDEX[condition]
+            self._weights = self._times[column::4]
+            self._conditions = array('b', [column]) * len(self._edge_from)
+            self._off_weather = 0
+            self._weather_changed()
+
         return True
-    
+
+    def define_region(self, name, cities):
+        """
+        Define (o redefine) una región como un conjunto de ciudades.
+
+        Una arista pertenece a la región de su ciudad de origen. Cada ciudad
+        está en una sola región: si ya estaba en otra, pasa a ésta. Definir
+        la región no cambia el clima; se aplica con set_region_weather.
+
+        Args:
+            name (str): Nombre de la región
+            cities (iterable): Ciudades de la región
+
+        Raises:
+            ValueError: Si alguna ciudad no existe
+        """
+        members = []
+        for city in cities:
+            idx = self._names.lookup(city)
+            if idx == -1:
+                raise ValueError(f"La ciudad '{city}' no existe en el grafo")
+            members.append(idx)
+        for idx in self._regions.pop(name, ()):
+            self._vertex_region.pop(idx, None)
+        for idx in members:
+            previous = self._vertex_region.get(idx)
+            if previous is not None and previous != name:
+                self._regions[previous].remove(idx)
+            self._vertex_region[idx] = name
+        self._regions[name] = sorted(set(members))
+        self.region_version += 1
+
+    def regions(self):
+        """
+        Returns:
+            dict: Región -> lista de nombres de sus ciudades
+        """
+        return {name: [self.vertices[idx] for idx in members] for name, members in self._regions.items()}
+
+    def region_weather(self):
+        """
+        Returns:
+            dict: Región -> condición asignada (sólo las que tienen una)
+        """
+        return dict(self._region_weather)
+
+    def set_region_weather(self, region, condition):
+        """
+        Asigna una condición climática a las aristas que salen de una región.
+
+        Args:
+            region (str): Nombre de la región (ver define_region)
+            condition (str): Condición climática
+
+        Returns:
+            int: Aristas cuya condición cambió
+
+        Raises:
+            ValueError: Si la región o la condición no existen
+        """
+        return self.set_weather_conditions({region: condition})
+
+    def set_weather_conditions(self, assignments):
+        """
+        Asigna condiciones a varias regiones a la vez.
+
+        Las aristas se agrupan por condición nueva, así que una
+        actualización de cientos de regiones cuesta a lo sumo cuatro
+        indexaciones vectorizadas.
+
+        Args:
+            assignments (dict): Región -> condición climática
+
+        Returns:
+            int: Aristas cuya condición cambió
+
+        Raises:
+            ValueError: Si alguna región o condición no existe (no se aplica ninguna)
+        """
+        for region, condition in assignments.items():
+            if region not in self._regions:
+                raise ValueError(f"Región desconocida: {region}")
+            if condition not in WEATHER_CONDITIONS:
+                raise ValueError(f"Condición climática no válida: {condition}")
+
+        with STATS.phase('weather.regions'):
+            by_condition = {}
+            for region, condition in assignments.items():
+                self._region_weather[region] = condition
+                edges = by_condition.setdefault(_CONDITION_INDEX[condition], [])
+                for idx in self._regions[region]:
+                    edges.extend(self._out[idx].values())
+            return sum(self._assign_conditions(edges, column) for column, edges in by_condition.items())
+
+    def set_edge_weather(self, from_vertex, to_vertex, condition):
+        """
+        Asigna una condición climática a una sola arista.
+
+        Args:
+            from_vertex (str): Ciudad origen
+            to_vertex (str): Ciudad destino
+            condition (str): Condición climática
+
+        Returns:
+            bool: True si la condición de la arista cambió
+
+        Raises:
+            ValueError: Si la arista o la condición no existen
+        """
+        if condition not in WEATHER_CONDITIONS:
+            raise ValueError(f"Condición climática no válida: {condition}")
+        edge = self.weather_times._edge_id((from_vertex, to_vertex))
+        if edge is None:
+            raise ValueError(f"No existe tráfico directo entre {from_vertex} y {to_vertex}")
+        return self._assign_conditions([edge], _CONDITION_INDEX[condition]) > 0
+
+    def edge_weather(self, from_vertex, to_vertex):
+        """
+        Condición climática actual de una arista.
+
+        Returns:
+            str: Condición de la arista, o None si no existe
+        """
+        edge = self.weather_times._edge_id((from_vertex, to_vertex))
+        return None if edge is None else WEATHER_CONDITIONS[self._conditions[edge]]
+
+    def has_mixed_weather(self):
+        """
+        Returns:
+            bool: True si alguna arista tiene una condición distinta de current_weather
+        """
+        return self._off_weather > 0
+
+    @property
+    def weather_state(self):
+        """
+        Identifica los tiempos actuales: la condición si es la misma en todo
+        el grafo, o ('mixto', weather_version) si hay clima por región.
+        """
+        if self._off_weather:
+            return ('mixto', self.weather_version)
+        return self.current_weather
+
+    def _assign_conditions(self, edges, column):
+        """
+        Cambia la condición de unas aristas y recalcula sólo las que cambian.
+
+        Con NumPy los tiempos nuevos se obtienen con una sola indexación
+        (fila = arista, columna = condición) sobre el arreglo E×4.
+
+        Returns:
+            int: Aristas cuya condición cambió
+        """
+        current = _CONDITION_INDEX[self.current_weather]
+        if np is not None and len(edges) >= _VECTOR_MIN_EDGES:
+            conditions = np.frombuffer(self._conditions, dtype=np.int8)
+            idx = np.asarray(edges, dtype=np.intp)
+            idx = idx[conditions[idx] != column]
+            changed = len(idx)
+            if changed:
+                leaving = int(np.count_nonzero(conditions[idx] != current))
+                self._off_weather += (changed if column != current else 0) - leaving
+                conditions[idx] = column
+                times = np.frombuffer(self._times, dtype=np.float64).reshape(-1, 4)
+                np.frombuffer(self._weights, dtype=np.float64)[idx] = times[idx, column]
+            # Soltar las vistas para que los arreglos puedan crecer después
+            del conditions, idx
+        else:
+            changed = 0
+            for edge in edges:
+                old = self._conditions[edge]
+                if old == column:
+                    continue
+                self._off_weather += (column != current) - (old != current)
+                self._conditions[edge] = column
+                self._weights[edge] = self._times[4 * edge + column]
+                changed += 1
+        if changed:
+            self._weather_changed()
+        STATS.count('weather.edges_rematerialized', changed)
+        return changed
+
+    def _weather_changed(self):
+        """
+        Registra un cambio de los tiempos actuales.
+        """
+        self.weather_version += 1
+        # Las CSR del clima mixto dependen de los tiempos actuales
+        self._csr_cache.pop((None, False), None)
+        self._csr_cache.pop((None, True), None)
+
+    def edges(self, condition=None):
+        """
+        Recorre las aristas del grafo.
+
+        Args:
+            condition (str): Condición climática; None usa la actual
+
+        Yields:
+            tuple: (índice_origen, índice_destino, tiempo)
+        """
+        for from_idx, targets in enumerate(self._out):
+            for to_idx, edge in targets.items():
+                yield from_idx, to_idx, self._edge_weight(edge, condition)
+
+    def csr(self, condition=None, reverse=False):
+        """
+        Devuelve las aristas en formato CSR (filas comprimidas).
+
+        Las aristas que salen del vértice u son indices[indptr[u]:indptr[u + 1]]
+        con sus tiempos en la misma posición de weights. El resultado se
+        reutiliza mientras el grafo no cambie.
+
+        Args:
+            condition (str): Condición climática; None usa los tiempos
+                actuales (también con clima por región)
+            reverse (bool): Si es True, agrupa las aristas por destino
+                (aristas entrantes) en lugar de por origen
+
+        Returns:
+            CSRAdjacency: Tupla (indptr, indices, weights)
+        """
+        if condition is None and not self._off_weather:
+            condition = self.current_weather
+        if self._csr_version != self.version:
+            self._csr_cache.clear()
+            self._csr_version = self.version
+        key = (condition, reverse)
+        if key not in self._csr_cache:
+            with STATS.phase('graph.csr'):
+                self._csr_cache[key] = self._build_csr(condition, reverse)
+        return self._csr_cache[key]
+
+    def _build_csr(self, condition, reverse):
+        """
+        Construye la representación CSR en O(V + E).
+        """
+        n = len(self.vertices)
+        # Sin condición (clima mixto) se usan los tiempos actuales de cada arista
+        if condition is None:
+            source, stride, column = self._weights, 1, 0
+        else:
+            source, stride, column = self._times, 4, _CONDITION_INDEX[condition]
+        if not reverse:
+            indptr = array('i', [0])
+            indices = array('i')
+            weights = array('d')
+            for targets in self._out:
+                for to_idx, edge in targets.items():
+                    indices.append(to_idx)
+                    weights.append(source[stride * edge + column])
+                indptr.append(len(indices))
+            return CSRAdjacency(indptr, indices, weights)
+
+        # Conteo por destino y colocación de cada arista en su posición
+        counts = [0] * (n + 1)
+        for targets in self._out:
+            for to_idx in targets:
+                counts[to_idx + 1] += 1
+        for idx in range(n):
+            counts[idx + 1] += counts[idx]
+        indptr = array('i', counts)
+        position = counts[:-1]
+        indices = array('i', bytes(4 * counts[n]))
+        weights = array('d', bytes(8 * counts[n]))
+        for from_idx, targets in enumerate(self._out):
+            for to_idx, edge in targets.items():
+                slot = position[to_idx]
+                indices[slot] = from_idx
+                weights[slot] = source[stride * edge + column]
+                position[to_idx] = slot + 1
+        return CSRAdjacency(indptr, indices, weights)
+
+    def weather_view(self, condition):
+        """
+        Vista de sólo lectura del grafo con los tiempos de una condición.
+
+        No modifica el grafo ni su condición climática actual.
+
+        Args:
+            condition (str): Condición climática ('normal', 'lluvia', 'nieve', 'tormenta')
+
+        Returns:
+            object: Vista con vertices, adjacency_matrix, edges() y csr()
+        """
+        if condition not in WEATHER_CONDITIONS:
+            raise ValueError(f"Condición climática no válida: {condition}")
+        return _WeatherGraphView(self, condition)
+
+    def vertex_index(self, vertex):
+        """
+        Devuelve el índice de una ciudad en O(1).
+
+        Args:
+            vertex (str): Nombre de la ciudad, sin distinguir mayúsculas
+
+        Returns:
+            int: Índice de la ciudad, o -1 si no existe
+        """
+        return self._names.lookup(vertex)
+
+    def find_cities(self, prefix, limit=10):
+        """
+        Busca ciudades cuyo nombre empieza por un prefijo.
+
+        Args:
+            prefix (str): Comienzo del nombre, sin distinguir mayúsculas
+            limit (int): Máximo de resultados
+
+        Returns:
+            list: Nombres de ciudades en orden alfabético
+        """
+        return self._names.with_prefix(prefix, limit)
+
+    def suggest_cities(self, name, limit=3):
+        """
+        Sugiere ciudades parecidas a un nombre que no existe.
+
+        Args:
+            name (str): Nombre escrito por el usuario
+            limit (int): Máximo de sugerencias
+
+        Returns:
+            list: Nombres de ciudades parecidas
+        """
+        return self._names.suggest(name, limit)
+
     def get_vertex_count(self):
         """
         Retorna el número de vértices en el grafo.
-        
+
         Returns:
             int: Número de vértices
         """
         return len(self.vertices)
-    
+
+    def get_edge_count(self):
+        """
+        Retorna el número de aristas en el grafo.
+
+        Returns:
+            int: Número de aristas
+        """
+        return len(self._edge_from) - len(self._free_edges)
+
     def display_adjacency_matrix(self):
         """
         Muestra la matriz de adyacencia en un formato legible.
@@ -177,21 +940,228 @@ class Graph:
         if not self.vertices:
             print("El grafo está vacío")
             return
-            
+
         print("\nMatriz de Adyacencia (condición actual: " + self.current_weather + "):")
         print("     ", end="")
-        
+
         # Mostrar encabezado con nombres de ciudades
         for city in self.vertices:
             print(f"{city[:8]:<10}", end="")
         print()
-        
+
         # Mostrar filas de la matriz
         for i, city in enumerate(self.vertices):
+            row = self.adjacency_matrix[i].copy()
             print(f"{city[:8]:<8}", end="")
             for j in range(len(self.vertices)):
-                if self.adjacency_matrix[i][j] == float('inf'):
+                if row[j] == float('inf'):
                     print("∞      ", end="")
                 else:
-                    print(f"{self.adjacency_matrix[i][j]:<8.1f}", end="")
-            print()
\ No newline at end of file
+                    print(f"{row[j]:<8.1f}", end="")
+            print()
+
+
+class GraphTransaction:
+    """
+    Lote de cambios que se valida y se aplica de una sola vez.
+
+    Las operaciones sólo se registran; commit() las valida todas contra el
+    estado que irá teniendo el grafo y, si ninguna falla, las aplica en
+    orden con un único incremento de versión. Descartar la transacción (o
+    que falle la validación) no toca el grafo, así que no hay nada que
+    deshacer. Usada como contexto se confirma al salir del bloque, salvo
+    que haya ocurrido una excepción.
+
+    Ejemplo:
+        with graph.transaction() as batch:
+            batch.remove_edge('Lima', 'Quito')
+            batch.set_time('Lima', 'SaoPaulo', 'nieve', 45)
+            batch.set_weather_condition('nieve')
+
+    Attributes:
+        graph (Graph): Grafo al que se aplican los cambios
+        delta (GraphDelta): Cambios aplicados por commit(); None antes. Su
+            campo weather es la condición global si cambiaron los tiempos
+            actuales por el clima (weather_state), o None
+    """
+
+    def __init__(self, graph, on_commit=None):
+        """
+        Args:
+            graph (Graph): Grafo al que se aplican los cambios
+            on_commit (callable): Función que recibe el GraphDelta aplicado
+        """
+        self.graph = graph
+        self.delta = None
+        self._on_commit = on_commit
+        self._operations = []
+        self._closed = False
+
+    def __len__(self):
+        return len(self._operations)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+    def _record(self, operation):
+        if self._closed:
+            raise RuntimeError("La transacción ya se confirmó o se descartó")
+        self._operations.append(operation)
+
+    def add_edge(self, from_vertex, to_vertex, normal_time, rain_time, snow_time, storm_time):
+        """
+        Agrega (o sobrescribe) una arista; las ciudades nuevas se crean.
+        """
+        self._record(('add', from_vertex, to_vertex, (normal_time, rain_time, snow_time, storm_time)))
+
+    def remove_edge(self, from_vertex, to_vertex):
+        """
+        Elimina una arista, que debe existir al llegar a esta operación.
+        """
+        self._record(('remove', from_vertex, to_vertex))
+
+    def set_time(self, from_vertex, to_vertex, condition, time):
+        """
+        Cambia el tiempo de una arista existente con una condición climática.
+        """
+        self._record(('time', from_vertex, to_vertex, condition, time))
+
+    def set_weather_condition(self, condition):
+        """
+        Cambia la condición climática de todo el grafo.
+        """
+        self._record(('weather', condition))
+
+    def errors(self):
+        """
+        Valida las operaciones sin aplicar ninguna.
+
+        Returns:
+            list: Mensajes de error, uno por operación inválida
+        """
+        graph = self.graph
+        exists = {}  # (origen, destino) normalizados -> si la arista existirá
+
+        def edge_exists(from_vertex, to_vertex):
+            key = (normalize_name(from_vertex), normalize_name(to_vertex))
+            if key not in exists:
+                from_idx = graph.vertex_index(from_vertex)
+                to_idx = graph.vertex_index(to_vertex)
+                exists[key] = from_idx != -1 and to_idx != -1 and to_idx in graph._out[from_idx]
+            return key, exists[key]
+
+        def valid_time(value):
+            return isinstance(value, (int, float)) and not isnan(value) and value >= 0
+
+        errors = []
+        for number, (kind, *args) in enumerate(self._operations, 1):
+            if kind == 'weather':
+                if args[0] not in WEATHER_CONDITIONS:
+                    errors.append(f"{number}: Condición climática no válida: {args[0]}")
+                continue
+            from_vertex, to_vertex = args[0], args[1]
+            if not all(isinstance(name, str) and name.strip() for name in (from_vertex, to_vertex)):
+                errors.append(f"{number}: Nombre de ciudad no válido")
+                continue
+            key, present = edge_exists(from_vertex, to_vertex)
+            if kind == 'add':
+                if not all(valid_time(value) for value in args[2]):
+                    errors.append(f"{number}: Los tiempos deben ser números no negativos")
+                    continue
+                exists[key] = True
+            elif not present:
+                errors.append(f"{number}: No existe tráfico directo entre {from_vertex} y {to_vertex}")
+            elif kind == 'remove':
+                exists[key] = False
+            elif args[2] not in WEATHER_CONDITIONS:
+                errors.append(f"{number}: Condición climática no válida: {args[2]}")
+            elif not valid_time(args[3]):
+                errors.append(f"{number}: Los tiempos deben ser números no negativos")
+        return errors
+
+    def commit(self):
+        """
+        Valida y aplica todas las operaciones.
+
+        Returns:
+            GraphDelta: Cambios aplicados
+
+        Raises:
+            ValueError: Si alguna operación no es válida; el grafo no cambia
+            RuntimeError: Si la transacción ya se confirmó o se descartó
+        """
+        if self._closed:
+            raise RuntimeError("La transacción ya se confirmó o se descartó")
+        errors = self.errors()
+        if errors:
+            self.discard()
+            raise ValueError("Transacción inválida:\n" + "\n".join(errors))
+        self._closed = True
+
+        graph = self.graph
+        previous_version = graph.version
+        previous_weather = graph.weather_state
+        vertex_count = len(graph.vertices)
+        before = {}  # (origen, destino) -> tiempos antes de la transacción
+
+        def remember(from_idx, to_idx):
+            key = (from_idx, to_idx)
+            if key not in before:
+                edge = graph._out[from_idx].get(to_idx)
+                before[key] = None if edge is None else tuple(graph._times[4 * edge:4 * edge + 4])
+            return key
+
+        with STATS.phase('graph.transaction'):
+            for kind, *args in self._operations:
+                if kind == 'weather':
+                    graph.set_weather_condition(args[0])
+                    continue
+                if kind == 'add':
+                    from_idx = graph._intern(args[0])
+                    to_idx = graph._intern(args[1])
+                    remember(from_idx, to_idx)
+                    graph._store_edge(from_idx, to_idx, args[2])
+                    continue
+                from_idx = graph.vertex_index(args[0])
+                to_idx = graph.vertex_index(args[1])
+                remember(from_idx, to_idx)
+                if kind == 'remove':
+                    graph._delete_edge(from_idx, to_idx)
+                else:
+                    edge = graph._out[from_idx][to_idx]
+                    times = list(graph._times[4 * edge:4 * edge + 4])
+                    times[_CONDITION_INDEX[args[2]]] = args[3]
+                    graph._store_edge(from_idx, to_idx, times)
+
+            edges = {}
+            for (from_idx, to_idx), old_times in before.items():
+                edge = graph._out[from_idx].get(to_idx)
+                new_times = None if edge is None else tuple(graph._times[4 * edge:4 * edge + 4])
+                if new_times != old_times:
+                    edges[(from_idx, to_idx)] = (old_times, new_times)
+            if edges or len(graph.vertices) != vertex_count:
+                graph.version += 1
+
+        STATS.count('graph.transaction_operations', len(self._operations))
+        # Volver al mismo clima global también cambia los tiempos si había
+        # clima por región o por arista
+        weather = graph.current_weather if graph.weather_state != previous_weather else None
+        self.delta = GraphDelta(previous_version, graph.version, edges, weather)
+        self._operations = []
+        if self._on_commit is not None:
+            self._on_commit(self.delta)
+        return self.delta
+
+    def discard(self):
+        """
+        Descarta las operaciones registradas sin tocar el grafo.
+        """
+        self._operations = []
+        self._closed = True
@@ -0,0 +1,377 @@
+"""
+Actualización incremental de las rutas más cortas.
+
+Cuando se agrega una arista nueva o se abarata una existente no hace falta
+repetir Floyd-Warshall: basta con comprobar, para cada par (i, j), si el
+camino i -> u -> v -> j mejora la distancia actual. Eso cuesta O(n²) en
+lugar de O(n³).
+
+Cuando se elimina una arista sólo cambian los pares cuyo camino más corto
+la usaba. Esos pares se localizan con la matriz de predecesores y se
+reparan con un Dijkstra restringido a ellos desde cada origen afectado.
+
+Un lote de cambios (ver GraphTransaction en src/graph.py) se aplica de
+una vez: primero se reparan los pares afectados por las aristas eliminadas
+o encarecidas y después se aplican las abaratadas. Si el lote es grande
+en proporción al grafo se recalcula todo.
+"""
+
+import heapq
+
+from src.floyd_warshall import INF
+from src.apsp import all_pairs_shortest_paths
+from src.graph import CSRAdjacency
+from src.stats import STATS
+
+# Fracción de pares afectados a partir de la cual conviene recalcular todo
+DEFAULT_MAX_AFFECTED_FRACTION = 0.25
+
+# Un lote se aplica de forma incremental mientras tenga como mucho una arista
+# cambiada por cada INCREMENTAL_RATIO vértices: cada cambio cuesta O(n²) en
+# Python y con unas n / 25 aristas ya iguala a un recálculo completo
+DEFAULT_INCREMENTAL_RATIO = 25
+
+
+def grow_matrices(dist, path, n):
+    """
+    Amplía las matrices de distancias y caminos hasta n vértices.
+
+    Los vértices nuevos quedan aislados: distancia 0 a sí mismos e
+    infinita al resto.
+
+    Args:
+        dist (list): Matriz de distancias más cortas (se modifica en sitio)
+        path (list): Matriz de caminos (se modifica en sitio)
+        n (int): Número total de vértices del grafo
+    """
+    old_n = len(dist)
+    if n <= old_n:
+        return
+    if hasattr(dist, 'grow'):
+        # Matrices compactas (ver src/compact.py)
+        dist.grow(n)
+        path.grow(n)
+        return
+    for i in range(old_n):
+        # Las filas de una instantánea son vistas de tamaño fijo
+        if not isinstance(dist[i], list):
+            dist[i] = list(dist[i])
+            path[i] = list(path[i])
+        dist[i].extend([INF] * (n - old_n))
+        path[i].extend([-1] * (n - old_n))
+    for i in range(old_n, n):
+        dist_row = [INF] * n
+        path_row = [-1] * n
+        dist_row[i] = 0
+        path_row[i] = i
+        dist.append(dist_row)
+        path.append(path_row)
+
+
+def update_for_cheaper_edge(dist, path, u, v, weight, touched=None):
+    """
+    Actualiza las matrices tras agregar o abaratar la arista u -> v.
+
+    Args:
+        dist (list): Matriz de distancias más cortas (se modifica en sitio)
+        path (list): Matriz de caminos (se modifica en sitio)
+        u (int): Índice del vértice origen de la arista
+        v (int): Índice del vértice destino de la arista
+        weight (float): Nuevo peso de la arista
+        touched (set): Si se da, se le agregan las filas modificadas
+
+    Returns:
+        bool: True si alguna distancia cambió
+    """
+    if weight >= dist[u][v]:
+        return False
+
+    n = len(dist)
+    # La fila de v y la columna de u no cambian con pesos no negativos
+    dist_v = dist[v]
+    path_v = path[v]
+    changed = False
+
+    for i in range(n):
+        dist_i = dist[i]
+        through_edge = dist_i[u] + weight
+        # Si la nueva arista no mejora el camino a v, tampoco mejora ningún otro
+        if through_edge >= dist_i[v]:
+            continue
+        if touched is not None:
+            touched.add(i)
+        path_i = path[i]
+        for j in range(n):
+            candidate = through_edge + dist_v[j]
+            if candidate < dist_i[j]:
+                dist_i[j] = candidate
+                path_i[j] = u if j == v else path_v[j]
+                changed = True
+
+    return changed
+
+
+def add_edge_incremental(graph, dist, path, from_vertex, to_vertex,
+                         normal_time, rain_time, snow_time, storm_time, engine='auto'):
+    """
+    Agrega una arista al grafo y actualiza las rutas más cortas.
+
+    Si la arista es nueva o más barata que la anterior se actualizan las
+    matrices en O(n²). Si encarece una arista existente se recalcula todo
+    (ver all_pairs_shortest_paths), porque algunos caminos pueden dejar de ser óptimos.
+
+    Args:
+        graph (Graph): El grafo a modificar
+        dist (list): Matriz de distancias más cortas actual
+        path (list): Matriz de caminos actual
+        from_vertex (str): Ciudad origen
+        to_vertex (str): Ciudad destino
+        normal_time (float): Tiempo con clima normal
+        rain_time (float): Tiempo con lluvia
+        snow_time (float): Tiempo con nieve
+        storm_time (float): Tiempo con tormenta
+        engine (str): Motor de Floyd-Warshall para el recálculo completo
+
+    Returns:
+        tuple: (matriz_distancias, matriz_caminos) actualizadas
+    """
+    old_weight = INF
+    if graph.vertex_index(from_vertex) != -1 and graph.vertex_index(to_vertex) != -1:
+        old_weight = graph.adjacency_matrix[graph.vertex_index(from_vertex)][graph.vertex_index(to_vertex)]
+
+    graph.add_edge(from_vertex, to_vertex, normal_time, rain_time, snow_time, storm_time)
+    u = graph.vertex_index(from_vertex)
+    v = graph.vertex_index(to_vertex)
+    new_weight = graph.adjacency_matrix[u][v]
+
+    if new_weight > old_weight:
+        return all_pairs_shortest_paths(graph, engine=engine)
+
+    grow_matrices(dist, path, len(graph.vertices))
+    update_for_cheaper_edge(dist, path, u, v, new_weight)
+    return dist, path
+
+
+def find_affected_pairs(path, u, v):
+    """
+    Encuentra los pares cuyo camino más corto usa la arista u -> v.
+
+    Para cada origen i, la fila path[i] describe un árbol de caminos más
+    cortos. Si el predecesor de v en ese árbol es u, todos los vértices del
+    subárbol de v dependen de la arista.
+
+    Args:
+        path (list): Matriz de caminos
+        u (int): Índice del vértice origen de la arista
+        v (int): Índice del vértice destino de la arista
+
+    Returns:
+        dict: Origen -> lista de destinos afectados
+    """
+    n = len(path)
+    affected = {}
+    for i in range(n):
+        path_i = path[i]
+        if i == v or path_i[v] != u:
+            continue
+        children = [[] for _ in range(n)]
+        for j in range(n):
+            if j != i and path_i[j] != -1:
+                children[path_i[j]].append(j)
+        subtree = [v]
+        for node in subtree:
+            subtree.extend(children[node])
+        affected[i] = subtree
+    return affected
+
+
+def _repair_source(dist_i, path_i, targets, in_csr, out_csr):
+    """
+    Recalcula las distancias desde un origen sólo para los destinos dados.
+
+    Los destinos no afectados conservan su distancia, que sigue siendo
+    válida. Los afectados parten de la mejor arista que llega desde un
+    vértice no afectado y se completan con Dijkstra dentro del conjunto.
+    """
+    in_indptr, in_indices, in_weights = in_csr
+    out_indptr, out_indices, out_weights = out_csr
+    pending = set(targets)
+    heap = []
+    for a in targets:
+        best = INF
+        best_pred = -1
+        for pos in range(in_indptr[a], in_indptr[a + 1]):
+            x = in_indices[pos]
+            if x not in pending and dist_i[x] + in_weights[pos] < best:
+                best = dist_i[x] + in_weights[pos]
+                best_pred = x
+        dist_i[a] = best
+        path_i[a] = best_pred
+        if best < INF:
+            heap.append((best, a))
+    heapq.heapify(heap)
+
+    while heap:
+        d, a = heapq.heappop(heap)
+        if a not in pending or d > dist_i[a]:
+            continue
+        pending.discard(a)
+        for pos in range(out_indptr[a], out_indptr[a + 1]):
+            b = out_indices[pos]
+            if b in pending and d + out_weights[pos] < dist_i[b]:
+                dist_i[b] = d + out_weights[pos]
+                path_i[b] = a
+                heapq.heappush(heap, (dist_i[b], b))
+
+
+def update_for_removed_edge(graph, dist, path, u, v,
+                            max_affected_fraction=DEFAULT_MAX_AFFECTED_FRACTION, engine='auto',
+                            touched=None):
+    """
+    Actualiza las matrices después de eliminar la arista u -> v del grafo.
+
+    Args:
+        graph (Graph): El grafo (o una vista por clima), ya sin la arista
+        dist (list): Matriz de distancias más cortas (se modifica en sitio)
+        path (list): Matriz de caminos (se modifica en sitio)
+        u (int): Índice del vértice origen de la arista eliminada
+        v (int): Índice del vértice destino de la arista eliminada
+        max_affected_fraction (float): Fracción de pares afectados a partir
+            de la cual se recalculan todas las rutas
+        engine (str): Motor de Floyd-Warshall para el recálculo completo
+        touched (set): Si se da, se le agregan las filas reparadas; si se
+            recalcula todo se devuelven matrices nuevas
+
+    Returns:
+        tuple: (matriz_distancias, matriz_caminos) actualizadas
+    """
+    n = len(dist)
+    affected = find_affected_pairs(path, u, v)
+    affected_count = sum(len(targets) for targets in affected.values())
+    if affected_count == 0:
+        return dist, path
+    if affected_count > max_affected_fraction * n * n:
+        return all_pairs_shortest_paths(graph, engine=engine)
+
+    # Aristas entrantes y salientes en formato CSR
+    in_csr = graph.csr(reverse=True)
+    out_csr = graph.csr()
+    for i, targets in affected.items():
+        _repair_source(dist[i], path[i], targets, in_csr, out_csr)
+    if touched is not None:
+        touched.update(affected)
+    return dist, path
+
+
+def _csr_with_weights(csr, weights, reverse):
+    """
+    Copia de un CSR con los pesos de algunas aristas reemplazados.
+
+    Args:
+        csr (CSRAdjacency): Aristas en formato CSR
+        weights (dict): (u, v) -> peso que debe tener la arista u -> v
+        reverse (bool): Si el CSR agrupa las aristas por destino
+
+    Returns:
+        CSRAdjacency: Nuevo CSR (comparte indptr e indices)
+    """
+    indptr, indices, values = csr
+    values = values[:]
+    for (u, v), weight in weights.items():
+        row, column = (v, u) if reverse else (u, v)
+        for pos in range(indptr[row], indptr[row + 1]):
+            if indices[pos] == column:
+                values[pos] = weight
+                break
+    return CSRAdjacency(indptr, indices, values)
+
+
+def update_for_changed_edges(graph, dist, path, changes,
+                             max_affected_fraction=DEFAULT_MAX_AFFECTED_FRACTION, engine='auto',
+                             touched=None, incremental_ratio=DEFAULT_INCREMENTAL_RATIO):
+    """
+    Actualiza las matrices tras cambiar varias aristas a la vez.
+
+    Las rutas que usaban aristas eliminadas o encarecidas se reparan sobre
+    el grafo sin las mejoras del lote; así las matrices quedan exactas para
+    ese grafo intermedio y las aristas nuevas o abaratadas se aplican una
+    a una en O(n²) cada una.
+
+    Args:
+        graph (Graph): El grafo (o una vista por clima), ya con los cambios
+        dist (list): Matriz de distancias más cortas (se modifica en sitio),
+            ya ampliada al número de vértices del grafo
+        path (list): Matriz de caminos (se modifica en sitio)
+        changes (list): Tuplas (u, v, peso_anterior, peso_nuevo); inf
+            indica que la arista no existía o ya no existe
+        max_affected_fraction (float): Fracción de pares afectados a partir
+            de la cual se recalculan todas las rutas
+        engine (str): Motor de Floyd-Warshall para el recálculo completo
+        touched (set): Si se da, se le agregan las filas modificadas; si se
+            recalcula todo se devuelven matrices nuevas
+        incremental_ratio (int): Vértices por arista cambiada a partir de
+            los cuales se recalcula todo (ver DEFAULT_INCREMENTAL_RATIO)
+
+    Returns:
+        tuple: (matriz_distancias, matriz_caminos) actualizadas
+    """
+    n = len(dist)
+    changes = [change for change in changes if change[2] != change[3]]
+    if not changes:
+        return dist, path
+    if len(changes) * incremental_ratio > n:
+        STATS.count('incremental.batch_full')
+        return all_pairs_shortest_paths(graph, engine=engine)
+
+    cheaper = [(u, v, old, new) for u, v, old, new in changes if new < old]
+    affected = {}
+    for u, v, old, new in changes:
+        if new > old:
+            for i, targets in find_affected_pairs(path, u, v).items():
+                affected.setdefault(i, set()).update(targets)
+    if sum(len(targets) for targets in affected.values()) > max_affected_fraction * n * n:
+        STATS.count('incremental.batch_full')
+        return all_pairs_shortest_paths(graph, engine=engine)
+
+    STATS.count('incremental.batch_incremental')
+    if affected:
+        # Grafo intermedio: las aristas mejoradas conservan su peso anterior
+        previous = {(u, v): old for u, v, old, _ in cheaper}
+        in_csr = _csr_with_weights(graph.csr(reverse=True), previous, reverse=True)
+        out_csr = _csr_with_weights(graph.csr(), previous, reverse=False)
+        for i, targets in affected.items():
+            _repair_source(dist[i], path[i], targets, in_csr, out_csr)
+        if touched is not None:
+            touched.update(affected)
+    for u, v, _, new in cheaper:
+        update_for_cheaper_edge(dist, path, u, v, new, touched)
+    return dist, path
+
+
+def remove_edge_incremental(graph, dist, path, from_vertex, to_vertex,
+                            max_affected_fraction=DEFAULT_MAX_AFFECTED_FRACTION, engine='auto'):
+    """
+    Elimina una arista del grafo y repara sólo las rutas que la usaban.
+
+    Args:
+        graph (Graph): El grafo a modificar
+        dist (list): Matriz de distancias más cortas actual
+        path (list): Matriz de caminos actual
+        from_vertex (str): Ciudad origen (sin distinguir mayúsculas)
+        to_vertex (str): Ciudad destino (sin distinguir mayúsculas)
+        max_affected_fraction (float): Fracción de pares afectados a partir
+            de la cual se recalculan todas las rutas
+        engine (str): Motor de Floyd-Warshall para el recálculo completo
+
+    Returns:
+        tuple: (eliminada, matriz_distancias, matriz_caminos); si la arista
+               no se pudo eliminar las matrices se devuelven sin cambios
+    """
+    if not graph.remove_edge(from_vertex, to_vertex):
+        return False, dist, path
+
+    u = graph.vertex_index(from_vertex)
+    v = graph.vertex_index(to_vertex)
+    dist, path = update_for_removed_edge(graph, dist, path, u, v,
+                                         max_affected_fraction, engine)
+    return True, dist, path
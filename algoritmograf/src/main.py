@@ -5,14 +5,183 @@ Esta implementación permite:
 - Calcular las rutas más cortas entre cualquier par de ciudades
 - Encontrar el centro del grafo
 - Modificar el grafo dinámicamente
+- Resolver lotes de consultas sin menú (opción --batch)
+- Medir tiempos por fase y contadores de los algoritmos (opción --stats)
+- Responder consultas con jerarquías de contracción (opción --method hierarchy)
 """
 
+import argparse
 import os
-from src.graph import Graph  # Cambiado
-from src.floyd_warshall import floyd_warshall  # Cambiado
-from src.utils import read_graph_from_file, display_shortest_path, find_graph_center  # Cambiado
+import sys
+from contextlib import redirect_stdout
+from src.graph import Graph, WEATHER_CONDITIONS  # Cambiado
+from src.utils import read_graph_from_file, display_shortest_path, find_graph_center, display_center_report  # Cambiado
+from src.weather_cache import WeatherScenarioCache
+from src.routing import LazyRouter
+from src.route_cache import RouteCache
+from src.snapshot import file_digest, load_snapshot, save_snapshot
+from src.compact import DISTANCE_DTYPES
+from src.batch import BatchRouter, read_pairs, write_results, OUTPUT_FORMATS
+from src.stats import STATS, MetricsDumper
 
-def main():
+def load_with_snapshot(source_path, snapshot_path, precompute=True, dist_dtype=None):
+    """
+    Carga el grafo y sus rutas desde una instantánea si el archivo no cambió.
+    
+    Si la instantánea no existe o corresponde a otro contenido del archivo
+    de aristas, se lee el archivo de texto, se calculan las rutas del clima
+    actual (si precompute es True) y se guarda una instantánea nueva. Si la
+    instantánea se guardó sin las rutas del clima actual (por ejemplo en
+    modo por lotes) y precompute es True, se calculan y se vuelve a guardar.
+    
+    Args:
+        source_path (str): Archivo de aristas en texto
+        snapshot_path (str): Archivo binario de la instantánea
+        precompute (bool): Calcular las rutas antes de guardar la instantánea
+        dist_dtype (str): Guardar las rutas en matrices compactas con este
+            tipo de distancias ('float32' o 'float64'); None usa listas
+        
+    Returns:
+        tuple: (Graph, WeatherScenarioCache)
+    """
+    try:
+        digest = file_digest(source_path)
+    except FileNotFoundError:
+        digest = None
+    
+    with STATS.phase('load.snapshot'):
+        snapshot = load_snapshot(snapshot_path, digest) if digest is not None else None
+    if snapshot is not None:
+        graph = snapshot.graph
+        scenarios = _scenario_cache(graph, dist_dtype)
+        for condition, (dist, path) in snapshot.matrices.items():
+            scenarios.seed(condition, dist, path)
+        print(f"Instantánea cargada desde {snapshot_path} "
+              f"({graph.get_vertex_count()} ciudades, rutas de: {', '.join(snapshot.matrices) or 'ninguna'})")
+        if precompute and graph.current_weather not in snapshot.matrices:
+            _precompute(graph, scenarios)
+            _save(snapshot_path, graph, scenarios, digest)
+        return graph, scenarios
+    
+    graph = read_graph_from_file(source_path)
+    scenarios = _scenario_cache(graph, dist_dtype)
+    if digest is not None:
+        if precompute:
+            _precompute(graph, scenarios)
+        _save(snapshot_path, graph, scenarios, digest)
+    return graph, scenarios
+
+def _precompute(graph, scenarios):
+    """
+    Calcula las rutas del clima actual.
+    """
+    print("\nCalculando rutas más cortas con algoritmo de Floyd-Warshall...")
+    scenarios.get(graph.current_weather)
+    print("Cálculo completado.")
+
+def _save(snapshot_path, graph, scenarios, digest):
+    """
+    Guarda la instantánea con las rutas calculadas hasta ahora.
+    """
+    try:
+        save_snapshot(snapshot_path, graph, scenarios.matrices(), digest)
+    except OSError as error:
+        print(f"No se pudo guardar la instantánea: {error}")
+
+def _scenario_cache(graph, dist_dtype=None):
+    """
+    Caché de rutas por clima, con matrices compactas si se pide un tipo.
+    """
+    if dist_dtype is None:
+        return WeatherScenarioCache(graph)
+    return WeatherScenarioCache(graph, dist_dtype=dist_dtype, path_dtype='auto')
+
+def load_data(precompute=True, use_snapshot=True, dist_dtype=None):
+    """
+    Carga el grafo de data/logistica.txt y prepara la caché de rutas.
+    
+    Args:
+        precompute (bool): Calcular las rutas del clima actual si no
+            vienen de la instantánea
+        use_snapshot (bool): Reutilizar (o crear) la instantánea binaria
+            data/logistica.snap si el archivo de aristas no cambió
+        dist_dtype (str): Tipo de las matrices compactas; None usa listas
+        
+    Returns:
+        tuple: (Graph, WeatherScenarioCache)
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    logistica_path = os.path.join(os.path.dirname(script_dir), 'data', 'logistica.txt')
+    print(f"Intentando leer archivo desde: {logistica_path}")
+    
+    if use_snapshot:
+        snapshot_path = os.path.splitext(logistica_path)[0] + '.snap'
+        return load_with_snapshot(logistica_path, snapshot_path, precompute, dist_dtype)
+    graph = read_graph_from_file(logistica_path)
+    return graph, _scenario_cache(graph, dist_dtype)
+
+def run_batch(queries, output, output_format='csv', weather='normal', with_paths=True,
+              lazy=False, use_snapshot=True, dist_dtype=None, method='dijkstra'):
+    """
+    Modo no interactivo: resuelve pares origen-destino leídos de un archivo.
+    
+    Los mensajes de carga van a la salida de errores para que la salida
+    contenga sólo los resultados.
+    
+    Args:
+        queries (file): Archivo de texto con un par de ciudades por línea
+        output (file): Archivo de texto para los resultados
+        output_format (str): 'csv' o 'jsonl'
+        weather (str): Condición climática de las consultas
+        with_paths (bool): Incluir el camino de cada par
+        lazy (bool): Resolver cada par bajo demanda en lugar de calcular
+            todas las rutas
+        use_snapshot (bool): Reutilizar la instantánea binaria
+        dist_dtype (str): Tipo de las matrices compactas; None usa listas
+        method (str): Método de LazyRouter en el modo bajo demanda
+        
+    Returns:
+        int: Número de consultas resueltas
+    """
+    with redirect_stdout(sys.stderr):
+        graph, scenarios = load_data(False, use_snapshot, dist_dtype)
+        if not graph.set_weather_condition(weather):
+            raise ValueError(f"Condición climática no válida: {weather}")
+        if lazy:
+            batch = BatchRouter(graph, router=LazyRouter(graph, method=method))
+        else:
+            batch = BatchRouter(graph, *scenarios.get(weather))
+    return write_results(batch.query(read_pairs(queries), with_paths=with_paths),
+                         output, output_format)
+
+def record_change(batch, line):
+    """
+    Registra en una transacción un cambio escrito en una línea.
+
+    Formatos admitidos:
+        cerrar ORIGEN DESTINO
+        agregar ORIGEN DESTINO NORMAL LLUVIA NIEVE TORMENTA
+        clima CONDICIÓN
+
+    Args:
+        batch (GraphTransaction): Transacción donde se registra el cambio
+        line (str): Línea escrita por el usuario
+
+    Raises:
+        ValueError: Si la línea no tiene un formato válido
+    """
+    command, *args = line.split()
+    command = command.lower()
+    if command == 'cerrar' and len(args) == 2:
+        batch.remove_edge(*args)
+    elif command == 'agregar' and len(args) == 6:
+        batch.add_edge(args[0], args[1], *(float(value) for value in args[2:]))
+    elif command == 'clima' and len(args) == 1:
+        batch.set_weather_condition(args[0].lower())
+    else:
+        raise ValueError(f"Cambio no reconocido: {line}")
+
+def main(lazy=False, use_snapshot=True, dist_dtype=None, method='bidirectional'):
     """
     Función principal del programa que implementa el algoritmo de Floyd.
     
@@ -25,23 +194,44 @@ def main():
        - Modificar el grafo
        - Salir del programa
     
+    Args:
+        lazy (bool): Modo bajo demanda: no calcula todas las rutas al
+            arrancar y resuelve cada consulta con Dijkstra bidireccional
+        use_snapshot (bool): Reutilizar (o crear) la instantánea binaria
+            data/logistica.snap si el archivo de aristas no cambió
+        dist_dtype (str): Guardar las rutas en matrices compactas con este
+            tipo de distancias ('float32' o 'float64'); None usa listas
+        method (str): Método de LazyRouter en el modo bajo demanda
+    
     Returns:
         None
     """
-    # Cargar el grafo desde el archivo
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    logistica_path = os.path.join(os.path.dirname(script_dir), 'data', 'logistica.txt')
-    print(f"Intentando leer archivo desde: {logistica_path}")
-    
-    graph = read_graph_from_file(logistica_path)
+    graph, scenarios = load_data(not lazy, use_snapshot, dist_dtype)
     
     # Mostrar la matriz de adyacencia inicial
     graph.display_adjacency_matrix()
     
-    # Calcular las rutas más cortas con Floyd-Warshall
-    print("\nCalculando rutas más cortas con algoritmo de Floyd-Warshall...")
-    distance_matrix, path_info = floyd_warshall(graph)
-    print("Cálculo completado.")
+    router = LazyRouter(graph, method=method) if lazy else None
+    # Rutas ya consultadas; se invalidan solas al modificar el grafo
+    routes = RouteCache(graph)
+
+    def current_routes():
+        """
+        Matrices de rutas del clima actual; en modo bajo demanda no se calculan.
+        """
+        if lazy:
+            return None, None
+        return scenarios.get(graph.current_weather)
+
+    precomputed = graph.current_weather in scenarios.cached_conditions()
+    if lazy:
+        print("\nModo bajo demanda: las rutas se calcularán en cada consulta.")
+    elif not precomputed:
+        # Calcular las rutas más cortas con Floyd-Warshall
+        print("\nCalculando rutas más cortas con algoritmo de Floyd-Warshall...")
+    distance_matrix, path_info = current_routes()
+    if not lazy and not precomputed:
+        print("Cálculo completado.")
 
     while True:
         print("\n" + "="*50)
@@ -63,14 +253,18 @@ def main():
             """
             city1 = input("Ingrese el nombre de la ciudad origen: ")
             city2 = input("Ingrese el nombre de la ciudad destino: ")
-            display_shortest_path(city1, city2, distance_matrix, path_info, graph)
+            display_shortest_path(city1, city2, distance_matrix, path_info, graph, router, routes)
 
         elif choice == '2':
             """
             Opción 2: Encuentra el centro del grafo.
             Calcula y muestra el vértice que representa el centro del grafo.
             """
-            center = find_graph_center(distance_matrix, graph)
+            # El centro necesita todas las distancias, también en modo bajo demanda;
+            # las excentricidades se mantienen entre consultas y cambios
+            centers = scenarios.center(graph.current_weather)
+            center = find_graph_center(centers.dist, graph, centers)
+            display_center_report(centers, graph)
             print(f"\nEl centro del grafo es: {center}")
 
         elif choice == '3':
@@ -82,19 +276,19 @@ def main():
             print("a. Interrumpir tráfico entre ciudades")
             print("b. Agregar nueva conexión entre ciudades")
             print("c. Cambiar condiciones climáticas")
+            print("d. Aplicar varios cambios a la vez")
             
-            mod_choice = input("Ingrese su opción (a/b/c): ")
+            mod_choice = input("Ingrese su opción (a/b/c/d): ")
             
             if mod_choice.lower() == 'a':
                 city1 = input("Ingrese ciudad origen: ")
                 city2 = input("Ingrese ciudad destino: ")
-                if graph.remove_edge(city1, city2):
+                # Eliminar la arista y reparar sólo las rutas que la usaban
+                if scenarios.remove_edge(city1, city2):
+                    distance_matrix, path_info = current_routes()
                     print(f"\nTráfico entre {city1} y {city2} interrumpido.")
                     print("\nMatriz de adyacencia actualizada:")
                     graph.display_adjacency_matrix()
-                    # Recalcular rutas
-                    print("\nRecalculando rutas más cortas...")
-                    distance_matrix, path_info = floyd_warshall(graph)
                     print("Rutas recalculadas correctamente.")
                 else:
                     print("No se pudo interrumpir el tráfico.")
@@ -108,10 +302,10 @@ def main():
                     snow = float(input("Tiempo con nieve: "))
                     storm = float(input("Tiempo con tormenta: "))
                     
-                    graph.add_edge(city1, city2, normal, rain, snow, storm)
+                    # Agregar la conexión y actualizar rutas de forma incremental
+                    scenarios.add_edge(city1, city2, normal, rain, snow, storm)
+                    distance_matrix, path_info = current_routes()
                     print(f"Conexión agregada entre {city1} y {city2}.")
-                    # Recalcular rutas
-                    distance_matrix, path_info = floyd_warshall(graph)
                 except ValueError:
                     print("Error: Los tiempos deben ser valores numéricos.")
                     
@@ -119,13 +313,34 @@ def main():
                 print("Condiciones disponibles: normal, lluvia, nieve, tormenta")
                 condition = input("Ingrese nueva condición climática: ").lower()
                 
+                # Las rutas de cada clima se reutilizan si ya se calcularon
                 if graph.set_weather_condition(condition):
+                    distance_matrix, path_info = current_routes()
                     print(f"Condición climática cambiada a: {condition}")
                     graph.display_adjacency_matrix()
-                    # Recalcular rutas
-                    distance_matrix, path_info = floyd_warshall(graph)
                 else:
                     print("Condición climática no válida.")
+
+            elif mod_choice.lower() == 'd':
+                print("Un cambio por línea (línea vacía para terminar):")
+                print("  cerrar ORIGEN DESTINO")
+                print("  agregar ORIGEN DESTINO NORMAL LLUVIA NIEVE TORMENTA")
+                print("  clima CONDICIÓN")
+                # Los cambios se validan juntos y las rutas se actualizan una sola vez
+                try:
+                    with scenarios.transaction() as batch:
+                        line = input("> ").strip()
+                        while line:
+                            record_change(batch, line)
+                            line = input("> ").strip()
+                except ValueError as error:
+                    print(f"No se aplicó ningún cambio. {error}")
+                else:
+                    distance_matrix, path_info = current_routes()
+                    print(f"{len(batch.delta.edges)} conexiones modificadas.")
+                    if batch.delta.weather is not None:
+                        print(f"Condición climática cambiada a: {batch.delta.weather}")
+                    graph.display_adjacency_matrix()
             else:
                 print("Opción no válida.")
 
@@ -142,5 +357,80 @@ def main():
             """
             print("Opción no válida. Por favor, intente de nuevo.")
 
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    
+    Args:
+        argv (list): Argumentos a interpretar; None usa sys.argv
+        
+    Returns:
+        argparse.Namespace: Opciones del programa
+    """
+    parser = argparse.ArgumentParser(description="Sistema de logística con rutas más cortas")
+    parser.add_argument('--lazy', action='store_true',
+                        help="calcular las rutas bajo demanda en lugar de todas al arrancar")
+    parser.add_argument('--method', choices=LazyRouter.METHODS,
+                        help="método de ruta bajo demanda (implica --lazy); 'hierarchy' "
+                             "preprocesa una jerarquía de contracción por clima")
+    parser.add_argument('--no-snapshot', dest='snapshot', action='store_false',
+                        help="leer siempre el archivo de texto sin usar la instantánea binaria")
+    parser.add_argument('--compact', nargs='?', const='float64', choices=DISTANCE_DTYPES,
+                        help="guardar las rutas en matrices compactas (por defecto float64; "
+                             "float32 usa la mitad de memoria)")
+    parser.add_argument('--batch', metavar='ARCHIVO',
+                        help="resolver sin menú los pares origen-destino del archivo ('-' para la entrada estándar)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv',
+                        help="formato de salida del modo por lotes (por defecto: csv)")
+    parser.add_argument('--output', metavar='ARCHIVO',
+                        help="archivo de resultados del modo por lotes (por defecto: salida estándar)")
+    parser.add_argument('--weather', choices=WEATHER_CONDITIONS, default='normal',
+                        help="condición climática del modo por lotes")
+    parser.add_argument('--no-paths', dest='paths', action='store_false',
+                        help="escribir sólo las distancias en el modo por lotes")
+    parser.add_argument('--stats', action='store_true',
+                        help="medir tiempos por fase y contadores y mostrarlos en JSON "
+                             "por la salida de errores al terminar")
+    parser.add_argument('--stats-file', metavar='ARCHIVO',
+                        help="escribir las estadísticas en este archivo JSON periódicamente")
+    parser.add_argument('--stats-interval', type=float, default=10.0, metavar='SEGUNDOS',
+                        help="segundos entre escrituras de --stats-file (por defecto: 10)")
+    return parser.parse_args(argv)
+
+def run(args):
+    """
+    Ejecuta el programa en modo interactivo o por lotes según las opciones.
+    
+    Args:
+        args (argparse.Namespace): Opciones de parse_args
+    """
+    lazy = args.lazy or args.method is not None
+    if args.batch is None:
+        main(lazy=lazy, use_snapshot=args.snapshot, dist_dtype=args.compact,
+             method=args.method or 'bidirectional')
+        return
+    queries = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8')
+    output = sys.stdout if args.output is None else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        run_batch(queries, output, args.format, args.weather, args.paths,
+                  lazy=lazy, use_snapshot=args.snapshot, dist_dtype=args.compact,
+                  method=args.method or 'dijkstra')
+    finally:
+        if queries is not sys.stdin:
+            queries.close()
+        if output is not sys.stdout:
+            output.close()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    STATS.enabled = args.stats or args.stats_file is not None
+    dumper = MetricsDumper(STATS, args.stats_file, args.stats_interval) if args.stats_file else None
+    if dumper is not None:
+        dumper.start()
+    try:
+        run(args)
+    finally:
+        if dumper is not None:
+            dumper.stop()
+        if args.stats:
+            print(STATS.to_json(), file=sys.stderr)
\ No newline at end of file
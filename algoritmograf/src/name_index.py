@@ -0,0 +1,147 @@
+"""
+Índice de nombres de ciudades sin distinguir mayúsculas/minúsculas.
+
+Mantiene un diccionario nombre normalizado -> índice para búsquedas en
+O(1) y una lista ordenada de nombres normalizados para búsquedas por
+prefijo y sugerencias ante errores de escritura sin recorrer todas las
+ciudades.
+"""
+
+from bisect import bisect_left
+from difflib import SequenceMatcher
+
+
+def normalize_name(name):
+    """
+    Normaliza un nombre de ciudad para compararlo.
+
+    Args:
+        name (str): Nombre tal como lo escribe el usuario
+
+    Returns:
+        str: Nombre sin espacios en los extremos y en minúsculas
+    """
+    return name.strip().casefold()
+
+
+class NameIndex:
+    """
+    Índice nombre de ciudad -> índice de vértice.
+
+    Attributes:
+        names (list): Nombres originales, en el orden de sus índices
+    """
+
+    def __init__(self):
+        """
+        Inicializa un índice vacío.
+        """
+        self.names = []
+        self._ids = {}  # Nombre normalizado -> índice
+        self._sorted = []  # Nombres normalizados ordenados (se reconstruye bajo demanda)
+        self._sorted_dirty = False
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, name):
+        return normalize_name(name) in self._ids
+
+    def lookup(self, name):
+        """
+        Busca el índice de una ciudad sin distinguir mayúsculas.
+
+        Args:
+            name (str): Nombre de la ciudad
+
+        Returns:
+            int: Índice de la ciudad, o -1 si no existe
+        """
+        return self._ids.get(normalize_name(name), -1)
+
+    def add(self, name):
+        """
+        Registra una ciudad si no existía.
+
+        Args:
+            name (str): Nombre de la ciudad
+
+        Returns:
+            tuple: (índice, True si se agregó o False si ya existía)
+        """
+        key = normalize_name(name)
+        idx = self._ids.get(key)
+        if idx is not None:
+            return idx, False
+        idx = len(self.names)
+        self._ids[key] = idx
+        self.names.append(name)
+        self._sorted_dirty = True
+        return idx, True
+
+    def _sorted_keys(self):
+        """
+        Devuelve los nombres normalizados ordenados.
+        """
+        if self._sorted_dirty:
+            self._sorted = sorted(self._ids)
+            self._sorted_dirty = False
+        return self._sorted
+
+    def _range(self, prefix):
+        """
+        Rango de la lista ordenada cuyos nombres empiezan por prefix.
+        """
+        keys = self._sorted_keys()
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + '\U0010ffff', start)
+        return keys, start, end
+
+    def with_prefix(self, prefix, limit=10):
+        """
+        Busca ciudades cuyo nombre empieza por un prefijo.
+
+        Args:
+            prefix (str): Comienzo del nombre, sin distinguir mayúsculas
+            limit (int): Máximo de resultados
+
+        Returns:
+            list: Nombres originales en orden alfabético
+        """
+        keys, start, end = self._range(normalize_name(prefix))
+        end = min(end, start + limit)
+        return [self.names[self._ids[key]] for key in keys[start:end]]
+
+    def suggest(self, name, limit=3, cutoff=0.6):
+        """
+        Sugiere ciudades parecidas a un nombre mal escrito.
+
+        Sólo compara con los nombres que comparten las primeras letras,
+        acortando el prefijo hasta encontrar candidatos.
+
+        Args:
+            name (str): Nombre escrito por el usuario
+            limit (int): Máximo de sugerencias
+            cutoff (float): Similitud mínima entre 0 y 1
+
+        Returns:
+            list: Nombres originales, del más parecido al menos parecido
+        """
+        key = normalize_name(name)
+        candidates = []
+        for length in range(min(len(key), 3), 0, -1):
+            keys, start, end = self._range(key[:length])
+            candidates = keys[start:end]
+            if candidates:
+                break
+
+        scored = []
+        matcher = SequenceMatcher(b=key)
+        for candidate in candidates:
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                ratio = matcher.ratio()
+                if ratio >= cutoff:
+                    scored.append((-ratio, candidate))
+        scored.sort()
+        return [self.names[self._ids[candidate]] for _, candidate in scored[:limit]]
@@ -0,0 +1,376 @@
+"""
+Rutas entre todos los pares fuera de memoria, en archivos mapeados.
+
+Con decenas de miles de ciudades las matrices de distancias y de
+predecesores no caben en RAM. En este modo ambas se guardan en disco como
+archivos mapeados en memoria (numpy.memmap), divididos en bandas de filas
+consecutivas. Cada banda se calcula con Dijkstra desde sus orígenes y se
+escribe una sola vez, sin volver a leerse durante el cálculo; al escribirla
+se guardan también las excentricidades de sus filas, así que el centro no
+necesita recorrer la matriz.
+
+El progreso se registra en manifest.json tras escribir cada banda. Si el
+cálculo se interrumpe, al reanudarlo sobre el mismo directorio (y el
+mismo grafo y clima) sólo se calculan las bandas que faltan.
+
+Las consultas leen sólo las filas que necesitan: dist y path son vistas
+mapeadas que sirven directamente a display_shortest_path y reconstruct_path.
+
+Ejemplo:
+    store = OutOfCoreAPSP('rutas/', graph).compute(progress=print_progress)
+    display_shortest_path('Lima', 'Quito', store.dist, store.path, graph)
+    print(find_graph_center(store.dist, graph, store.center_index()))
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él este modo no está disponible
+    np = None
+
+from src.compact import DISTANCE_DTYPES, choose_predecessor_dtype
+from src.center import CenterIndex, row_eccentricity
+from src.dijkstra import _dijkstra_sources, _init_worker, _worker_sources
+from src.floyd_warshall import reconstruct_path
+from src.stats import STATS
+
+DEFAULT_BAND_SIZE = 64
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+
+INF = float('inf')
+
+
+def graph_fingerprint(graph):
+    """
+    Huella de las ciudades y de los tiempos actuales del grafo.
+
+    Args:
+        graph (Graph): El grafo
+
+    Returns:
+        str: Resumen SHA-256 en hexadecimal
+    """
+    digest = hashlib.sha256()
+    digest.update('\n'.join(graph.vertices).encode('utf-8'))
+    for part in graph.csr():
+        digest.update(part.tobytes())
+    return digest.hexdigest()
+
+
+def _band_eccentricities(dist, start):
+    """
+    Excentricidades de las filas de una banda (filas start, start + 1, ...).
+    """
+    result = dist.max(axis=1).astype(np.float64) if dist.shape[1] > 1 else np.zeros(len(dist))
+    for offset in range(len(dist)):
+        i = start + offset
+        if dist[offset, i] == result[offset] and result[offset] > 0:
+            result[offset] = row_eccentricity(dist[offset].tolist(), i)
+    return result
+
+
+class OutOfCoreAPSP:
+    """
+    Matrices de rutas más cortas guardadas en disco por bandas de filas.
+
+    Attributes:
+        directory (str): Directorio con las matrices y el manifiesto
+        n (int): Número de ciudades
+        band_size (int): Filas por banda
+        dist (numpy.memmap): Matriz de distancias (sólo lectura tras compute)
+        path (numpy.memmap): Matriz de predecesores (sólo lectura tras compute)
+    """
+
+    def __init__(self, directory, graph, band_size=DEFAULT_BAND_SIZE, dist_dtype='float64'):
+        """
+        Prepara el directorio, reutilizando el progreso guardado si
+        corresponde al mismo grafo, clima y formato.
+
+        Args:
+            directory (str): Directorio de trabajo (se crea si no existe)
+            graph (Graph): El grafo, con el clima que se quiere calcular
+            band_size (int): Filas por banda
+            dist_dtype (str): 'float64' o 'float32'
+
+        Raises:
+            ImportError: Si NumPy no está instalado
+            ValueError: Si el grafo no tiene ciudades, band_size no es
+                positivo o el tipo no es válido
+        """
+        if np is None:
+            raise ImportError("El modo fuera de memoria requiere tener NumPy instalado")
+        if band_size < 1:
+            raise ValueError("El tamaño de banda debe ser positivo")
+        if dist_dtype not in DISTANCE_DTYPES:
+            raise ValueError(f"Tipo de distancias no válido: {dist_dtype}")
+        if not graph.vertices:
+            raise ValueError("El grafo no tiene ciudades")
+
+        self.directory = directory
+        self.graph = graph
+        self.n = len(graph.vertices)
+        self.band_size = band_size
+        self._manifest = {
+            'format': FORMAT_VERSION,
+            'n': self.n,
+            'fingerprint': graph_fingerprint(graph),
+            'band_size': band_size,
+            'dist_dtype': dist_dtype,
+            'path_dtype': choose_predecessor_dtype(self.n),
+            'done': [],
+        }
+        os.makedirs(directory, exist_ok=True)
+        previous = self._read_manifest()
+        resume = previous is not None and all(
+            previous.get(key) == value for key, value in self._manifest.items() if key != 'done')
+        resume = resume and all(os.path.exists(self._file(name))
+                                for name in ('dist', 'path', 'eccentricity'))
+        if resume:
+            self._manifest['done'] = previous['done']
+        self._done = set(self._manifest['done'])
+        mode = 'r+' if resume else 'w+'
+        if not resume:
+            # El manifiesto viejo describe otros archivos: se descarta primero
+            self._write_manifest()
+        shape = (self.n, self.n)
+        self.dist = np.memmap(self._file('dist'), dtype=dist_dtype, mode=mode, shape=shape)
+        self.path = np.memmap(self._file('path'), dtype=self._manifest['path_dtype'], mode=mode,
+                              shape=shape)
+        self._eccentricities = np.memmap(self._file('eccentricity'), dtype=np.float64,
+                                         mode=mode, shape=(self.n,))
+
+    @classmethod
+    def open(cls, directory, graph):
+        """
+        Abre un cálculo existente con el tamaño de banda y tipo guardados.
+
+        Args:
+            directory (str): Directorio de un cálculo anterior
+            graph (Graph): El mismo grafo y clima con que se calculó
+
+        Returns:
+            OutOfCoreAPSP: Las matrices (completas o no, ver complete)
+
+        Raises:
+            FileNotFoundError: Si el directorio no contiene un cálculo
+            ValueError: Si el cálculo corresponde a otro grafo o clima
+        """
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as file:
+            manifest = json.load(file)
+        if manifest.get('fingerprint') != graph_fingerprint(graph):
+            raise ValueError("Las matrices guardadas corresponden a otro grafo o clima")
+        return cls(directory, graph, manifest['band_size'], manifest['dist_dtype'])
+
+    def _file(self, name):
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST), encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self):
+        """
+        Escribe el manifiesto de forma atómica.
+        """
+        filename = os.path.join(self.directory, MANIFEST)
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, 'w', encoding='utf-8') as file:
+            json.dump(self._manifest, file)
+        os.replace(tmp_filename, filename)
+
+    @property
+    def num_bands(self):
+        return (self.n + self.band_size - 1) // self.band_size
+
+    @property
+    def complete(self):
+        """
+        True si todas las bandas están calculadas.
+        """
+        return len(self._done) == self.num_bands
+
+    def pending_bands(self):
+        """
+        Returns:
+            list: Índices de las bandas que faltan por calcular
+        """
+        return [band for band in range(self.num_bands) if band not in self._done]
+
+    def _band_rows(self, band):
+        start = band * self.band_size
+        return range(start, min(start + self.band_size, self.n))
+
+    def _store_band(self, band, rows):
+        """
+        Escribe una banda en disco y la marca como hecha.
+        """
+        sources = self._band_rows(band)
+        start, stop = sources.start, sources.stop
+        dist = np.array([row[0] for row in rows], dtype=self.dist.dtype)
+        self.dist[start:stop] = dist
+        self.path[start:stop] = np.array([row[1] for row in rows], dtype=self.path.dtype)
+        self._eccentricities[start:stop] = _band_eccentricities(dist, start)
+        # Los datos deben llegar al disco antes que el manifiesto que los declara
+        self.dist.flush()
+        self.path.flush()
+        self._eccentricities.flush()
+        self._done.add(band)
+        self._manifest['done'] = sorted(self._done)
+        self._write_manifest()
+
+    def compute(self, workers=1, progress=None, max_bands=None):
+        """
+        Calcula las bandas que faltan.
+
+        Args:
+            workers (int): Número de procesos; 1 calcula en el proceso actual
+                y None usa todos los núcleos
+            progress (callable): Función llamada tras cada banda con
+                (bandas_hechas, bandas_totales, segundos_transcurridos)
+            max_bands (int): Calcular a lo sumo estas bandas en esta llamada
+                (None: todas); el resto queda para otra llamada
+
+        Returns:
+            OutOfCoreAPSP: self, para encadenar consultas
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("El número de procesos debe ser positivo")
+
+        pending = self.pending_bands()
+        if max_bands is not None:
+            pending = pending[:max_bands]
+        if not pending:
+            return self
+
+        indptr, indices, weights = (list(part) for part in self.graph.csr())
+        in_csr = self.graph.csr(reverse=True)
+        chunks = [self._band_rows(band) for band in pending]
+        counters = [0, 0]
+        started = time.perf_counter()
+
+        def finish(band, rows):
+            self._store_band(band, rows)
+            STATS.count('out_of_core.bands')
+            if progress is not None:
+                progress(len(self._done), self.num_bands, time.perf_counter() - started)
+
+        with STATS.phase('out_of_core.compute'):
+            if workers == 1 or len(chunks) == 1:
+                for band, chunk in zip(pending, chunks):
+                    finish(band, _dijkstra_sources(indptr, indices, weights, in_csr,
+                                                   chunk, self.n, counters))
+            else:
+                with Pool(workers, initializer=_init_worker,
+                          initargs=(indptr, indices, weights, in_csr)) as pool:
+                    for band, (rows, band_counters) in zip(pending, pool.imap(_worker_sources, chunks)):
+                        finish(band, rows)
+                        counters[0] += band_counters[0]
+                        counters[1] += band_counters[1]
+
+        STATS.count('apsp.relaxations_attempted', counters[0])
+        STATS.count('apsp.relaxations_succeeded', counters[1])
+        return self
+
+    def _require_complete(self):
+        if not self.complete:
+            raise RuntimeError(f"Faltan {len(self.pending_bands())} bandas por calcular")
+
+    def route(self, start, end):
+        """
+        Ruta más corta entre dos vértices leyendo sólo la fila de start.
+
+        Returns:
+            tuple: (distancia, lista de índices); ([] si no hay ruta)
+
+        Raises:
+            RuntimeError: Si el cálculo no está completo
+        """
+        self._require_complete()
+        distance = float(self.dist[start, end])
+        if distance == INF:
+            return distance, []
+        return distance, [int(idx) for idx in reconstruct_path(self.path, start, end)]
+
+    def eccentricities(self):
+        """
+        Returns:
+            list: Excentricidad de cada vértice, guardada al calcular cada banda
+        """
+        self._require_complete()
+        return self._eccentricities.tolist()
+
+    def center_index(self):
+        """
+        Índice de centralidad sin recorrer la matriz de distancias.
+
+        Returns:
+            CenterIndex: Para find_graph_center y display_center_report
+        """
+        return CenterIndex.from_eccentricities(self.dist, self.eccentricities())
+
+
+def _print_progress(done, total, seconds):
+    """
+    Muestra el avance por la salida de errores.
+    """
+    remaining = seconds / done * (total - done) if done else 0.0
+    print(f"\rBandas: {done}/{total} ({done / total:.0%}), "
+          f"{seconds:.1f} s, faltan ~{remaining:.0f} s", end='\n' if done == total else '',
+          file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    Returns:
+        int: 0 si todo fue bien, 1 si hubo un error
+    """
+    from src.utils import read_graph_from_file, display_shortest_path, find_graph_center
+
+    parser = argparse.ArgumentParser(description="Rutas entre todos los pares fuera de memoria")
+    parser.add_argument('directory', help="directorio de las matrices")
+    parser.add_argument('--graph', default=os.path.join(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))), 'data', 'logistica.txt'), help="archivo de aristas")
+    parser.add_argument('--weather', default='normal', help="condición climática")
+    parser.add_argument('--band-size', type=int, default=DEFAULT_BAND_SIZE)
+    parser.add_argument('--dtype', choices=DISTANCE_DTYPES, default='float64')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--route', nargs=2, metavar=('ORIGEN', 'DESTINO'),
+                        help="consultar una ruta al terminar")
+    parser.add_argument('--center', action='store_true', help="mostrar el centro al terminar")
+    args = parser.parse_args(argv)
+
+    with redirect_stdout(sys.stderr):
+        graph = read_graph_from_file(args.graph)
+    if not graph.set_weather_condition(args.weather):
+        print(f"Condición climática no válida: {args.weather}", file=sys.stderr)
+        return 1
+    store = OutOfCoreAPSP(args.directory, graph, args.band_size, args.dtype)
+    if store.pending_bands() and len(store.pending_bands()) < store.num_bands:
+        print(f"Reanudando: faltan {len(store.pending_bands())} de {store.num_bands} bandas",
+              file=sys.stderr)
+    store.compute(args.workers, progress=_print_progress)
+    if args.route:
+        display_shortest_path(*args.route, store.dist, store.path, graph)
+    if args.center:
+        print(f"El centro del grafo es: {find_graph_center(store.dist, graph, store.center_index())}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
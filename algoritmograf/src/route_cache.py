@@ -0,0 +1,127 @@
+"""
+Caché LRU de rutas ya reconstruidas.
+
+Reconstruir una ruta recorre la fila de predecesores y arma la lista de
+ciudades en cada consulta. Como el tráfico real se concentra en unos pocos
+cientos de pares origen-destino, RouteCache guarda las últimas rutas
+consultadas con un tamaño máximo.
+
+La clave de cada ruta es (origen, destino, clima, versión del grafo):
+- Cambiar el clima (set_weather_condition) sólo cambia la clave, así que
+  las rutas de otros climas siguen sirviendo al volver a ellos.
+- Agregar o quitar aristas (add_edge, remove_edge) aumenta la versión del
+  grafo; en la siguiente consulta se descartan todas las rutas guardadas.
+"""
+
+from collections import OrderedDict, namedtuple
+
+from src.stats import STATS
+
+DEFAULT_MAXSIZE = 1024
+
+# Ruta resuelta: nombres de las ciudades, distancia y camino (tupla de
+# ciudades, vacía si no hay ruta)
+Route = namedtuple('Route', ['origin', 'destination', 'distance', 'path'])
+
+# Contadores de la caché, al estilo de functools.lru_cache
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'invalidations',
+                                     'size', 'maxsize'])
+
+
+class RouteCache:
+    """
+    Caché LRU de rutas de un grafo.
+
+    Attributes:
+        graph (Graph): Grafo cuyas rutas se guardan
+        maxsize (int): Máximo de rutas guardadas
+    """
+
+    def __init__(self, graph, maxsize=DEFAULT_MAXSIZE):
+        """
+        Args:
+            graph (Graph): Grafo cuyas rutas se guardan
+            maxsize (int): Máximo de rutas guardadas
+
+        Raises:
+            ValueError: Si maxsize no es positivo
+        """
+        if maxsize < 1:
+            raise ValueError("El tamaño de la caché debe ser positivo")
+        self.graph = graph
+        self.maxsize = maxsize
+        self._routes = OrderedDict()
+        self._version = graph.version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _key(self, start, end):
+        """
+        Clave de un par de índices con el estado actual del grafo.
+        """
+        version = self.graph.version
+        if version != self._version:
+            # El grafo cambió: ninguna ruta guardada sigue siendo válida
+            self.invalidations += len(self._routes)
+            STATS.count('route_cache.invalidations', len(self._routes))
+            self._routes.clear()
+            self._version = version
+        return (start, end, self.graph.weather_state, version)
+
+    def get(self, start, end):
+        """
+        Ruta guardada entre dos vértices.
+
+        Args:
+            start (int): Índice del origen
+            end (int): Índice del destino
+
+        Returns:
+            Route: La ruta, o None si no está guardada
+        """
+        key = self._key(start, end)
+        route = self._routes.get(key)
+        if route is None:
+            self.misses += 1
+            STATS.count('route_cache.misses')
+            return None
+        self._routes.move_to_end(key)
+        self.hits += 1
+        STATS.count('route_cache.hits')
+        return route
+
+    def put(self, start, end, route):
+        """
+        Guarda una ruta, descartando la usada hace más tiempo si no hay lugar.
+
+        Args:
+            start (int): Índice del origen
+            end (int): Índice del destino
+            route (Route): Ruta calculada con el estado actual del grafo
+        """
+        key = self._key(start, end)
+        self._routes[key] = route
+        self._routes.move_to_end(key)
+        while len(self._routes) > self.maxsize:
+            self._routes.popitem(last=False)
+            self.evictions += 1
+            STATS.count('route_cache.evictions')
+
+    def clear(self):
+        """
+        Descarta todas las rutas sin modificar los contadores.
+        """
+        self._routes.clear()
+
+    def info(self):
+        """
+        Returns:
+            CacheInfo: Aciertos, fallos, desalojos, invalidaciones, tamaño y máximo
+        """
+        return CacheInfo(self.hits, self.misses, self.evictions, self.invalidations,
+                         len(self._routes), self.maxsize)
+
+    def __len__(self):
+        return len(self._routes)
@@ -0,0 +1,370 @@
+"""
+Consultas de ruta entre un origen y un destino sin calcular todos los pares.
+
+Para responder pocas consultas sobre una red grande no hace falta pagar el
+Θ(n³) de Floyd-Warshall al arrancar. Este módulo ofrece:
+- Dijkstra bidireccional (búsqueda desde el origen y hacia el destino)
+- A* con una heurística admisible basada en puntos de referencia (ALT)
+- LazyRouter, que elige el método y memoriza los árboles por origen (o
+  las jerarquías de contracción por clima, ver src/contraction.py)
+"""
+
+import heapq
+import time
+from collections import OrderedDict
+
+from src.dijkstra import dijkstra
+from src.contraction import ContractionHierarchy
+from src.stats import STATS
+
+INF = float('inf')
+
+
+def _tree_path(pred, source, target):
+    """
+    Reconstruye el camino source -> target a partir de un árbol de predecesores.
+    """
+    if pred[target] == -1:
+        return []
+    path = [target]
+    current = target
+    while current != source:
+        current = pred[current]
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def _cycle(graph, source, tree=None):
+    """
+    Ruta de un vértice a sí mismo, como la diagonal de Floyd-Warshall.
+
+    Sin lazo es 0; con lazo, el ciclo más corto que vuelve al origen (inf
+    si el lazo está cerrado y no hay otro ciclo). El árbol de Dijkstra ya
+    ajusta así la distancia del origen; tree permite reutilizar uno
+    memorizado.
+    """
+    indptr, indices, _ = graph.csr()
+    if all(indices[pos] != source for pos in range(indptr[source], indptr[source + 1])):
+        return 0.0, [source]
+    dist, pred = tree(source) if tree is not None else dijkstra(graph, source)
+    if dist[source] == INF:
+        return INF, []
+    previous = pred[source]
+    if previous == source:
+        return dist[source], [source, source]
+    return dist[source], _tree_path(pred, source, previous) + [source]
+
+
+def bidirectional_dijkstra(graph, source, target):
+    """
+    Ruta más corta entre dos vértices con Dijkstra bidireccional.
+
+    Avanza a la vez desde el origen (aristas salientes) y desde el destino
+    (aristas entrantes) y se detiene cuando ninguna búsqueda puede mejorar
+    el mejor camino encontrado.
+
+    Args:
+        graph (Graph): El grafo (o una vista por clima)
+        source (int): Índice del vértice de origen
+        target (int): Índice del vértice de destino
+
+    Returns:
+        tuple: (distancia, lista de índices del camino); (inf, []) si no hay
+               ruta. De un vértice a sí mismo, como la diagonal de Floyd-Warshall
+    """
+    if source == target:
+        return _cycle(graph, source)
+
+    csr = (graph.csr(), graph.csr(reverse=True))
+    dist = ({source: 0.0}, {target: 0.0})
+    pred = ({source: source}, {target: target})
+    settled = (set(), set())
+    heaps = ([(0.0, source)], [(0.0, target)])
+    best = INF
+    meeting = -1
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        # Avanzar la búsqueda con la frontera más pequeña
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        d, u = heapq.heappop(heaps[side])
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
+
+        indptr, indices, weights = csr[side]
+        side_dist = dist[side]
+        other_dist = dist[1 - side]
+        for pos in range(indptr[u], indptr[u + 1]):
+            v = indices[pos]
+            candidate = d + weights[pos]
+            if candidate < side_dist.get(v, INF):
+                side_dist[v] = candidate
+                pred[side][v] = u
+                heapq.heappush(heaps[side], (candidate, v))
+            if v in other_dist and candidate + other_dist[v] < best:
+                best = candidate + other_dist[v]
+                meeting = v
+        if u in other_dist and d + other_dist[u] < best:
+            best = d + other_dist[u]
+            meeting = u
+
+    if meeting == -1:
+        return INF, []
+
+    # Origen -> punto de encuentro, y luego punto de encuentro -> destino
+    path = [meeting]
+    current = meeting
+    while current != source:
+        current = pred[0][current]
+        path.append(current)
+    path.reverse()
+    current = meeting
+    while current != target:
+        current = pred[1][current]
+        path.append(current)
+    return best, path
+
+
+class LandmarkHeuristic:
+    """
+    Heurística admisible para A* basada en puntos de referencia (ALT).
+
+    Por la desigualdad triangular, para cada punto de referencia L:
+    d(v, t) >= d(L, t) - d(L, v) y d(v, t) >= d(v, L) - d(t, L).
+    El máximo de esas cotas nunca sobreestima la distancia real.
+
+    Attributes:
+        landmarks (list): Índices de los puntos de referencia
+    """
+
+    def __init__(self, graph, count=4):
+        """
+        Elige los puntos de referencia y calcula sus distancias.
+
+        Los puntos se eligen de forma voraz, cada uno lo más lejos posible
+        de los anteriores, para que las cotas sean más ajustadas.
+
+        Args:
+            graph (Graph): El grafo (o una vista por clima)
+            count (int): Número de puntos de referencia
+        """
+        n = len(graph.vertices)
+        self.landmarks = []
+        self._from = []  # d(L, v) para cada punto de referencia
+        self._to = []  # d(v, L) para cada punto de referencia
+        if n == 0:
+            return
+
+        closest = [INF] * n
+        candidate = 0
+        for _ in range(min(count, n)):
+            self.landmarks.append(candidate)
+            self._from.append(dijkstra(graph, candidate)[0])
+            self._to.append(dijkstra(graph, candidate, reverse=True)[0])
+            for v in range(n):
+                reach = min(self._from[-1][v], self._to[-1][v])
+                closest[v] = min(closest[v], reach)
+            # El siguiente punto es el alcanzable más lejano a los ya elegidos
+            far = [(closest[v], v) for v in range(n) if closest[v] < INF and v not in self.landmarks]
+            if not far:
+                break
+            candidate = max(far)[1]
+
+    def for_target(self, target):
+        """
+        Devuelve la heurística h(v) para un destino concreto.
+
+        Args:
+            target (int): Índice del vértice de destino
+
+        Returns:
+            callable: Función que estima la distancia de v a target
+        """
+        bounds = [(from_l, to_l, from_l[target], to_l[target])
+                  for from_l, to_l in zip(self._from, self._to)]
+
+        def heuristic(v):
+            estimate = 0.0
+            for from_l, to_l, from_l_target, to_l_target in bounds:
+                if from_l_target < INF and from_l[v] < INF:
+                    estimate = max(estimate, from_l_target - from_l[v])
+                if to_l[v] < INF and to_l_target < INF:
+                    estimate = max(estimate, to_l[v] - to_l_target)
+            return estimate
+
+        return heuristic
+
+
+def astar(graph, source, target, heuristic=None):
+    """
+    Ruta más corta entre dos vértices con A*.
+
+    Args:
+        graph (Graph): El grafo (o una vista por clima)
+        source (int): Índice del vértice de origen
+        target (int): Índice del vértice de destino
+        heuristic (callable): Estimación admisible h(v) de la distancia de
+            v a target; None equivale a Dijkstra
+
+    Returns:
+        tuple: (distancia, lista de índices del camino); (inf, []) si no hay
+               ruta. De un vértice a sí mismo, como la diagonal de Floyd-Warshall
+    """
+    if source == target:
+        return _cycle(graph, source)
+    if heuristic is None:
+        heuristic = lambda v: 0.0
+
+    indptr, indices, weights = graph.csr()
+    dist = {source: 0.0}
+    pred = {source: source}
+    settled = set()
+    heap = [(heuristic(source), 0.0, source)]
+
+    while heap:
+        _, d, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        if u == target:
+            return d, _tree_path(pred, source, target)
+        settled.add(u)
+        for pos in range(indptr[u], indptr[u + 1]):
+            v = indices[pos]
+            candidate = d + weights[pos]
+            if v not in settled and candidate < dist.get(v, INF):
+                dist[v] = candidate
+                pred[v] = u
+                heapq.heappush(heap, (candidate + heuristic(v), candidate, v))
+
+    return INF, []
+
+
+class LazyRouter:
+    """
+    Resuelve consultas origen-destino bajo demanda, sin matrices completas.
+
+    Los árboles de Dijkstra por origen se memorizan (con un límite LRU) y
+    se descartan automáticamente si cambia el grafo o el clima.
+
+    Attributes:
+        graph (Graph): Grafo sobre el que se consulta
+        method (str): 'bidirectional', 'astar', 'dijkstra' (árbol completo
+            desde el origen, que queda memorizado) o 'hierarchy' (jerarquía de
+            contracción, construida una vez por clima y versión del grafo)
+        max_sources (int): Máximo de árboles por origen memorizados
+    """
+
+    METHODS = ('bidirectional', 'astar', 'dijkstra', 'hierarchy')
+
+    def __init__(self, graph, method='bidirectional', max_sources=256, landmarks=4):
+        """
+        Inicializa el enrutador sin calcular nada todavía.
+
+        Args:
+            graph (Graph): Grafo sobre el que se consulta
+            method (str): Método para orígenes sin árbol memorizado
+            max_sources (int): Máximo de árboles por origen memorizados
+            landmarks (int): Puntos de referencia para el método 'astar'
+
+        Raises:
+            ValueError: Si el método no existe
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Método de ruta desconocido: {method}")
+        self.graph = graph
+        self.method = method
+        self.max_sources = max_sources
+        self.landmark_count = landmarks
+        self._trees = OrderedDict()  # origen -> (distancias, predecesores)
+        self._landmarks = None
+        self._hierarchies = {}  # Estado del clima -> ContractionHierarchy
+        self._state = None
+
+    def _check_state(self):
+        """
+        Descarta lo memorizado si cambió el grafo o la condición climática.
+
+        Las jerarquías de cada condición se conservan al cambiar de clima y
+        sólo se descartan si cambia el grafo.
+        """
+        state = (self.graph.version, self.graph.weather_state)
+        if state != self._state:
+            self._trees.clear()
+            self._landmarks = None
+            if self._state is None or state[0] != self._state[0]:
+                self._hierarchies.clear()
+            else:
+                # Las de un clima mixto ya no volverán a usarse
+                for key in [key for key in self._hierarchies if isinstance(key, tuple)]:
+                    del self._hierarchies[key]
+            self._state = state
+
+    def hierarchy(self):
+        """
+        Jerarquía de contracción del clima actual, construida una sola vez.
+
+        Returns:
+            ContractionHierarchy: La jerarquía
+        """
+        self._check_state()
+        key = self.graph.weather_state
+        if key not in self._hierarchies:
+            self._hierarchies[key] = ContractionHierarchy(self.graph)
+        return self._hierarchies[key]
+
+    def source_tree(self, source):
+        """
+        Árbol de rutas más cortas desde un origen, memorizado.
+
+        Args:
+            source (int): Índice del vértice de origen
+
+        Returns:
+            tuple: (fila_distancias, fila_predecesores)
+        """
+        self._check_state()
+        if source in self._trees:
+            self._trees.move_to_end(source)
+            return self._trees[source]
+        tree = dijkstra(self.graph, source)
+        self._trees[source] = tree
+        if len(self._trees) > self.max_sources:
+            self._trees.popitem(last=False)
+        return tree
+
+    def route(self, source, target):
+        """
+        Ruta más corta entre dos vértices.
+
+        Args:
+            source (int): Índice del vértice de origen
+            target (int): Índice del vértice de destino
+
+        Returns:
+            tuple: (distancia, lista de índices del camino); (inf, []) si no hay ruta
+        """
+        start = time.perf_counter()
+        result = self._route(source, target)
+        STATS.observe('query', time.perf_counter() - start)
+        return result
+
+    def _route(self, source, target):
+        """
+        Ruta más corta entre dos vértices con el método configurado.
+        """
+        self._check_state()
+        if self.method == 'hierarchy':
+            return self.hierarchy().route(source, target)
+        if source == target:
+            return _cycle(self.graph, source, self.source_tree)
+        if source in self._trees or self.method == 'dijkstra':
+            dist, pred = self.source_tree(source)
+            return dist[target], _tree_path(pred, source, target)
+        if self.method == 'astar':
+            if self._landmarks is None:
+                self._landmarks = LandmarkHeuristic(self.graph, self.landmark_count)
+            return astar(self.graph, source, target, self._landmarks.for_target(target))
+        return bidirectional_dijkstra(self.graph, source, target)
@@ -0,0 +1,376 @@
+"""
+Evaluación de escenarios hipotéticos ("¿y si...?") en paralelo.
+
+Un escenario es una condición climática más un conjunto de cambios sobre
+el grafo base: tramos cerrados y tramos con un tiempo distinto (o nuevos)
+para esa condición. Cada escenario se resuelve sobre su propia copia del
+grafo, sin modificar el original, y se compara con la línea base del mismo
+clima: qué distancias cambian, qué pares quedan desconectados y cómo se
+mueve el centro del grafo.
+
+Los escenarios se reparten en un pool de procesos. El grafo base y las
+líneas base se entregan una sola vez a cada proceso al crearlo, y cada
+proceso devuelve sólo el resumen de cada escenario, no sus matrices.
+
+Ejemplo:
+    evaluator = ScenarioEvaluator(graph, workers=4)
+    results = evaluator.evaluate([
+        Scenario('cierres con nieve', 'nieve', closures=[('A', 'B'), ('C', 'D')]),
+        Scenario('puente nuevo', overrides=[('A', 'D', 2.5)]),
+    ])
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+from contextlib import redirect_stdout
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las matrices se comparan celda a celda
+    np = None
+
+from src.graph import Graph, WEATHER_CONDITIONS
+from src.apsp import all_pairs_shortest_paths
+from src.center import CenterIndex
+from src.stats import STATS
+
+INF = float('inf')
+
+DEFAULT_MAX_CHANGES = 20
+
+# Escenario: nombre, condición climática, tramos cerrados (origen, destino)
+# y tramos con otro tiempo (origen, destino, tiempo) para esa condición
+Scenario = namedtuple('Scenario', ['name', 'weather', 'closures', 'overrides'],
+                      defaults=('normal', (), ()))
+
+# Cambio de distancia de un par respecto a la línea base
+DistanceChange = namedtuple('DistanceChange', ['origin', 'destination', 'before', 'after'])
+
+# Resultado de un escenario: pares cuya distancia cambió, pares que
+# quedaron sin ruta o la ganaron, mayor aumento finito, los cambios más
+# grandes y el centro y radio antes y después
+ScenarioResult = namedtuple('ScenarioResult', [
+    'name', 'weather', 'changed_pairs', 'disconnected_pairs', 'connected_pairs',
+    'max_increase', 'changes', 'center_before', 'center_after', 'radius_before', 'radius_after',
+])
+
+# Grafo base y líneas base dentro de cada proceso trabajador
+_worker_state = {}
+
+
+def _distances(graph, weather):
+    """
+    Matriz de distancias más cortas de un clima, en el formato más compacto.
+    """
+    dist, _ = all_pairs_shortest_paths(graph.weather_view(weather),
+                                       dist_dtype='float64' if np is not None else None)
+    return dist
+
+
+def _center_summary(dist, vertices):
+    """
+    Nombre del centro y radio de una matriz de distancias.
+    """
+    centers = CenterIndex(dist)
+    center = centers.center()
+    return (None if center is None else vertices[center]), centers.radius()
+
+
+def apply_scenario(graph, scenario):
+    """
+    Copia del grafo con los cambios de un escenario aplicados.
+
+    Args:
+        graph (Graph): Grafo base (no se modifica)
+        scenario (Scenario): Escenario a aplicar
+
+    Returns:
+        Graph: Grafo nuevo con el clima y los cambios del escenario
+    """
+    graph = graph.copy()
+    graph.set_weather_condition(scenario.weather)
+    column = WEATHER_CONDITIONS.index(scenario.weather)
+    for from_vertex, to_vertex in scenario.closures:
+        graph.remove_edge(from_vertex, to_vertex)
+    for from_vertex, to_vertex, time in scenario.overrides:
+        old_times = graph.weather_times.get((from_vertex, to_vertex))
+        # Un tramo nuevo tiene el mismo tiempo con cualquier clima
+        times = [time] * 4 if old_times is None else [old_times[c] for c in WEATHER_CONDITIONS]
+        times[column] = time
+        graph.add_edge(from_vertex, to_vertex, *times)
+    return graph
+
+
+def compare_distances(baseline, dist, vertices, max_changes=DEFAULT_MAX_CHANGES):
+    """
+    Compara dos matrices de distancias del mismo tamaño.
+
+    Args:
+        baseline: Matriz de la línea base
+        dist: Matriz del escenario
+        vertices (list): Nombres de las ciudades
+        max_changes (int): Cambios a detallar, los de mayor diferencia
+
+    Returns:
+        tuple: (pares cambiados, pares desconectados, pares conectados,
+                mayor aumento finito, lista de DistanceChange)
+    """
+    if np is not None:
+        before = np.asarray(baseline, dtype=np.float64)
+        after = np.asarray(dist, dtype=np.float64)
+        changed = np.argwhere(before != after)
+        old = before[changed[:, 0], changed[:, 1]]
+        new = after[changed[:, 0], changed[:, 1]]
+        disconnected = int(np.count_nonzero(np.isinf(new)))
+        connected = int(np.count_nonzero(np.isinf(old)))
+        finite = ~(np.isinf(old) | np.isinf(new))
+        max_increase = float(max((new - old)[finite].max(initial=0.0), 0.0))
+        # Primero los pares desconectados, después los mayores cambios
+        magnitude = np.where(finite, np.abs(new - old), INF)
+        order = np.argsort(-magnitude, kind='stable')[:max_changes]
+        changes = [DistanceChange(vertices[int(changed[k, 0])], vertices[int(changed[k, 1])],
+                                  float(old[k]), float(new[k])) for k in order.tolist()]
+        return len(changed), disconnected, connected, max_increase, changes
+
+    cells = [(i, j, baseline[i][j], dist[i][j])
+             for i in range(len(dist)) for j in range(len(dist)) if baseline[i][j] != dist[i][j]]
+    disconnected = sum(1 for *_, new in cells if new == INF)
+    connected = sum(1 for _, _, old, _ in cells if old == INF)
+    increases = [new - old for _, _, old, new in cells if old != INF and new != INF]
+    max_increase = max(max(increases, default=0.0), 0.0)
+
+    def magnitude(cell):
+        _, _, old, new = cell
+        return INF if INF in (old, new) else abs(new - old)
+
+    cells.sort(key=magnitude, reverse=True)
+    changes = [DistanceChange(vertices[i], vertices[j], old, new) for i, j, old, new in cells[:max_changes]]
+    return len(cells), disconnected, connected, max_increase, changes
+
+
+def _evaluate(graph, baselines, scenario, max_changes):
+    """
+    Resuelve un escenario y lo compara con la línea base de su clima.
+    """
+    baseline, center_before, radius_before = baselines[scenario.weather]
+    with redirect_stdout(sys.stderr):
+        modified = apply_scenario(graph, scenario)
+    dist = _distances(modified, scenario.weather)
+    center_after, radius_after = _center_summary(dist, graph.vertices)
+    changed, disconnected, connected, max_increase, changes = compare_distances(
+        baseline, dist, graph.vertices, max_changes)
+    return ScenarioResult(scenario.name, scenario.weather, changed, disconnected, connected,
+                          max_increase, changes, center_before, center_after,
+                          radius_before, radius_after)
+
+
+def _init_worker(vertices, arrays, baselines, max_changes):
+    """
+    Reconstruye el grafo base una sola vez en cada proceso trabajador.
+    """
+    _worker_state['graph'] = Graph.from_arrays(vertices, *arrays)
+    _worker_state['baselines'] = baselines
+    _worker_state['max_changes'] = max_changes
+
+
+def _worker_evaluate(scenario):
+    """
+    Resuelve un escenario dentro de un proceso trabajador.
+    """
+    return _evaluate(_worker_state['graph'], _worker_state['baselines'], scenario,
+                     _worker_state['max_changes'])
+
+
+class ScenarioEvaluator:
+    """
+    Evalúa escenarios hipotéticos sobre un grafo base.
+
+    Attributes:
+        graph (Graph): Grafo base (no se modifica)
+        workers (int): Procesos del pool
+        max_changes (int): Cambios de distancia detallados por escenario
+    """
+
+    def __init__(self, graph, workers=None, max_changes=DEFAULT_MAX_CHANGES):
+        """
+        Args:
+            graph (Graph): Grafo base
+            workers (int): Número de procesos; 1 evalúa en el proceso
+                actual y None usa todos los núcleos
+            max_changes (int): Cambios de distancia a detallar por escenario
+
+        Raises:
+            ValueError: Si el número de procesos no es positivo
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("El número de procesos debe ser positivo")
+        self.graph = graph
+        self.workers = workers
+        self.max_changes = max_changes
+        self._baselines = {}  # clima -> (distancias, centro, radio)
+        self._version = graph.version
+
+    def baseline(self, weather):
+        """
+        Distancias, centro y radio del grafo base con un clima.
+
+        Returns:
+            tuple: (matriz_distancias, nombre_del_centro, radio)
+        """
+        if self._version != self.graph.version:
+            self._baselines.clear()
+            self._version = self.graph.version
+        if weather not in self._baselines:
+            dist = _distances(self.graph, weather)
+            self._baselines[weather] = (dist, *_center_summary(dist, self.graph.vertices))
+        return self._baselines[weather]
+
+    def validate(self, scenario):
+        """
+        Comprueba que un escenario se pueda aplicar al grafo base.
+
+        Raises:
+            ValueError: Si el clima no existe, algún tramo cerrado no existe,
+                alguna ciudad es desconocida o algún tiempo es negativo
+        """
+        if scenario.weather not in WEATHER_CONDITIONS:
+            raise ValueError(f"Condición climática no válida: {scenario.weather}")
+        for from_vertex, to_vertex in scenario.closures:
+            if (from_vertex, to_vertex) not in self.graph.weather_times:
+                raise ValueError(f"{scenario.name}: no existe tráfico directo entre "
+                                 f"{from_vertex} y {to_vertex}")
+        for from_vertex, to_vertex, time in scenario.overrides:
+            for city in (from_vertex, to_vertex):
+                if self.graph.vertex_index(city) == -1:
+                    raise ValueError(f"{scenario.name}: la ciudad '{city}' no existe en el grafo")
+            if not time >= 0:
+                raise ValueError(f"{scenario.name}: tiempo no válido para {from_vertex} -> {to_vertex}")
+
+    def evaluate(self, scenarios):
+        """
+        Evalúa varios escenarios, en paralelo si hay más de un proceso.
+
+        Args:
+            scenarios (iterable): Escenarios (Scenario)
+
+        Returns:
+            list: Un ScenarioResult por escenario, en el mismo orden
+
+        Raises:
+            ValueError: Si algún escenario no es válido (ver validate)
+        """
+        scenarios = [Scenario(*scenario) for scenario in scenarios]
+        for scenario in scenarios:
+            self.validate(scenario)
+        baselines = {weather: self.baseline(weather) for weather in {s.weather for s in scenarios}}
+        STATS.count('scenarios.evaluated', len(scenarios))
+
+        with STATS.phase('scenarios'):
+            if self.workers == 1 or len(scenarios) <= 1:
+                return [_evaluate(self.graph, baselines, scenario, self.max_changes)
+                        for scenario in scenarios]
+            initargs = (list(self.graph.vertices), self.graph.edge_arrays(), baselines, self.max_changes)
+            with Pool(min(self.workers, len(scenarios)), initializer=_init_worker,
+                      initargs=initargs) as pool:
+                return pool.map(_worker_evaluate, scenarios, chunksize=1)
+
+
+def load_scenarios(filename):
+    """
+    Lee escenarios de un archivo JSON.
+
+    El archivo es una lista de objetos con las claves name, weather
+    (opcional), closures ([[origen, destino], ...]) y overrides
+    ([[origen, destino, tiempo], ...]).
+
+    Args:
+        filename (str): Ruta del archivo
+
+    Returns:
+        list: Escenarios (Scenario)
+
+    Raises:
+        ValueError: Si el formato no es válido
+    """
+    with open(filename, encoding='utf-8') as file:
+        data = json.load(file)
+    if not isinstance(data, list):
+        raise ValueError("El archivo de escenarios debe contener una lista")
+    scenarios = []
+    for position, item in enumerate(data, 1):
+        try:
+            scenarios.append(Scenario(
+                str(item.get('name', f"escenario {position}")),
+                item.get('weather', 'normal'),
+                tuple((str(a), str(b)) for a, b in item.get('closures', ())),
+                tuple((str(a), str(b), float(time)) for a, b, time in item.get('overrides', ())),
+            ))
+        except (AttributeError, TypeError, ValueError):
+            raise ValueError(f"Escenario {position} con formato incorrecto") from None
+    return scenarios
+
+
+def display_results(results):
+    """
+    Muestra el resumen de cada escenario.
+
+    Args:
+        results (list): Resultados de ScenarioEvaluator.evaluate
+    """
+    def format_time(value):
+        return "∞" if value == INF else f"{value:.2f}"
+
+    for result in results:
+        print(f"\nEscenario: {result.name} ({result.weather})")
+        print(f"  Pares con otra distancia: {result.changed_pairs} "
+              f"(sin ruta: {result.disconnected_pairs}, con ruta nueva: {result.connected_pairs})")
+        print(f"  Mayor aumento: {format_time(result.max_increase)}")
+        print(f"  Centro: {result.center_before} ({format_time(result.radius_before)}) -> "
+              f"{result.center_after} ({format_time(result.radius_after)})")
+        for change in result.changes:
+            print(f"    {change.origin} -> {change.destination}: "
+                  f"{format_time(change.before)} -> {format_time(change.after)}")
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    from src.utils import read_graph_from_file
+
+    parser = argparse.ArgumentParser(description="Evaluación de escenarios hipotéticos")
+    parser.add_argument('scenarios', help="archivo JSON con los escenarios")
+    parser.add_argument('--graph', default=os.path.join(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))), 'data', 'logistica.txt'), help="archivo de aristas")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-changes', type=int, default=DEFAULT_MAX_CHANGES)
+    parser.add_argument('--json', action='store_true', help="escribir los resultados en JSON")
+    args = parser.parse_args(argv)
+
+    with redirect_stdout(sys.stderr):
+        graph = read_graph_from_file(args.graph)
+    results = ScenarioEvaluator(graph, args.workers, args.max_changes).evaluate(
+        load_scenarios(args.scenarios))
+    if args.json:
+        def finite(value):
+            return None if value == INF else value
+
+        print(json.dumps([{**result._asdict(),
+                           'radius_before': finite(result.radius_before),
+                           'radius_after': finite(result.radius_after),
+                           'changes': [{**change._asdict(), 'before': finite(change.before),
+                                        'after': finite(change.after)}
+                                       for change in result.changes]}
+                          for result in results], indent=2, ensure_ascii=False))
+    else:
+        display_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,596 @@
+"""
+Servicio HTTP/JSON de rutas con asyncio, para muchos usuarios a la vez.
+
+Las consultas se responden desde una instantánea inmutable y versionada
+(RouteSnapshot): el grafo y las matrices del clima actual. Las
+modificaciones (conexiones nuevas, cierres de tráfico, cambio de clima)
+se aplican sobre una copia en un hilo de recálculo aparte y, al terminar,
+la instantánea nueva sustituye a la anterior con una sola asignación. Las
+consultas nunca esperan a un recálculo ni ven matrices a medio actualizar:
+cada una usa de principio a fin la instantánea vigente al empezar.
+
+Rutas:
+    GET  /health                      Versión y clima de la instantánea
+    GET  /route?from=A&to=B           Ruta más corta entre dos ciudades
+    POST /routes                      Lote {"pairs": [[A, B], ...], "paths": true}
+    GET  /center?top=5                Centro, radio, diámetro y ciudades más centrales
+    POST /closures                    Interrumpir tráfico {"from": A, "to": B}
+    POST /connections                 Nueva conexión {"from": A, "to": B, "normal": t,
+                                      "lluvia": t, "nieve": t, "tormenta": t}
+    GET  /weather                     Clima actual
+    POST /weather                     Cambiar clima {"condition": "lluvia"}
+
+Uso:
+    python -m src.service --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from src.graph import WEATHER_CONDITIONS
+from src.apsp import all_pairs_shortest_paths
+from src.batch import BatchRouter, RouteResult, STATUS_OK, STATUS_UNREACHABLE, STATUS_UNKNOWN_CITY
+from src.center import CenterIndex
+from src.floyd_warshall import INF, reconstruct_path
+from src.incremental import grow_matrices, update_for_cheaper_edge, update_for_removed_edge
+from src.stats import STATS
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+MAX_BODY_BYTES = 16 * 2**20
+MAX_BATCH_PAIRS = 1_000_000
+DEFAULT_TOP = 5
+
+
+class HTTPError(Exception):
+    """
+    Error de una petición, con su código de estado HTTP.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _finite(value):
+    """
+    Convierte infinito en None para poder escribirlo en JSON.
+    """
+    return None if value == INF else value
+
+
+class RouteSnapshot:
+    """
+    Estado inmutable con el que se responden las consultas.
+
+    Nada de lo que contiene se modifica después de publicarse: las
+    modificaciones crean una instantánea nueva.
+
+    Attributes:
+        version (int): Número de la instantánea, creciente
+        graph (Graph): Grafo de la instantánea (no se modifica)
+        weather (str): Condición climática de las matrices
+        dist (list): Matriz de distancias más cortas
+        path (list): Matriz de caminos (predecesores)
+    """
+
+    def __init__(self, version, graph, weather, dist, path):
+        self.version = version
+        self.graph = graph
+        self.weather = weather
+        self.dist = dist
+        self.path = path
+        self._center = None
+        self._batch = None
+
+    def route(self, origin, destination):
+        """
+        Ruta más corta entre dos ciudades.
+
+        Args:
+            origin (str): Ciudad de origen (sin distinguir mayúsculas)
+            destination (str): Ciudad de destino
+
+        Returns:
+            RouteResult: Resultado con el mismo formato que el modo por lotes
+        """
+        i = self.graph.vertex_index(origin)
+        j = self.graph.vertex_index(destination)
+        if i == -1 or j == -1:
+            return RouteResult(origin, destination, STATUS_UNKNOWN_CITY, None, None)
+        distance = self.dist[i][j]
+        if distance == INF:
+            return RouteResult(origin, destination, STATUS_UNREACHABLE, None, None)
+        vertices = self.graph.vertices
+        return RouteResult(vertices[i], vertices[j], STATUS_OK, distance,
+                           [vertices[idx] for idx in reconstruct_path(self.path, i, j)])
+
+    def routes(self, pairs, with_paths=True):
+        """
+        Resuelve un lote de pares (ver src/batch.py).
+
+        Returns:
+            list: Un RouteResult por par, en el orden de entrada
+        """
+        return list(self.batch_router().query(pairs, with_paths=with_paths))
+
+    def batch_router(self):
+        """
+        Enrutador por lotes de la instantánea, creado la primera vez.
+
+        Se reutiliza en todas las peticiones para no volver a convertir la
+        matriz de distancias en cada una.
+
+        Returns:
+            BatchRouter: Enrutador sobre las matrices de la instantánea
+        """
+        if self._batch is None:
+            # Como en center(): una carrera sólo crea dos enrutadores iguales
+            self._batch = BatchRouter(self.graph, self.dist, self.path)
+        return self._batch
+
+    def center(self):
+        """
+        Excentricidades de la instantánea, calculadas la primera vez.
+
+        Returns:
+            CenterIndex: Excentricidades de la matriz de distancias
+        """
+        if self._center is None:
+            # Dos consultas simultáneas pueden calcularlo a la vez: el
+            # resultado es el mismo y la asignación es atómica
+            self._center = CenterIndex(self.dist)
+        return self._center
+
+
+def _copy_matrices(dist, path):
+    """
+    Copia fila a fila unas matrices para modificarlas sin afectar a las originales.
+    """
+    return [list(row) for row in dist], [list(row) for row in path]
+
+
+class RouteService:
+    """
+    Publica instantáneas de rutas y aplica las modificaciones en segundo plano.
+
+    Las modificaciones se ejecutan de una en una, en orden de llegada, en
+    un único hilo de recálculo; cada una parte de la instantánea publicada
+    por la anterior.
+
+    Attributes:
+        engine (str): Motor de Floyd-Warshall para los cálculos completos
+    """
+
+    def __init__(self, graph, dist=None, path=None, engine='auto'):
+        """
+        Crea el servicio a partir de un grafo.
+
+        Args:
+            graph (Graph): Grafo inicial; el servicio trabaja sobre una copia
+            dist (list): Matriz de distancias del clima actual (opcional)
+            path (list): Matriz de caminos del clima actual (opcional)
+            engine (str): Motor de Floyd-Warshall para los cálculos completos
+        """
+        self.engine = engine
+        graph = graph.copy()
+        weather = graph.current_weather
+        if dist is None or path is None:
+            dist, path = self._compute(graph, weather)
+        self._weather_matrices = {weather: (dist, path)}  # Sólo para el grafo publicado
+        self._snapshot = RouteSnapshot(1, graph, weather, dist, path)
+        self._recompute = ThreadPoolExecutor(max_workers=1, thread_name_prefix='recompute')
+
+    @property
+    def snapshot(self):
+        """
+        Instantánea vigente; cada consulta debe leerla una sola vez.
+        """
+        return self._snapshot
+
+    def close(self):
+        """
+        Espera a que terminen las modificaciones pendientes y libera el hilo.
+        """
+        self._recompute.shutdown(wait=True)
+
+    def _compute(self, graph, weather):
+        """
+        Calcula desde cero las matrices de un clima.
+        """
+        return all_pairs_shortest_paths(graph.weather_view(weather), engine=self.engine)
+
+    def _publish(self, graph, weather, dist, path, same_graph=False):
+        """
+        Sustituye la instantánea vigente por una nueva.
+
+        Se llama sólo desde el hilo de recálculo.
+        """
+        if not same_graph:
+            self._weather_matrices = {}
+        self._weather_matrices[weather] = (dist, path)
+        self._snapshot = RouteSnapshot(self._snapshot.version + 1, graph, weather, dist, path)
+        return self._snapshot
+
+    def _add_connection(self, from_vertex, to_vertex, times):
+        current = self._snapshot
+        weather = current.weather
+        old_time = current.graph.weather_times.get((from_vertex, to_vertex), {}).get(weather, INF)
+
+        graph = current.graph.copy()
+        graph.add_edge(from_vertex, to_vertex, *times)
+        new_time = times[WEATHER_CONDITIONS.index(weather)]
+        if new_time > old_time:
+            # Un tramo más caro puede alargar cualquier ruta: recalcular
+            dist, path = self._compute(graph, weather)
+        else:
+            dist, path = _copy_matrices(current.dist, current.path)
+            grow_matrices(dist, path, len(graph.vertices))
+            update_for_cheaper_edge(dist, path, graph.vertex_index(from_vertex),
+                                    graph.vertex_index(to_vertex), new_time)
+        return self._publish(graph, weather, dist, path)
+
+    def _close_connection(self, from_vertex, to_vertex):
+        current = self._snapshot
+        if (from_vertex, to_vertex) not in current.graph.weather_times:
+            return None
+        graph = current.graph.copy()
+        with redirect_stdout(sys.stderr):
+            graph.remove_edge(from_vertex, to_vertex)
+        dist, path = _copy_matrices(current.dist, current.path)
+        dist, path = update_for_removed_edge(graph.weather_view(current.weather), dist, path,
+                                             graph.vertex_index(from_vertex),
+                                             graph.vertex_index(to_vertex), engine=self.engine)
+        return self._publish(graph, current.weather, dist, path)
+
+    def _switch_weather(self, condition):
+        current = self._snapshot
+        if condition == current.weather:
+            return current
+        graph = current.graph
+        matrices = self._weather_matrices.get(condition)
+        if matrices is None:
+            matrices = self._compute(graph, condition)
+        # El grafo se comparte: sólo las matrices dependen del clima
+        return self._publish(graph, condition, *matrices, same_graph=True)
+
+    async def _mutate(self, function, *args):
+        """
+        Ejecuta una modificación en el hilo de recálculo.
+        """
+        loop = asyncio.get_running_loop()
+
+        def run():
+            with STATS.phase('service.recompute'):
+                return function(*args)
+
+        return await loop.run_in_executor(self._recompute, run)
+
+    async def add_connection(self, from_vertex, to_vertex, times):
+        """
+        Agrega (o reemplaza) una conexión y publica una instantánea nueva.
+
+        Args:
+            from_vertex (str): Ciudad origen
+            to_vertex (str): Ciudad destino
+            times (tuple): Tiempos (normal, lluvia, nieve, tormenta)
+
+        Returns:
+            RouteSnapshot: La instantánea publicada
+        """
+        return await self._mutate(self._add_connection, from_vertex, to_vertex, tuple(times))
+
+    async def close_connection(self, from_vertex, to_vertex):
+        """
+        Interrumpe el tráfico de una conexión y publica una instantánea nueva.
+
+        Returns:
+            RouteSnapshot: La instantánea publicada, o None si la conexión no existe
+        """
+        return await self._mutate(self._close_connection, from_vertex, to_vertex)
+
+    async def set_weather(self, condition):
+        """
+        Cambia la condición climática de las consultas.
+
+        Raises:
+            ValueError: Si la condición no existe
+
+        Returns:
+            RouteSnapshot: La instantánea publicada
+        """
+        if condition not in WEATHER_CONDITIONS:
+            raise ValueError(f"Condición climática no válida: {condition}")
+        return await self._mutate(self._switch_weather, condition)
+
+
+def _route_json(result):
+    return result._asdict()
+
+
+def _require(body, *keys):
+    """
+    Comprueba que el cuerpo JSON tenga las claves indicadas.
+    """
+    if not isinstance(body, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Se esperaba un objeto JSON")
+    missing = [key for key in keys if key not in body]
+    if missing:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Faltan campos: {', '.join(missing)}")
+    return [body[key] for key in keys]
+
+
+class RouteHTTPServer:
+    """
+    Servidor HTTP/1.1 mínimo con conexiones persistentes sobre asyncio.
+
+    Attributes:
+        service (RouteService): Servicio que responde las peticiones
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self._routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/route'): self.route,
+            ('POST', '/routes'): self.routes,
+            ('GET', '/center'): self.center,
+            ('POST', '/closures'): self.closures,
+            ('POST', '/connections'): self.connections,
+            ('GET', '/weather'): self.weather,
+            ('POST', '/weather'): self.set_weather,
+        }
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Empieza a aceptar conexiones.
+
+        Returns:
+            asyncio.Server: El servidor (su puerto real está en sockets)
+        """
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def dispatch(self, method, target, body=b''):
+        """
+        Responde una petición ya leída.
+
+        Args:
+            method (str): Método HTTP
+            target (str): Ruta con parámetros de consulta
+            body (bytes): Cuerpo de la petición
+
+        Returns:
+            tuple: (código de estado, objeto JSON de respuesta); un error
+                   inesperado se registra en stderr y se responde con 500
+        """
+        url = urlsplit(target)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"Método no permitido: {method}"}
+            return HTTPStatus.NOT_FOUND, {'error': f"Ruta desconocida: {url.path}"}
+
+        start = time.perf_counter()
+        try:
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            data = None
+            if method == 'POST':
+                try:
+                    data = json.loads(body or b'{}')
+                except ValueError:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "Cuerpo JSON no válido") from None
+            return await handler(query, data)
+        except HTTPError as error:
+            return error.status, {'error': error.message}
+        except Exception:
+            # Un fallo inesperado no debe cortar la conexión sin respuesta
+            print(f"Error al atender {method} {target}:", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Error interno del servidor"}
+        finally:
+            STATS.observe(f"http {method} {url.path}", time.perf_counter() - start)
+
+    async def health(self, query, data):
+        snapshot = self.service.snapshot
+        return HTTPStatus.OK, {'status': 'ok', 'version': snapshot.version,
+                               'weather': snapshot.weather,
+                               'cities': len(snapshot.graph.vertices)}
+
+    async def route(self, query, data):
+        if 'from' not in query or 'to' not in query:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Faltan los parámetros from y to")
+        snapshot = self.service.snapshot
+        result = snapshot.route(query['from'], query['to'])
+        return HTTPStatus.OK, {'version': snapshot.version, 'weather': snapshot.weather,
+                               **_route_json(result)}
+
+    async def routes(self, query, data):
+        pairs, = _require(data, 'pairs')
+        if not isinstance(pairs, list) or not all(
+                isinstance(pair, list) and len(pair) == 2 and all(isinstance(city, str) for city in pair)
+                for pair in pairs):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "pairs debe ser una lista de pares de ciudades")
+        if len(pairs) > MAX_BATCH_PAIRS:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            f"Como máximo {MAX_BATCH_PAIRS} pares por petición")
+        snapshot = self.service.snapshot
+        # Los lotes grandes se resuelven fuera del bucle de eventos
+        results = await asyncio.get_running_loop().run_in_executor(
+            None, snapshot.routes, [tuple(pair) for pair in pairs], bool(data.get('paths', True)))
+        return HTTPStatus.OK, {'version': snapshot.version, 'weather': snapshot.weather,
+                               'results': [_route_json(result) for result in results]}
+
+    async def center(self, query, data):
+        try:
+            top = int(query.get('top', DEFAULT_TOP))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "top debe ser un entero") from None
+        snapshot = self.service.snapshot
+        centers = await asyncio.get_running_loop().run_in_executor(None, snapshot.center)
+        vertices = snapshot.graph.vertices
+        center = centers.center()
+        return HTTPStatus.OK, {
+            'version': snapshot.version,
+            'weather': snapshot.weather,
+            'center': None if center is None else vertices[center],
+            'radius': _finite(centers.radius()),
+            'diameter': _finite(centers.diameter()),
+            'top': [{'city': vertices[idx], 'eccentricity': _finite(eccentricity)}
+                    for idx, eccentricity in centers.top_k(max(top, 0))],
+        }
+
+    async def closures(self, query, data):
+        from_vertex, to_vertex = _require(data, 'from', 'to')
+        snapshot = await self.service.close_connection(str(from_vertex), str(to_vertex))
+        if snapshot is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND,
+                            f"No existe tráfico directo entre {from_vertex} y {to_vertex}")
+        return HTTPStatus.OK, {'version': snapshot.version}
+
+    async def connections(self, query, data):
+        from_vertex, to_vertex, *times = _require(data, 'from', 'to', *WEATHER_CONDITIONS)
+        try:
+            times = [float(value) for value in times]
+        except (TypeError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Los tiempos deben ser valores numéricos") from None
+        if not all(math.isfinite(value) and value >= 0 for value in times):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Los tiempos deben ser finitos y no negativos")
+        snapshot = await self.service.add_connection(str(from_vertex), str(to_vertex), times)
+        return HTTPStatus.OK, {'version': snapshot.version}
+
+    async def weather(self, query, data):
+        snapshot = self.service.snapshot
+        return HTTPStatus.OK, {'version': snapshot.version, 'weather': snapshot.weather}
+
+    async def set_weather(self, query, data):
+        condition, = _require(data, 'condition')
+        if condition not in WEATHER_CONDITIONS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Condición climática no válida: {condition}")
+        snapshot = await self.service.set_weather(condition)
+        return HTTPStatus.OK, {'version': snapshot.version, 'weather': snapshot.weather}
+
+    async def _read_request(self, reader):
+        """
+        Lee una petición HTTP/1.1.
+
+        Returns:
+            tuple: (método, ruta, versión, cabeceras, cuerpo), o None si el
+                   cliente cerró la conexión
+        """
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Línea de petición no válida") from None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length no válido") from None
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Cuerpo demasiado grande")
+        body = await reader.readexactly(length) if length > 0 else b''
+        return method.upper(), target, version, headers, body
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Atiende las peticiones de una conexión hasta que se cierre.
+        """
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as error:
+                    writer.write(_response(error.status, {'error': error.message}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+                status, payload = await self.dispatch(method, target, body)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _response(status, payload, keep_alive=True):
+    """
+    Codifica una respuesta HTTP con cuerpo JSON.
+    """
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    status = HTTPStatus(status)
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Atiende peticiones hasta que se interrumpa el programa.
+    """
+    server = await RouteHTTPServer(service).start(host, port)
+    addresses = ', '.join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"Servicio de rutas escuchando en {addresses}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    # Importación diferida: src.main carga todo el programa interactivo
+    from src.main import load_data
+
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON de rutas más cortas")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--weather', choices=WEATHER_CONDITIONS, default='normal',
+                        help="condición climática inicial")
+    parser.add_argument('--no-snapshot', dest='snapshot', action='store_false',
+                        help="leer siempre el archivo de texto sin usar la instantánea binaria")
+    args = parser.parse_args(argv)
+
+    with redirect_stdout(sys.stderr):
+        graph, scenarios = load_data(False, args.snapshot)
+        graph.set_weather_condition(args.weather)
+        service = RouteService(graph, *scenarios.get(args.weather))
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Instantáneas binarias del grafo y de sus matrices de rutas.
+
+Leer el archivo de texto y recalcular todos los pares en cada arranque es
+innecesario si el archivo no cambió. Una instantánea guarda en un único
+archivo binario los vértices, los tiempos de cada arista por clima y las
+matrices (distancias, caminos) ya calculadas, junto con el hash SHA-256
+del archivo de origen.
+
+Formato:
+- 8 bytes de firma (SNAPSHOT_MAGIC)
+- 8 bytes con la longitud de la cabecera (entero sin signo, little-endian)
+- cabecera JSON: hash de origen, orden de bytes, vértices y la posición
+  (offset, tipo, cantidad) de cada sección
+- secciones binarias alineadas a 8 bytes: aristas (origen, destino,
+  tiempos) y, por cada clima guardado, distancias ('d') y caminos ('i')
+
+Al cargar, el archivo se proyecta en memoria (mmap) y cada fila de las
+matrices es una vista sobre la proyección, sin copiar ni interpretar los
+datos. La proyección es de copia en escritura: varios procesos que cargan
+la misma instantánea comparten sus páginas a través de la caché del
+sistema, y sólo se copian las páginas que cada uno modifica.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from src.graph import Graph, WEATHER_CONDITIONS
+
+SNAPSHOT_MAGIC = b'AGSNAP01'
+_LENGTH = struct.Struct('<Q')
+_ALIGNMENT = 8
+
+
+def file_digest(filename, chunk_size=1 << 20):
+    """
+    Calcula el hash SHA-256 del contenido de un archivo.
+
+    Args:
+        filename (str): Ruta del archivo
+        chunk_size (int): Bytes leídos en cada bloque
+
+    Returns:
+        str: Hash en hexadecimal
+
+    Raises:
+        FileNotFoundError: Si no se encuentra el archivo
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Snapshot:
+    """
+    Instantánea cargada: el grafo y las matrices de rutas guardadas.
+
+    Attributes:
+        graph (Graph): Grafo reconstruido
+        source_hash (str): Hash del archivo de origen de la instantánea
+        matrices (dict): Condición -> (matriz_distancias, matriz_caminos);
+            cada fila es una vista de la proyección en memoria
+    """
+
+    def __init__(self, graph, source_hash, matrices, mapping):
+        self.graph = graph
+        self.source_hash = source_hash
+        self.matrices = matrices
+        # La proyección debe vivir mientras existan vistas sobre ella
+        self._mapping = mapping
+
+
+def save_snapshot(filename, graph, matrices, source_hash):
+    """
+    Guarda el grafo y sus matrices en una instantánea binaria.
+
+    El archivo se escribe primero con un nombre temporal y luego se
+    renombra, de modo que otro proceso nunca lee una instantánea a medias.
+
+    Args:
+        filename (str): Ruta de la instantánea
+        graph (Graph): Grafo a guardar
+        matrices (dict): Condición -> (matriz_distancias, matriz_caminos)
+        source_hash (str): Hash del archivo de origen (ver file_digest)
+    """
+    n = len(graph.vertices)
+    edge_from, edge_to, times = graph.edge_arrays()
+    # (nombre, tipo, filas) de cada sección, en el orden en que se escriben
+    sections = [('edge_from', 'i', [edge_from]), ('edge_to', 'i', [edge_to]), ('times', 'd', [times])]
+    for condition in WEATHER_CONDITIONS:
+        if condition not in matrices:
+            continue
+        dist, path = matrices[condition]
+        if len(dist) != n:
+            raise ValueError(f"Las matrices de '{condition}' no corresponden al grafo")
+        sections.append((f'dist:{condition}', 'd', [array('d', row) for row in dist]))
+        sections.append((f'path:{condition}', 'i', [array('i', row) for row in path]))
+
+    # Posición de cada sección dentro de la zona de datos
+    layout = {}
+    offset = 0
+    for name, typecode, rows in sections:
+        count = sum(len(row) for row in rows)
+        layout[name] = (offset, typecode, count)
+        offset += _padded(count * array(typecode).itemsize)
+
+    header = json.dumps({
+        'source_hash': source_hash,
+        'byteorder': sys.byteorder,
+        'vertices': graph.vertices,
+        'conditions': [condition for condition in WEATHER_CONDITIONS if condition in matrices],
+        'sections': layout,
+    }).encode('utf-8')
+    data_start = _padded(len(SNAPSHOT_MAGIC) + _LENGTH.size + len(header))
+
+    temporary = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, 'wb') as file:
+            file.write(SNAPSHOT_MAGIC)
+            file.write(_LENGTH.pack(len(header)))
+            file.write(header)
+            for name, _, rows in sections:
+                file.seek(data_start + layout[name][0])
+                for row in rows:
+                    row.tofile(file)
+            file.truncate(data_start + offset)
+        os.replace(temporary, filename)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def load_snapshot(filename, source_hash=None):
+    """
+    Carga una instantánea proyectándola en memoria.
+
+    Args:
+        filename (str): Ruta de la instantánea
+        source_hash (str): Hash esperado del archivo de origen; None acepta
+            cualquier instantánea
+
+    Returns:
+        Snapshot: La instantánea, o None si no existe, está dañada, se creó
+                  en una máquina con otro orden de bytes o su hash no coincide
+    """
+    try:
+        with open(filename, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        header_start = len(SNAPSHOT_MAGIC) + _LENGTH.size
+        if mapping[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            return None
+        (header_length,) = _LENGTH.unpack(mapping[len(SNAPSHOT_MAGIC):header_start])
+        header = json.loads(mapping[header_start:header_start + header_length].decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            return None
+        if source_hash is not None and header['source_hash'] != source_hash:
+            return None
+
+        data_start = _padded(header_start + header_length)
+        buffer = memoryview(mapping)
+
+        def section(name):
+            offset, typecode, count = header['sections'][name]
+            start = data_start + offset
+            end = start + count * array(typecode).itemsize
+            if end > len(mapping):
+                raise ValueError(f"Sección incompleta: {name}")
+            return buffer[start:end].cast(typecode)
+
+        graph = Graph.from_arrays(header['vertices'], section('edge_from'),
+                                  section('edge_to'), section('times'))
+        n = len(graph.vertices)
+        matrices = {}
+        for condition in header['conditions']:
+            dist = section(f'dist:{condition}')
+            path = section(f'path:{condition}')
+            matrices[condition] = ([dist[i * n:(i + 1) * n] for i in range(n)],
+                                   [path[i * n:(i + 1) * n] for i in range(n)])
+    except (KeyError, TypeError, ValueError, struct.error):
+        return None
+
+    return Snapshot(graph, header['source_hash'], matrices, mapping)
+
+
+def _padded(size):
+    """
+    Redondea un tamaño hacia arriba al múltiplo de la alineación.
+    """
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
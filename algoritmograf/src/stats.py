@@ -0,0 +1,317 @@
+"""
+Medición de tiempos por fase y contadores de los algoritmos.
+
+El registro global STATS está desactivado por defecto. Mientras lo está,
+cada punto de medición cuesta una llamada que no hace nada, así que los
+módulos pueden medirse siempre sin penalizar las ejecuciones normales.
+
+Se registran tres tipos de datos:
+- Fases: veces que se ejecutó cada una, tiempo total y máximo
+  (with STATS.phase('apsp'): ...)
+- Contadores: cantidades acumuladas, como relajaciones intentadas y
+  exitosas (STATS.count('apsp.relaxations_attempted', n))
+- Latencias: histogramas con cubetas logarítmicas, p. ej. por consulta
+  (STATS.observe('query', segundos))
+
+El resultado se obtiene como diccionario (as_dict) o JSON (to_json), y
+MetricsDumper lo escribe periódicamente en un archivo.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+# Límites superiores de las cubetas de latencia: cuatro por década, de 1 µs a 100 s
+BUCKET_BOUNDS = tuple(10 ** (exponent / 4) for exponent in range(-24, 9))
+
+_DISABLED = nullcontext()
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con cubetas de tamaño logarítmico.
+
+    Attributes:
+        count (int): Observaciones registradas
+        total (float): Suma de las latencias en segundos
+        minimum (float): Menor latencia observada
+        maximum (float): Mayor latencia observada
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+        self._buckets = [0] * (len(BUCKET_BOUNDS) + 1)  # La última, sin límite
+
+    def observe(self, seconds):
+        """
+        Registra una latencia.
+
+        Args:
+            seconds (float): Latencia en segundos
+        """
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        self._buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def quantile(self, q):
+        """
+        Cuantil aproximado por el límite superior de su cubeta.
+
+        Args:
+            q (float): Cuantil entre 0 y 1
+
+        Returns:
+            float: Latencia aproximada en segundos; None si no hay datos
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for position, amount in enumerate(self._buckets):
+            seen += amount
+            if amount and seen >= rank:
+                if position == len(BUCKET_BOUNDS):
+                    return self.maximum
+                return min(BUCKET_BOUNDS[position], self.maximum)
+        return self.maximum
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: Resumen y cubetas no vacías ({'le': límite, 'count': n})
+        """
+        if not self.count:
+            return {'count': 0}
+        buckets = [{'le': BUCKET_BOUNDS[position] if position < len(BUCKET_BOUNDS) else None,
+                    'count': amount}
+                   for position, amount in enumerate(self._buckets) if amount]
+        return {
+            'count': self.count,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.count,
+            'min_seconds': self.minimum,
+            'max_seconds': self.maximum,
+            'p50_seconds': self.quantile(0.5),
+            'p90_seconds': self.quantile(0.9),
+            'p99_seconds': self.quantile(0.99),
+            'buckets': buckets,
+        }
+
+
+class _Phase:
+    """
+    Contexto que mide la duración de una fase.
+    """
+
+    __slots__ = ('_stats', '_name', '_start')
+
+    def __init__(self, stats, name):
+        self._stats = stats
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stats.add_time(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Stats:
+    """
+    Registro de tiempos por fase, contadores y latencias.
+
+    Attributes:
+        enabled (bool): Si es False, ningún método registra nada
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Args:
+            enabled (bool): Empezar registrando
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Descarta todo lo registrado.
+        """
+        with self._lock:
+            self._phases = {}  # nombre -> [veces, segundos totales, máximo]
+            self._counters = {}
+            self._histograms = {}
+            self._started = time.time()
+
+    def phase(self, name):
+        """
+        Contexto que mide la duración de una fase.
+
+        Args:
+            name (str): Nombre de la fase, p. ej. 'load.parse'
+
+        Returns:
+            Contexto para usar con with
+        """
+        if not self.enabled:
+            return _DISABLED
+        return _Phase(self, name)
+
+    def add_time(self, name, seconds):
+        """
+        Suma una duración a una fase.
+
+        Args:
+            name (str): Nombre de la fase
+            seconds (float): Duración en segundos
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._phases.get(name)
+            if entry is None:
+                self._phases[name] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def count(self, name, amount=1):
+        """
+        Incrementa un contador.
+
+        Args:
+            name (str): Nombre del contador
+            amount (int): Cantidad a sumar
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        """
+        Registra una latencia en el histograma indicado.
+
+        Args:
+            name (str): Nombre del histograma, p. ej. 'query'
+            seconds (float): Latencia en segundos
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def counter(self, name):
+        """
+        Returns:
+            int: Valor actual del contador (0 si no existe)
+        """
+        return self._counters.get(name, 0)
+
+    def as_dict(self):
+        """
+        Todo lo registrado como diccionario serializable en JSON.
+
+        Returns:
+            dict: Claves 'uptime_seconds', 'phases', 'counters' y 'latencies'
+        """
+        with self._lock:
+            return {
+                'uptime_seconds': time.time() - self._started,
+                'phases': {name: {'count': count, 'total_seconds': total,
+                                  'mean_seconds': total / count, 'max_seconds': maximum}
+                           for name, (count, total, maximum) in sorted(self._phases.items())},
+                'counters': dict(sorted(self._counters.items())),
+                'latencies': {name: histogram.as_dict()
+                              for name, histogram in sorted(self._histograms.items())},
+            }
+
+    def to_json(self, indent=2):
+        """
+        Returns:
+            str: as_dict() en formato JSON
+        """
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def write(self, filename):
+        """
+        Escribe las estadísticas en un archivo JSON de forma atómica.
+
+        Args:
+            filename (str): Ruta del archivo
+        """
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, 'w', encoding='utf-8') as file:
+            file.write(self.to_json())
+        os.replace(tmp_filename, filename)
+
+
+class MetricsDumper:
+    """
+    Escribe las estadísticas en un archivo cada cierto tiempo.
+
+    Se usa como contexto: al salir se escribe una última vez.
+
+    Attributes:
+        stats (Stats): Registro a escribir
+        filename (str): Archivo JSON de destino
+        interval (float): Segundos entre escrituras
+    """
+
+    def __init__(self, stats, filename, interval=10.0):
+        if interval <= 0:
+            raise ValueError("El intervalo debe ser positivo")
+        self.stats = stats
+        self.filename = filename
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.stats.write(self.filename)
+
+    def start(self):
+        """
+        Empieza a escribir en segundo plano.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='metrics-dumper', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Detiene la escritura periódica y escribe el estado final.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.stats.write(self.filename)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+
+# Registro global usado por todos los módulos
+STATS = Stats()
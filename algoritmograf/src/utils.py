@@ -1,4 +1,10 @@
+import time
 from src.graph import Graph  # Cambiado de 'from graph import Graph'
+from src.loader import load_graph
+from src.floyd_warshall import reconstruct_path
+from src.center import CenterIndex
+from src.route_cache import Route
+from src.stats import STATS
 
 def read_graph_from_file(filename):
     """
@@ -7,6 +13,9 @@ def read_graph_from_file(filename):
     El archivo debe tener el formato:
     Ciudad1 Ciudad2 tiempoNormal tiempoLluvia tiempoNieve tiempoTormenta
     
+    La lectura se hace por bloques y las aristas se cargan en bloque
+    (ver src/loader.py).
+    
     Args:
         filename (str): Ruta del archivo a leer
         
@@ -16,49 +25,17 @@ def read_graph_from_file(filename):
     Raises:
         FileNotFoundError: Si no se encuentra el archivo
     """
-    graph = Graph()
-    line_number = 0
-    
     try:
-        with open(filename, 'r') as file:
-            for line in file:
-                line_number += 1
-                line = line.strip()
-                
-                # Ignorar línea de encabezado o vacía
-                if not line or line.startswith('//') or line.startswith('#'):
-                    continue
-                    
-                # Ignorar líneas que parezcan encabezados (contienen "Ciudad")
-                if "Ciudad" in line and "tiempo" in line:
-                    continue
-                
-                parts = line.split()
-                if len(parts) != 6:
-                    print(f"Formato incorrecto en línea {line_number}: {line}")
-                    continue
-                    
-                try:
-                    city1 = parts[0]
-                    city2 = parts[1]
-                    normal_time = float(parts[2])
-                    rain_time = float(parts[3])
-                    snow_time = float(parts[4])
-                    storm_time = float(parts[5])
-                    
-                    # Agregar la arista al grafo
-                    graph.add_edge(city1, city2, normal_time, rain_time, snow_time, storm_time)
-                    
-                except ValueError:
-                    print(f"Error al convertir tiempos a números en línea: {line}")
-        
+        graph, stats = load_graph(filename)
         print(f"Grafo cargado con {graph.get_vertex_count()} ciudades")
+        print(f"Leídas {stats.lines} líneas en {stats.seconds:.3f} s "
+              f"({stats.lines_per_second:,.0f} líneas/s)")
         return graph
         
     except FileNotFoundError:
         print(f"No se encontró el archivo: {filename}")
         # Crear un grafo vacío para evitar errores
-        return graph
+        return Graph()
 
 def format_output(shortest_path, distance):
     """
@@ -87,9 +64,25 @@ def display_adjacency_matrix(matrix):
     for row in matrix:
         print(" | ".join(map(str, row)))
 
-def display_shortest_path(start_city, end_city, distance_matrix, path_info, graph):
+def print_city_suggestions(city, graph):
     """
-    Muestra la ruta más corta entre dos ciudades.
+    Muestra ciudades con nombre parecido a una que no existe.
+    
+    Args:
+        city (str): Nombre escrito por el usuario
+        graph (Graph): El grafo que contiene las ciudades
+    """
+    suggestions = graph.suggest_cities(city)
+    if suggestions:
+        print(f"¿Quiso decir: {', '.join(suggestions)}?")
+
+def shortest_path(start_city, end_city, distance_matrix, path_info, graph, router=None, cache=None):
+    """
+    Ruta más corta entre dos ciudades, sin mostrar nada.
+    
+    Si se pasa un enrutador (modo bajo demanda), la ruta se calcula con él
+    y las matrices pueden ser None. Si se pasa una caché, la ruta se busca
+    primero en ella y se guarda al calcularla.
     
     Args:
         start_city (str): Ciudad de origen
@@ -97,106 +90,121 @@ def display_shortest_path(start_city, end_city, distance_matrix, path_info, grap
         distance_matrix (list): Matriz de distancias más cortas
         path_info (list): Matriz de caminos para reconstrucción
         graph (Graph): El grafo que contiene las ciudades
-    """
-    # Convertir los nombres de ciudades a minúsculas para comparación
-    start_city = start_city.lower()
-    end_city = end_city.lower()
-    
-    # Obtener los índices de las ciudades
-    start_idx = -1
-    end_idx = -1
-    
-    for idx, city in enumerate(graph.vertices):
-        if city.lower() == start_city:
-            start_idx = idx
-        if city.lower() == end_city:
-            end_idx = idx
-    
-    if start_idx == -1:
-        print(f"Error: La ciudad '{start_city}' no existe en el grafo.")
-        return
+        router (LazyRouter): Enrutador bajo demanda (opcional)
+        cache (RouteCache): Caché de rutas del grafo (opcional)
         
-    if end_idx == -1:
-        print(f"Error: La ciudad '{end_city}' no existe en el grafo.")
-        return
+    Returns:
+        Route: Ciudades, distancia y camino (vacío si no hay ruta)
+        
+    Raises:
+        ValueError: Si alguna de las ciudades no existe
+    """
+    start = time.perf_counter()
+    start_idx = graph.vertex_index(start_city)
+    end_idx = graph.vertex_index(end_city)
+    for city, idx in ((start_city, start_idx), (end_city, end_idx)):
+        if idx == -1:
+            raise ValueError(f"La ciudad '{city}' no existe en el grafo")
+    
+    route = cache.get(start_idx, end_idx) if cache is not None else None
+    if route is None:
+        if router is not None:
+            # Modo bajo demanda: ruta punto a punto sin matrices completas
+            distance, indices = router.route(start_idx, end_idx)
+        else:
+            distance = distance_matrix[start_idx][end_idx]
+            # Reconstruir la ruta (sirve con listas o con matrices compactas)
+            indices = reconstruct_path(path_info, start_idx, end_idx) if distance != float('inf') else []
+        vertices = graph.vertices
+        route = Route(vertices[start_idx], vertices[end_idx], distance,
+                      tuple(vertices[idx] for idx in indices))
+        if cache is not None:
+            cache.put(start_idx, end_idx, route)
+    if router is None:
+        STATS.observe('query', time.perf_counter() - start)
+    return route
+
+def display_shortest_path(start_city, end_city, distance_matrix, path_info, graph, router=None,
+                          cache=None):
+    """
+    Muestra la ruta más corta entre dos ciudades.
     
-    # Obtener la distancia
-    distance = distance_matrix[start_idx][end_idx]
+    Si se pasa un enrutador (modo bajo demanda), la ruta se calcula con él
+    y las matrices pueden ser None.
     
-    if distance == float('inf'):
-        print(f"No existe ruta de {graph.vertices[start_idx]} a {graph.vertices[end_idx]}")
+    Args:
+        start_city (str): Ciudad de origen
+        end_city (str): Ciudad de destino
+        distance_matrix (list): Matriz de distancias más cortas
+        path_info (list): Matriz de caminos para reconstrucción
+        graph (Graph): El grafo que contiene las ciudades
+        router (LazyRouter): Enrutador bajo demanda (opcional)
+        cache (RouteCache): Caché de rutas del grafo (opcional)
+    """
+    # Comprobar las ciudades (sin distinguir mayúsculas) para sugerir alternativas
+    for city in (start_city, end_city):
+        if graph.vertex_index(city) == -1:
+            print(f"Error: La ciudad '{city}' no existe en el grafo.")
+            print_city_suggestions(city, graph)
+            return
+    
+    route = shortest_path(start_city, end_city, distance_matrix, path_info, graph, router, cache)
+    if route.distance == float('inf'):
+        print(f"No existe ruta de {route.origin} a {route.destination}")
         return
     
-    # Reconstruir la ruta
-    path = []
-    current = end_idx
-    
-    while current != start_idx:
-        path.append(graph.vertices[current])
-        current = path_info[start_idx][current]
-        if current == -1:  # No hay camino
-            break
-    
-    path.append(graph.vertices[start_idx])
-    path.reverse()
-    
     # Mostrar la ruta
-    print(f"\nRuta más corta de {graph.vertices[start_idx]} a {graph.vertices[end_idx]}:")
-    print(f"Distancia: {distance} horas")
-    print("Camino: " + " -> ".join(path))
+    print(f"\nRuta más corta de {route.origin} a {route.destination}:")
+    print(f"Distancia: {route.distance} horas")
+    print("Camino: " + " -> ".join(route.path))
 
-def find_graph_center(distance_matrix, graph):
+def find_graph_center(distance_matrix, graph, centers=None):
     """
     Encuentra el centro del grafo.
     
     El centro del grafo es el vértice cuya máxima distancia a cualquier
-    otro vértice es mínima.
+    otro vértice es mínima (ver src/center.py).
     
     Args:
         distance_matrix (list): Matriz de distancias más cortas
         graph (Graph): El grafo que contiene los vértices
+        centers (CenterIndex): Excentricidades ya calculadas (opcional)
         
     Returns:
         str: Nombre de la ciudad que es el centro del grafo
     """
-    n = len(graph.vertices)
-    min_eccentricity = float('inf')
-    center_idx = -1
-    eccentricities = {}  # Para guardar la excentricidad de cada ciudad
-    
-    # Calcular la excentricidad de cada vértice
-    for i in range(n):
-        eccentricity = 0  # Inicializar con el valor más pequeño posible
-        has_unreachable = False  # Bandera para vértices inalcanzables
-        
-        for j in range(n):
-            if i != j:  # No consideramos la distancia a sí mismo
-                if distance_matrix[i][j] == float('inf'):
-                    # Si hay un vértice inalcanzable, la excentricidad es infinita
-                    has_unreachable = True
-                    break
-                eccentricity = max(eccentricity, distance_matrix[i][j])
-        
-        # Si hay vértices inalcanzables, la excentricidad es infinita
-        if has_unreachable:
-            eccentricities[graph.vertices[i]] = float('inf')
-        else:
-            eccentricities[graph.vertices[i]] = eccentricity
-            # Actualizar el centro si encontramos una excentricidad menor
-            if eccentricity < min_eccentricity:
-                min_eccentricity = eccentricity
-                center_idx = i
-    
-    # Mostrar información para depuración
-    print("\nExcentricidades de las ciudades:")
-    sorted_cities = sorted(eccentricities.items(), key=lambda x: float('inf') if x[1] == float('inf') else x[1])
-    for city, ecc in sorted_cities:
-        if ecc == float('inf'):
-            print(f"  {city}: ∞ (no puede alcanzar todas las ciudades)")
-        else:
-            print(f"  {city}: {ecc:.2f}{' <- CENTRO' if city == graph.vertices[center_idx] else ''}")
-    
-    if center_idx != -1:
+    if centers is None:
+        centers = CenterIndex(distance_matrix)
+    center_idx = centers.center()
+    if center_idx is not None:
         return graph.vertices[center_idx]
     else:
         return "No se pudo determinar el centro del grafo"
+
+def display_center_report(centers, graph, top=5):
+    """
+    Muestra las ciudades más centrales, el radio y el diámetro.
+    
+    Si el grafo no es fuertemente conexo, muestra además el centro de
+    cada componente fuertemente conexa con más de una ciudad.
+    
+    Args:
+        centers (CenterIndex): Excentricidades de la matriz de distancias
+        graph (Graph): El grafo que contiene los vértices
+        top (int): Número de ciudades más centrales a mostrar
+    """
+    def format_eccentricity(value):
+        return "∞" if value == float('inf') else f"{value:.2f}"
+    
+    print("\nCiudades más centrales:")
+    for idx, eccentricity in centers.top_k(top):
+        print(f"  {graph.vertices[idx]}: {format_eccentricity(eccentricity)}")
+    print(f"Radio: {format_eccentricity(centers.radius())}  "
+          f"Diámetro: {format_eccentricity(centers.diameter())}")
+    
+    if centers.diameter() == float('inf'):
+        print("El grafo no es fuertemente conexo. Centro de cada componente:")
+        for idx, eccentricity, component in centers.component_centers(graph):
+            if len(component) > 1:
+                print(f"  {graph.vertices[idx]}: {format_eccentricity(eccentricity)} "
+                      f"({len(component)} ciudades)")
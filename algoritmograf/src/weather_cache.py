@@ -0,0 +1,400 @@
+"""
+Caché de rutas más cortas por condición climática.
+
+Sólo existen cuatro condiciones climáticas, así que en lugar de recalcular
+Floyd-Warshall cada vez que cambia el clima se guardan las matrices de
+distancias y caminos de cada condición. Cambiar de clima pasa a ser un
+simple cambio de referencia a las matrices ya calculadas.
+
+Las matrices se asocian a la versión del grafo: si el grafo se modifica
+por fuera de la caché, todas las condiciones quedan invalidadas.
+"""
+
+import sys
+from collections import OrderedDict
+
+from src.graph import WEATHER_CONDITIONS
+from src.floyd_warshall import INF
+from src.apsp import all_pairs_shortest_paths
+from src.incremental import (grow_matrices, update_for_cheaper_edge, update_for_removed_edge,
+                             update_for_changed_edges)
+from src.compact import compact_matrices
+from src.center import CenterIndex
+from src.stats import STATS
+
+
+def matrix_nbytes(matrix):
+    """
+    Estima la memoria que ocupa una matriz de listas de Python.
+
+    Args:
+        matrix (list): Matriz de listas (o de vistas de una instantánea),
+            o matriz compacta
+
+    Returns:
+        int: Bytes estimados, incluyendo listas y valores
+    """
+    if hasattr(matrix, 'nbytes'):
+        # Matriz compacta (ver src/compact.py)
+        return sys.getsizeof(matrix) + matrix.nbytes
+    total = sys.getsizeof(matrix)
+    for row in matrix:
+        if isinstance(row, memoryview):
+            # Fila proyectada desde una instantánea: valores contiguos
+            total += sys.getsizeof(row) + row.nbytes
+        else:
+            total += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    return total
+
+
+class WeatherScenarioCache:
+    """
+    Caché de matrices (distancias, caminos) para cada condición climática.
+
+    Attributes:
+        graph (Graph): Grafo cuyas rutas se almacenan
+        algorithm (str): Algoritmo para los cálculos completos ('auto', 'floyd' o 'dijkstra')
+        engine (str): Motor de Floyd-Warshall para los cálculos completos
+        max_bytes (int): Memoria máxima para las matrices; None sin límite
+        dist_dtype (str): Tipo de las distancias compactas; None guarda listas
+        path_dtype (str): Tipo de los predecesores compactos; None guarda listas
+    """
+
+    def __init__(self, graph, engine='auto', max_bytes=None, algorithm='auto',
+                 dist_dtype=None, path_dtype=None):
+        """
+        Inicializa una caché vacía para el grafo.
+
+        Args:
+            graph (Graph): Grafo cuyas rutas se almacenan
+            engine (str): Motor de Floyd-Warshall para los cálculos completos
+            max_bytes (int): Memoria máxima para las matrices; None sin límite
+            algorithm (str): Algoritmo para los cálculos completos ('auto',
+                'floyd' o 'dijkstra')
+            dist_dtype (str): Si se indica (o path_dtype), las matrices se
+                guardan compactas (ver src/compact.py) con distancias
+                'float32' o 'float64'
+            path_dtype (str): Tipo de los predecesores compactos ('int16',
+                'uint16', 'int32' o 'auto')
+        """
+        self.graph = graph
+        self.algorithm = algorithm
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self.dist_dtype = dist_dtype
+        self.path_dtype = path_dtype
+        self._entries = OrderedDict()  # condición -> (dist, path, bytes)
+        self._centers = {}  # condición -> CenterIndex de su matriz de distancias
+        self._version = graph.version
+
+    def _check_version(self):
+        """
+        Descarta todas las matrices si el grafo cambió por fuera de la caché.
+        """
+        if self._version != self.graph.version:
+            self._entries.clear()
+            self._centers.clear()
+            self._version = self.graph.version
+
+    def _evict(self, keep):
+        """
+        Libera las condiciones usadas hace más tiempo hasta respetar max_bytes.
+        """
+        if self.max_bytes is None:
+            return
+        while self.total_bytes() > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                self._entries.move_to_end(keep)
+                continue
+            del self._entries[oldest]
+            self._centers.pop(oldest, None)
+
+    def get(self, condition):
+        """
+        Devuelve las matrices de una condición, calculándolas si hace falta.
+
+        Args:
+            condition (str): Condición climática
+
+        Returns:
+            tuple: (matriz_distancias, matriz_caminos)
+
+        Raises:
+            ValueError: Si la condición no existe
+        """
+        if condition not in WEATHER_CONDITIONS:
+            raise ValueError(f"Condición climática no válida: {condition}")
+        self._check_version()
+
+        if condition in self._entries:
+            STATS.count('weather_cache.hits')
+            self._entries.move_to_end(condition)
+            dist, path, _ = self._entries[condition]
+            return dist, path
+
+        STATS.count('weather_cache.misses')
+        dist, path = all_pairs_shortest_paths(self.graph.weather_view(condition),
+                                              algorithm=self.algorithm, engine=self.engine,
+                                              dist_dtype=self.dist_dtype, path_dtype=self.path_dtype)
+        self._entries[condition] = (dist, path, matrix_nbytes(dist) + matrix_nbytes(path))
+        self._evict(condition)
+        return dist, path
+
+    def seed(self, condition, dist, path):
+        """
+        Registra matrices ya calculadas para la versión actual del grafo.
+
+        Sirve para reutilizar las matrices de una instantánea (ver
+        src/snapshot.py) sin recalcularlas.
+
+        Args:
+            condition (str): Condición climática
+            dist (list): Matriz de distancias más cortas
+            path (list): Matriz de caminos
+
+        Raises:
+            ValueError: Si la condición no existe o las matrices no tienen
+                el tamaño del grafo
+        """
+        if condition not in WEATHER_CONDITIONS:
+            raise ValueError(f"Condición climática no válida: {condition}")
+        if len(dist) != len(self.graph.vertices) or len(path) != len(dist):
+            raise ValueError("Las matrices no corresponden al grafo")
+        self._check_version()
+        self._entries[condition] = (dist, path, matrix_nbytes(dist) + matrix_nbytes(path))
+        self._entries.move_to_end(condition)
+        self._evict(condition)
+
+    def matrices(self):
+        """
+        Matrices almacenadas y vigentes de cada condición.
+
+        Returns:
+            dict: Condición -> (matriz_distancias, matriz_caminos)
+        """
+        self._check_version()
+        return {condition: (dist, path) for condition, (dist, path, _) in self._entries.items()}
+
+    def center(self, condition):
+        """
+        Excentricidades y centro de una condición, calculándolos si hace falta.
+
+        Tras add_edge o remove_edge sólo se recalculan las excentricidades
+        de las filas que cambiaron, así que volver a pedir el centro
+        después de cada cambio es casi gratuito.
+
+        Args:
+            condition (str): Condición climática
+
+        Returns:
+            CenterIndex: Excentricidades de la matriz de la condición
+
+        Raises:
+            ValueError: Si la condición no existe
+        """
+        dist, _ = self.get(condition)
+        center = self._centers.get(condition)
+        if center is None or center.dist is not dist:
+            center = CenterIndex(dist)
+            self._centers[condition] = center
+        return center
+
+    def _refresh_center(self, condition, dist, rows):
+        """
+        Actualiza las excentricidades guardadas tras un cambio en sitio.
+        """
+        center = self._centers.get(condition)
+        if center is not None and center.dist is dist:
+            center.refresh(rows)
+
+    def switch(self, condition):
+        """
+        Cambia la condición climática del grafo y devuelve sus matrices.
+
+        Args:
+            condition (str): Condición climática
+
+        Returns:
+            tuple: (matriz_distancias, matriz_caminos), o None si la
+                   condición no es válida
+        """
+        if not self.graph.set_weather_condition(condition):
+            return None
+        return self.get(condition)
+
+    def precompute(self):
+        """
+        Calcula las matrices de todas las condiciones climáticas.
+        """
+        for condition in WEATHER_CONDITIONS:
+            self.get(condition)
+
+    def add_edge(self, from_vertex, to_vertex, normal_time, rain_time, snow_time, storm_time):
+        """
+        Agrega una arista al grafo y actualiza cada condición almacenada.
+
+        Las condiciones en las que la arista es nueva o más barata se
+        actualizan en O(n²); en las que se encarece se descartan y se
+        recalcularán al pedirlas.
+
+        Args:
+            from_vertex (str): Ciudad origen
+            to_vertex (str): Ciudad destino
+            normal_time (float): Tiempo con clima normal
+            rain_time (float): Tiempo con lluvia
+            snow_time (float): Tiempo con nieve
+            storm_time (float): Tiempo con tormenta
+
+        Returns:
+            bool: True si se agregó correctamente
+        """
+        self._check_version()
+        old_times = self.graph.weather_times.get((from_vertex, to_vertex), {})
+
+        self.graph.add_edge(from_vertex, to_vertex, normal_time, rain_time, snow_time, storm_time)
+        self._version = self.graph.version
+        u = self.graph.vertex_index(from_vertex)
+        v = self.graph.vertex_index(to_vertex)
+        new_times = self.graph.weather_times[(from_vertex, to_vertex)]
+
+        n = len(self.graph.vertices)
+        for condition in list(self._entries):
+            dist, path, nbytes = self._entries[condition]
+            if new_times[condition] > old_times.get(condition, INF):
+                del self._entries[condition]
+                self._centers.pop(condition, None)
+                continue
+            touched = set()
+            if len(dist) < n:
+                grow_matrices(dist, path, n)
+                nbytes = matrix_nbytes(dist) + matrix_nbytes(path)
+                touched = None  # Todas las filas ganan columnas nuevas
+            update_for_cheaper_edge(dist, path, u, v, new_times[condition], touched)
+            self._entries[condition] = (dist, path, nbytes)
+            self._refresh_center(condition, dist, touched)
+        self._evict(self.graph.current_weather)
+        return True
+
+    def remove_edge(self, from_vertex, to_vertex):
+        """
+        Elimina una arista del grafo y repara cada condición almacenada.
+
+        Args:
+            from_vertex (str): Ciudad origen (sin distinguir mayúsculas)
+            to_vertex (str): Ciudad destino (sin distinguir mayúsculas)
+
+        Returns:
+            bool: True si se eliminó la arista
+        """
+        self._check_version()
+        if not self.graph.remove_edge(from_vertex, to_vertex):
+            return False
+        self._version = self.graph.version
+
+        u = self.graph.vertex_index(from_vertex)
+        v = self.graph.vertex_index(to_vertex)
+
+        for condition in list(self._entries):
+            dist, path, nbytes = self._entries[condition]
+            touched = set()
+            repaired = update_for_removed_edge(self.graph.weather_view(condition), dist, path,
+                                               u, v, engine=self.engine, touched=touched)
+            if repaired[0] is not dist:
+                # Recalculadas desde cero: respetar el formato de la caché
+                dist, path = self._store_format(*repaired)
+                nbytes = matrix_nbytes(dist) + matrix_nbytes(path)
+            else:
+                self._refresh_center(condition, dist, touched)
+            self._entries[condition] = (dist, path, nbytes)
+        return True
+
+    def transaction(self):
+        """
+        Transacción sobre el grafo que actualiza las rutas una sola vez.
+
+        Al confirmarla, cada condición almacenada se actualiza con todos
+        los cambios juntos (ver update_for_changed_edges): de forma
+        incremental si el lote es pequeño y recalculando todo si no.
+
+        Ejemplo:
+            with scenarios.transaction() as batch:
+                for from_vertex, to_vertex in closures:
+                    batch.remove_edge(from_vertex, to_vertex)
+
+        Returns:
+            GraphTransaction: Transacción vacía
+        """
+        return self.graph.transaction(on_commit=self._apply_delta)
+
+    def _apply_delta(self, delta):
+        """
+        Actualiza las condiciones almacenadas con los cambios de una transacción.
+        """
+        if self._version != delta.previous_version:
+            # Las matrices ya no correspondían al grafo antes del lote
+            self._check_version()
+            return
+        self._version = self.graph.version
+
+        n = len(self.graph.vertices)
+        for condition in list(self._entries):
+            dist, path, nbytes = self._entries[condition]
+            column = WEATHER_CONDITIONS.index(condition)
+            changes = [(u, v,
+                        INF if old is None else old[column],
+                        INF if new is None else new[column])
+                       for (u, v), (old, new) in delta.edges.items()]
+            touched = set()
+            if len(dist) < n:
+                grow_matrices(dist, path, n)
+                touched = None  # Todas las filas ganan columnas nuevas
+            updated = update_for_changed_edges(self.graph.weather_view(condition), dist, path, changes,
+                                               engine=self.engine, touched=touched)
+            if updated[0] is not dist:
+                # Recalculadas desde cero: respetar el formato de la caché
+                dist, path = self._store_format(*updated)
+                self._centers.pop(condition, None)
+            else:
+                self._refresh_center(condition, dist, touched)
+            self._entries[condition] = (dist, path, matrix_nbytes(dist) + matrix_nbytes(path))
+        self._evict(self.graph.current_weather)
+
+    def _store_format(self, dist, path):
+        """
+        Convierte matrices de listas al formato compacto si está configurado.
+        """
+        if self.dist_dtype is None and self.path_dtype is None:
+            return dist, path
+        return compact_matrices(dist, path, self.dist_dtype or 'float64', self.path_dtype or 'auto')
+
+    def cached_conditions(self):
+        """
+        Lista las condiciones con matrices almacenadas y vigentes.
+
+        Returns:
+            list: Condiciones, de la usada hace más tiempo a la más reciente
+        """
+        self._check_version()
+        return list(self._entries)
+
+    def total_bytes(self):
+        """
+        Memoria total estimada de las matrices almacenadas.
+
+        Returns:
+            int: Bytes estimados
+        """
+        return sum(nbytes for _, _, nbytes in self._entries.values())
+
+    def memory_report(self):
+        """
+        Informe de memoria por condición climática.
+
+        Returns:
+            dict: Condición -> bytes estimados, más la clave 'total'
+        """
+        self._check_version()
+        report = {condition: entry[2] for condition, entry in self._entries.items()}
+        report['total'] = self.total_bytes()
+        return report
@@ -0,0 +1,125 @@
+import unittest
+import io
+import sys
+import os
+import json
+from contextlib import redirect_stderr
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall
+from src.routing import LazyRouter
+from src.compact import compact_matrices, np
+from src.batch import BatchRouter, read_pairs, write_results, STATUS_OK, STATUS_UNREACHABLE, STATUS_UNKNOWN_CITY
+from src.main import run_batch
+
+class TestBatch(unittest.TestCase):
+    """
+    Clase de pruebas para las consultas origen-destino por lotes.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+        
+        Inicializa un grafo con una ciudad inalcanzable.
+        """
+        self.graph = Graph()
+        self.graph.add_edge("Lima", "Quito", 10, 12, 15, 20)
+        self.graph.add_edge("Quito", "Bogota", 5, 6, 7, 8)
+        self.graph.add_edge("Lima", "Bogota", 30, 30, 30, 30)
+        self.graph.add_edge("Caracas", "Lima", 4, 4, 4, 4)
+        self.dist, self.path = floyd_warshall(self.graph, engine='python')
+        self.pairs = [("Lima", "Bogota"), ("lima", "LIMA"), ("Bogota", "Lima"),
+                      ("Lima", "Madrid"), ("Caracas", "Bogota")]
+
+    def test_read_pairs(self):
+        """
+        Prueba la lectura de pares con comas, espacios, comentarios y errores.
+        """
+        lines = ["origen,destino\n", "Lima, Quito\n", "\n", "# comentario\n",
+                 "Quito Bogota\n", "Lima\n", "Lima Quito Bogota\n"]
+        with redirect_stderr(io.StringIO()) as errors:
+            pairs = list(read_pairs(lines))
+        self.assertEqual(pairs, [("Lima", "Quito"), ("Quito", "Bogota")])
+        self.assertIn("línea 6", errors.getvalue())
+        self.assertIn("línea 7", errors.getvalue())
+
+    def test_query_statuses(self):
+        """
+        Prueba distancias, caminos y estados de cada consulta, en orden.
+        """
+        results = list(BatchRouter(self.graph, self.dist, self.path).query(self.pairs, batch_size=2))
+        self.assertEqual([result.status for result in results],
+                         [STATUS_OK, STATUS_OK, STATUS_UNREACHABLE, STATUS_UNKNOWN_CITY, STATUS_OK])
+        self.assertEqual(results[0].distance, 15)
+        self.assertEqual(results[0].path, ["Lima", "Quito", "Bogota"])
+        self.assertEqual(results[1].path, ["Lima"])
+        self.assertEqual(results[4].path, ["Caracas", "Lima", "Quito", "Bogota"])
+        self.assertIsNone(results[2].distance)
+        self.assertEqual(results[3].origin, "Lima")
+        
+        without_paths = list(BatchRouter(self.graph, self.dist, self.path).query(self.pairs, with_paths=False))
+        self.assertEqual([result.distance for result in without_paths],
+                         [result.distance for result in results])
+        self.assertTrue(all(result.path is None for result in without_paths))
+
+    def test_router_matches_matrices(self):
+        """
+        Prueba que el modo bajo demanda dé los mismos resultados.
+        """
+        expected = list(BatchRouter(self.graph, self.dist, self.path).query(self.pairs))
+        router = LazyRouter(self.graph, method='dijkstra')
+        self.assertEqual(list(BatchRouter(self.graph, router=router).query(self.pairs)), expected)
+        with self.assertRaises(ValueError):
+            BatchRouter(self.graph)
+
+    @unittest.skipIf(np is None, "NumPy no está instalado")
+    def test_compact_matrices_are_not_copied(self):
+        """
+        Prueba que con matrices compactas se indexe una vista sin copiarlas.
+        """
+        expected = list(BatchRouter(self.graph, self.dist, self.path).query(self.pairs))
+        for dist_dtype in ('float32', 'float64'):
+            with self.subTest(dist_dtype=dist_dtype):
+                dist, path = compact_matrices(self.dist, self.path, dist_dtype, 'auto')
+                router = BatchRouter(self.graph, dist, path)
+                self.assertEqual(list(router.query(self.pairs)), expected)
+                self.assertEqual(router._dist_array.dtype, np.dtype(dist_dtype))
+                self.assertTrue(np.shares_memory(router._dist_array, np.asarray(dist)))
+
+    def test_write_results(self):
+        """
+        Prueba la salida en CSV y en JSON por líneas.
+        """
+        batch = BatchRouter(self.graph, self.dist, self.path)
+        output = io.StringIO()
+        self.assertEqual(write_results(batch.query(self.pairs), output, 'csv'), 5)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], "origin,destination,status,distance,path")
+        self.assertEqual(lines[1], "Lima,Bogota,ok,15.0,Lima -> Quito -> Bogota")
+        self.assertEqual(lines[3], "Bogota,Lima,unreachable,,")
+        
+        output = io.StringIO()
+        write_results(batch.query(self.pairs), output, 'jsonl')
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(records[0]["path"], ["Lima", "Quito", "Bogota"])
+        self.assertIsNone(records[3]["distance"])
+        
+        with self.assertRaises(ValueError):
+            write_results([], output, 'xml')
+
+    def test_run_batch(self):
+        """
+        Prueba el modo no interactivo con el archivo de datos del proyecto.
+        """
+        output = io.StringIO()
+        with redirect_stderr(io.StringIO()):
+            count = run_batch(["Lima BuenosAires\n"], output, 'jsonl', use_snapshot=False)
+        self.assertEqual(count, 1)
+        self.assertEqual(json.loads(output.getvalue())["status"], STATUS_OK)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import io
+import json
+import sys
+import os
+import tempfile
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.generators import generate_edges, generate_graph, write_edge_file, FAMILIES
+from src.benchmark import run_benchmarks, compare, main, OPERATIONS
+
+class TestGenerators(unittest.TestCase):
+    """
+    Clase de pruebas para los generadores de redes sintéticas.
+    """
+
+    def test_families_sizes(self):
+        """
+        Cada familia genera aproximadamente el número de ciudades pedido.
+        """
+        for family in FAMILIES:
+            with self.subTest(family=family):
+                graph = generate_graph(family, 50, seed=1)
+                self.assertGreaterEqual(len(graph.vertices), 45)
+                self.assertLessEqual(len(graph.vertices), 56)
+
+    def test_deterministic(self):
+        """
+        La misma semilla produce las mismas aristas.
+        """
+        for family in FAMILIES:
+            with self.subTest(family=family):
+                self.assertEqual(list(generate_edges(family, 30, seed=7)),
+                                 list(generate_edges(family, 30, seed=7)))
+
+    def test_bad_weather_not_faster(self):
+        """
+        Los tiempos con mal clima nunca son menores que con clima normal.
+        """
+        for family in FAMILIES:
+            for _, _, normal, rain, snow, storm in generate_edges(family, 30):
+                self.assertGreaterEqual(min(rain, snow, storm), normal)
+
+    def test_no_self_loops(self):
+        """
+        Ningún generador produce lazos.
+        """
+        for family in FAMILIES:
+            for from_vertex, to_vertex, *_ in generate_edges(family, 30):
+                self.assertNotEqual(from_vertex, to_vertex)
+
+    def test_unknown_family(self):
+        """
+        Una familia inexistente se rechaza.
+        """
+        with self.assertRaises(ValueError):
+            generate_edges('anillo', 10)
+
+    def test_write_edge_file(self):
+        """
+        El archivo escrito tiene cabecera y una línea por arista.
+        """
+        edges = list(generate_edges('grid', 16))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'grid.txt')
+            self.assertEqual(write_edge_file(edges, filename), len(edges))
+            with open(filename, encoding='utf-8') as file:
+                lines = file.read().splitlines()
+        self.assertEqual(len(lines), len(edges) + 1)
+        self.assertTrue(lines[0].startswith("Ciudad1"))
+
+class TestBenchmark(unittest.TestCase):
+    """
+    Clase de pruebas para las mediciones y la comparación con referencias.
+    """
+
+    def test_small_run(self):
+        """
+        Una ejecución pequeña mide todas las operaciones de cada caso.
+        """
+        results = run_benchmarks(sizes=[10, 20], families=['sparse', 'grid'])
+        self.assertEqual(len(results['results']), 2 * 2 * len(OPERATIONS))
+        for record in results['results']:
+            self.assertEqual(record['status'], 'ok')
+            self.assertGreaterEqual(record['seconds'], 0)
+            self.assertGreater(record['peak_bytes'], 0)
+        json.dumps(results)  # Debe poder guardarse como JSON
+
+    def test_skips_large_cases(self):
+        """
+        Los casos con demasiadas aristas se omiten sin medirse.
+        """
+        results = run_benchmarks(sizes=[10, 100], families=['dense'], max_edges=1000,
+                                 operations=['read_graph_from_file'], memory=False)
+        statuses = [record['status'] for record in results['results']]
+        self.assertEqual(statuses[0], 'ok')
+        self.assertTrue(statuses[1].startswith('skipped'))
+
+    def test_skips_projected_slow_operations(self):
+        """
+        Una operación cuyo tiempo proyectado supera el máximo no se mide.
+        """
+        results = run_benchmarks(sizes=[10, 1000], families=['sparse'], max_seconds=1e-3,
+                                 operations=['floyd_warshall'], memory=False)
+        first, second = results['results']
+        self.assertEqual(first['status'], 'ok')
+        self.assertIsNone(second['seconds'])
+        self.assertTrue(second['status'].startswith('skipped: projected'))
+
+    def test_compare_flags_regressions(self):
+        """
+        Sólo se marcan los aumentos mayores que el umbral y que el ruido.
+        """
+        def result(seconds, peak):
+            return {'results': [{'family': 'grid', 'n': 100, 'operation': 'floyd_warshall',
+                                 'seconds': seconds, 'peak_bytes': peak, 'status': 'ok'}]}
+
+        baseline = result(1.0, 10_000_000)
+        self.assertEqual(compare(baseline, result(1.1, 10_000_000), threshold=0.2), [])
+        regressions = compare(baseline, result(1.5, 20_000_000), threshold=0.2)
+        self.assertEqual([item['metric'] for item in regressions], ['seconds', 'peak_bytes'])
+        # Aumentos relativos grandes pero de microsegundos son ruido
+        self.assertEqual(compare(result(0.0001, 1000), result(0.001, 2000)), [])
+
+    def test_cli_compare_exit_code(self):
+        """
+        El subcomando compare termina con 1 si hay regresiones.
+        """
+        fast = {'results': [{'family': 'sparse', 'n': 10, 'operation': 'floyd_warshall',
+                             'seconds': 1.0, 'peak_bytes': None, 'status': 'ok'}]}
+        slow = json.loads(json.dumps(fast))
+        slow['results'][0]['seconds'] = 2.0
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, data in (('fast', fast), ('slow', slow)):
+                paths.append(os.path.join(directory, f"{name}.json"))
+                with open(paths[-1], 'w', encoding='utf-8') as file:
+                    json.dump(data, file)
+            output = io.StringIO()
+            sys.stdout, saved = output, sys.stdout
+            try:
+                self.assertEqual(main(['compare', paths[0], paths[0]]), 0)
+                self.assertEqual(main(['compare', paths[0], paths[1]]), 1)
+            finally:
+                sys.stdout = saved
+        self.assertIn("floyd_warshall", output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import random
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall
+from src.blocked_floyd import np
+
+@unittest.skipIf(np is None, "NumPy no está instalado")
+class TestBlockedFloydWarshall(unittest.TestCase):
+    """
+    Clase de pruebas para el Floyd-Warshall por bloques.
+
+    Compara el motor por bloques con el motor de referencia en grafos
+    cuyo tamaño no es múltiplo del tamaño de bloque.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+
+        Construye un grafo disperso aleatorio con 50 ciudades.
+        """
+        rng = random.Random(7)
+        self.graph = Graph()
+        for i in range(50):
+            for _ in range(3):
+                j = rng.randrange(50)
+                if j != i:
+                    times = [rng.randint(1, 30) for _ in range(4)]
+                    self.graph.add_edge(f"C{i}", f"C{j}", *times)
+        self.reference = floyd_warshall(self.graph, engine='python')
+
+    def assert_valid_paths(self, dist, path):
+        """
+        Verifica que cada camino reconstruido sume la distancia reportada.
+        """
+        matrix = self.graph.adjacency_matrix
+        for i in range(len(dist)):
+            for j in range(len(dist)):
+                if dist[i][j] == float('inf'):
+                    self.assertEqual(path[i][j], -1)
+                    continue
+                total = 0
+                current = j
+                while current != i:
+                    previous = path[i][current]
+                    total += matrix[previous][current]
+                    current = previous
+                self.assertEqual(total, dist[i][j])
+
+    def test_single_process(self):
+        """
+        Prueba el algoritmo por bloques ejecutado en el proceso actual.
+        """
+        dist, path = floyd_warshall(self.graph, engine='blocked', tile_size=16, workers=1)
+        self.assertEqual(dist, self.reference[0])
+        self.assert_valid_paths(dist, path)
+
+    def test_process_pool(self):
+        """
+        Prueba el algoritmo por bloques repartido en un pool de procesos.
+        """
+        dist, path = floyd_warshall(self.graph, engine='blocked', tile_size=12, workers=2)
+        self.assertEqual(dist, self.reference[0])
+        self.assert_valid_paths(dist, path)
+
+    def test_invalid_tile_size(self):
+        """
+        Prueba que un tamaño de bloque no positivo se rechace.
+        """
+        with self.assertRaises(ValueError):
+            floyd_warshall(self.graph, engine='blocked', tile_size=0)
+
+if __name__ == '__main__':
+    unittest.main()
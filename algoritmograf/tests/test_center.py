@@ -0,0 +1,122 @@
+import unittest
+import random
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall, calculate_graph_center
+from src.compact import compact_matrices
+from src.weather_cache import WeatherScenarioCache
+from src.center import CenterIndex, eccentricities
+from src.components import strongly_connected_components
+from src.utils import find_graph_center
+
+INF = float('inf')
+
+def brute_force_eccentricities(dist):
+    """
+    Excentricidades recorriendo toda la matriz, sin la diagonal.
+    """
+    n = len(dist)
+    return [max((dist[i][j] for j in range(n) if j != i), default=0.0) for i in range(n)]
+
+class TestCenter(unittest.TestCase):
+    """
+    Clase de pruebas para excentricidades, centro, radio y diámetro.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+        
+        Inicializa dos ciclos unidos en un solo sentido, con un lazo en A.
+        """
+        self.graph = Graph()
+        self.graph.add_edge("A", "B", 1, 1, 1, 1)
+        self.graph.add_edge("B", "C", 1, 1, 1, 1)
+        self.graph.add_edge("C", "A", 1, 1, 1, 1)
+        self.graph.add_edge("A", "A", 50, 50, 50, 50)
+        self.graph.add_edge("C", "D", 5, 5, 5, 5)
+        self.graph.add_edge("D", "E", 2, 2, 2, 2)
+        self.graph.add_edge("E", "D", 3, 3, 3, 3)
+        self.dist, _ = floyd_warshall(self.graph, engine='python')
+
+    def test_eccentricities_ignore_diagonal(self):
+        """
+        Prueba que el lazo de A no cuente en su excentricidad.
+        """
+        expected = brute_force_eccentricities(self.dist)
+        self.assertEqual(eccentricities(self.dist), expected)
+        compact, _ = compact_matrices(self.dist, [[-1] * 5] * 5)
+        self.assertEqual(eccentricities(compact), expected)
+        self.assertEqual(expected[0], 9)
+        
+        # La diagonal (ciclo de A, 2) supera a su única distancia (1)
+        loop = [[2, 1], [1, 2]]
+        self.assertEqual(eccentricities(loop), [1, 1])
+
+    def test_center_queries(self):
+        """
+        Prueba centro, top-k, radio, diámetro y centros por componente.
+        """
+        centers = CenterIndex(self.dist)
+        self.assertEqual(centers.center(), 2)
+        self.assertEqual(centers.top_k(2), [(2, 7), (1, 8)])
+        self.assertEqual(centers.radius(), 7)
+        self.assertEqual(centers.diameter(), INF)
+        self.assertEqual(calculate_graph_center(self.dist), 2)
+        self.assertEqual(find_graph_center(self.dist, self.graph), "C")
+        self.assertEqual(centers.component_centers(self.graph),
+                         [(0, 2, [0, 1, 2]), (3, 2, [3, 4])])
+        for dist_dtype in ('float32', 'float64'):
+            compact, _ = compact_matrices(self.dist, [[-1] * 5] * 5, dist_dtype)
+            self.assertEqual(CenterIndex(compact).component_centers(self.graph),
+                             [(0, 2, [0, 1, 2]), (3, 2, [3, 4])])
+
+    def test_no_center(self):
+        """
+        Prueba un grafo donde ninguna ciudad alcanza a todas.
+        """
+        graph = Graph()
+        graph.add_edge("A", "B", 1, 1, 1, 1)
+        graph.add_vertex("C")
+        dist, _ = floyd_warshall(graph, engine='python')
+        self.assertIsNone(CenterIndex(dist).center())
+        self.assertIsNone(calculate_graph_center(dist))
+        self.assertEqual(find_graph_center(dist, graph), "No se pudo determinar el centro del grafo")
+        self.assertIsNone(CenterIndex([]).center())
+
+    def test_strongly_connected_components(self):
+        """
+        Prueba las componentes fuertemente conexas, de mayor a menor.
+        """
+        self.graph.add_vertex("F")
+        self.assertEqual(strongly_connected_components(self.graph), [[0, 1, 2], [3, 4], [5]])
+
+    def test_cache_refreshes_touched_rows(self):
+        """
+        Prueba que las excentricidades mantenidas coincidan con recalcularlas.
+        """
+        random.seed(7)
+        for dist_dtype in (None, 'float64'):
+            with self.subTest(dist_dtype=dist_dtype):
+                graph = Graph()
+                for i in range(12):
+                    graph.add_edge(f"c{i}", f"c{(i + 1) % 12}", 5, 5, 5, 5)
+                cache = WeatherScenarioCache(graph, engine='python', dist_dtype=dist_dtype)
+                centers = cache.center('normal')
+                for step in range(30):
+                    a, b = random.sample(range(13), 2)
+                    if step % 3 == 2 and graph.weather_times.get((f"c{a}", f"c{b}")):
+                        cache.remove_edge(f"c{a}", f"c{b}")
+                    else:
+                        cache.add_edge(f"c{a}", f"c{b}", random.randint(1, 9), 1, 1, 1)
+                    centers = cache.center('normal')
+                    dist, _ = cache.get('normal')
+                    self.assertEqual(centers.eccentricities(), brute_force_eccentricities(dist))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall, reconstruct_path, available_engines
+from src.apsp import all_pairs_shortest_paths
+from src.weather_cache import WeatherScenarioCache, matrix_nbytes
+from src.compact import DistanceMatrix, PredecessorMatrix, compact_matrices, np
+
+INF = float('inf')
+
+class TestCompactMatrices(unittest.TestCase):
+    """
+    Clase de pruebas para las matrices compactas de distancias y predecesores.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+        
+        Inicializa un grafo con una ciudad inalcanzable.
+        """
+        self.graph = Graph()
+        self.graph.add_edge("A", "B", 1, 2, 3, 4)
+        self.graph.add_edge("B", "C", 2, 3, 4, 5)
+        self.graph.add_edge("A", "C", 4, 5, 6, 7)
+        self.graph.add_edge("C", "A", 2, 3, 4, 5)
+        self.graph.add_edge("D", "A", 6, 7, 8, 9)
+        self.dist, self.path = floyd_warshall(self.graph, engine='python')
+
+    def test_round_trip_all_dtypes(self):
+        """
+        Prueba que cada combinación de tipos conserve los valores y el -1.
+        """
+        for dist_dtype in ('float32', 'float64'):
+            for path_dtype in ('int16', 'uint16', 'int32', 'auto'):
+                with self.subTest(dist_dtype=dist_dtype, path_dtype=path_dtype):
+                    dist, path = compact_matrices(self.dist, self.path, dist_dtype, path_dtype)
+                    self.assertEqual(dist.to_list(), self.dist)
+                    self.assertEqual(path.to_list(), self.path)
+                    self.assertEqual(path[0][3], -1)
+                    self.assertEqual(path.get(0, 3), -1)
+                    self.assertEqual(dist.get(0, 2), 3)
+                    self.assertEqual(reconstruct_path(path, 0, 2), [0, 1, 2])
+                    self.assertEqual(reconstruct_path(path, 0, 3), [])
+
+    def test_row_writes_and_growth(self):
+        """
+        Prueba la escritura por celda y por fila y la ampliación en sitio.
+        """
+        dist, path = compact_matrices(self.dist, self.path, 'float64', 'uint16')
+        path[0][2] = -1
+        self.assertEqual(path.get(0, 2), -1)
+        path.set_row(0, [0, -1, 1, 2])
+        self.assertEqual(list(path[0]), [0, -1, 1, 2])
+        dist[1][3] = 7.5
+        self.assertEqual(dist.get(1, 3), 7.5)
+        
+        dist.grow(6)
+        path.grow(6)
+        self.assertEqual(len(dist), 6)
+        self.assertEqual(dist.get(1, 3), 7.5)
+        self.assertEqual(list(dist[5]), [INF] * 5 + [0.0])
+        self.assertEqual(list(path[4]), [-1] * 4 + [4, -1])
+
+    @unittest.skipIf(np is None, "NumPy no está instalado")
+    def test_array_view_without_copy(self):
+        """
+        Prueba que np.asarray con el mismo tipo no copie la matriz.
+        """
+        dist, _ = compact_matrices(self.dist, self.path, 'float64', 'auto')
+        view = np.asarray(dist, dtype=np.float64)
+        dist[0][1] = 9.5
+        self.assertEqual(view[0, 1], 9.5)
+        self.assertEqual(np.asarray(dist, dtype=np.float32).dtype, np.float32)
+        self.assertFalse(np.shares_memory(np.array(dist), view))
+
+    def test_invalid_dtypes(self):
+        """
+        Prueba que se rechacen tipos desconocidos o demasiado pequeños.
+        """
+        with self.assertRaises(ValueError):
+            DistanceMatrix(2, 'int8')
+        with self.assertRaises(ValueError):
+            PredecessorMatrix(2, 'float32')
+        with self.assertRaises(ValueError):
+            PredecessorMatrix(70000, 'uint16')
+
+    def test_engines_return_same_results(self):
+        """
+        Prueba que el formato compacto no cambie los resultados de ningún motor.
+        """
+        for algorithm in ('floyd', 'dijkstra'):
+            engines = available_engines() if algorithm == 'floyd' else ['auto']
+            for engine in engines:
+                with self.subTest(algorithm=algorithm, engine=engine):
+                    dist, path = all_pairs_shortest_paths(self.graph, algorithm, engine,
+                                                          dist_dtype='float64', path_dtype='int16')
+                    self.assertIsInstance(dist, DistanceMatrix)
+                    self.assertEqual(dist.to_list(), self.dist)
+                    self.assertEqual(reconstruct_path(path, 3, 2), [3, 0, 1, 2])
+
+    def test_cache_updates_compact_matrices(self):
+        """
+        Prueba las actualizaciones incrementales sobre matrices compactas.
+        """
+        cache = WeatherScenarioCache(self.graph, engine='python', dist_dtype='float32', path_dtype='auto')
+        dist, _ = cache.get('normal')
+        lists_bytes = matrix_nbytes(self.dist) + matrix_nbytes(self.path)
+        self.assertLess(cache.total_bytes(), lists_bytes)
+        
+        cache.add_edge("C", "E", 1, 1, 1, 1)
+        cache.remove_edge("A", "B")
+        dist, path = cache.get('normal')
+        self.assertIsInstance(dist, DistanceMatrix)
+        expected_dist, _ = floyd_warshall(self.graph, engine='python')
+        self.assertEqual(dist.to_list(), expected_dist)
+        self.assertEqual(reconstruct_path(path, 0, 4), [0, 2, 4])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.generators import generate_graph
+from src.floyd_warshall import floyd_warshall, np
+from src.apsp import all_pairs_shortest_paths
+from src.components import ReachabilityIndex, strongly_connected_components
+
+INF = float('inf')
+
+class TestReachabilityIndex(unittest.TestCase):
+    """
+    Clase de pruebas para la condensación y el índice de alcanzabilidad.
+    """
+
+    def setUp(self):
+        # Dos ciclos (A-B-C y D-E) unidos por C -> D, más F aislada
+        self.graph = Graph.from_edges([
+            ('A', 'B', 1, 1, 1, 1),
+            ('B', 'C', 1, 1, 1, 1),
+            ('C', 'A', 1, 1, 1, 1),
+            ('C', 'D', 1, 1, 1, 1),
+            ('D', 'E', 1, 1, 1, 1),
+            ('E', 'D', 1, 1, 1, 1),
+        ])
+        self.graph.add_vertex('F')
+
+    def test_condensation(self):
+        """
+        Las componentes quedan en orden topológico inverso.
+        """
+        index = ReachabilityIndex(self.graph)
+        self.assertFalse(index.is_strongly_connected())
+        self.assertEqual(sorted(index.components, key=lambda c: (-len(c), c[0])),
+                         strongly_connected_components(self.graph))
+        for c, targets in enumerate(index.successors):
+            self.assertTrue(all(d < c for d in targets))
+        self.assertEqual(index.descendants(1), [0, 1, 2, 3, 4])
+        self.assertEqual(index.descendants(3), [3, 4])
+        self.assertEqual(index.ancestors(4), [0, 1, 2, 3, 4])
+        self.assertEqual(index.descendants(5), [5])
+
+    def test_matches_distance_matrix(self):
+        """
+        Un par es alcanzable si y sólo si su distancia es finita.
+        """
+        for family in ('sparse', 'grid', 'dense'):
+            graph = generate_graph(family, 40, seed=4)
+            from_idx, to_idx, _ = next(graph.edges())
+            graph.remove_edge(graph.vertices[from_idx], graph.vertices[to_idx])
+            dist, _ = floyd_warshall(graph, engine='python')
+            index = ReachabilityIndex(graph)
+            with self.subTest(family=family):
+                self.assertEqual([[index.reachable(i, j) for j in range(40)] for i in range(40)],
+                                 [[i == j or dist[i][j] < INF for j in range(40)] for i in range(40)])
+
+    def test_closed_edge_does_not_connect(self):
+        """
+        Una arista con tiempo infinito en el clima actual no conecta.
+        """
+        graph = Graph.from_edges([
+            ('A', 'B', 1, 1, 1, INF),
+            ('B', 'A', 1, 1, 1, 1),
+        ])
+        graph.set_weather_condition('tormenta')
+        dist, _ = floyd_warshall(graph, engine='python')
+        index = ReachabilityIndex(graph)
+        self.assertEqual(dist[0][1], INF)
+        self.assertFalse(index.reachable(0, 1))
+        self.assertTrue(index.reachable(1, 0))
+        self.assertEqual(strongly_connected_components(graph), [[0], [1]])
+        graph.set_weather_condition('normal')
+        self.assertTrue(ReachabilityIndex(graph).is_strongly_connected())
+
+    @unittest.skipIf(np is None, "NumPy no está instalado")
+    def test_condensed_engine_matches_numpy(self):
+        """
+        El motor por componentes da las mismas matrices que el completo.
+        """
+        graph = Graph()
+        for i in range(60):
+            graph.add_edge(f"c{i}", f"c{(i * 7 + 1) % 60}", i % 4 + 1, 2, 3, 4)
+            if i % 5:
+                graph.add_edge(f"c{i}", f"c{i // 2}", 2, 2, 2, 2)
+        expected = floyd_warshall(graph, engine='numpy')
+        self.assertEqual(floyd_warshall(graph, engine='condensed'), expected)
+        self.assertEqual(all_pairs_shortest_paths(graph, algorithm='floyd'), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph, WEATHER_CONDITIONS
+from src.generators import generate_graph
+from src.floyd_warshall import floyd_warshall
+from src.contraction import ContractionHierarchy, build_hierarchies
+from src.routing import LazyRouter
+
+INF = float('inf')
+
+class TestContractionHierarchy(unittest.TestCase):
+    """
+    Clase de pruebas para las jerarquías de contracción.
+    """
+
+    def assert_matches_floyd(self, graph, hierarchy, condition):
+        """
+        Compara todas las consultas con Floyd-Warshall en la misma condición.
+        """
+        view = graph.weather_view(condition)
+        dist, _ = floyd_warshall(view, as_lists=True)
+        matrix = view.adjacency_matrix
+        n = len(graph.vertices)
+        for source in range(n):
+            for target in range(n):
+                distance, path = hierarchy.route(source, target)
+                expected = dist[source][target]
+                if expected == INF:
+                    self.assertEqual((distance, path), (INF, []))
+                    continue
+                self.assertAlmostEqual(distance, expected)
+                self.assertEqual((path[0], path[-1]), (source, target))
+                total = sum(matrix[a][b] for a, b in zip(path, path[1:]))
+                self.assertAlmostEqual(total, expected)
+
+    def test_matches_floyd_per_weather(self):
+        """
+        Cada jerarquía por clima da las distancias de Floyd-Warshall.
+        """
+        for family in ('sparse', 'grid', 'dense'):
+            graph = generate_graph(family, 25, seed=3)
+            hierarchies = build_hierarchies(graph)
+            self.assertEqual(set(hierarchies), set(WEATHER_CONDITIONS))
+            for condition, hierarchy in hierarchies.items():
+                with self.subTest(family=family, condition=condition):
+                    self.assert_matches_floyd(graph, hierarchy, condition)
+
+    def test_weather_view(self):
+        """
+        Una vista por clima sirve como grafo y fija la condición.
+        """
+        graph = generate_graph('sparse', 25, seed=5)
+        view = graph.weather_view('nieve')
+        hierarchy = ContractionHierarchy(view)
+        self.assertEqual(hierarchy.condition, 'nieve')
+        self.assert_matches_floyd(graph, hierarchy, 'nieve')
+
+    def test_integer_times_are_exact(self):
+        """
+        Con tiempos enteros las distancias son idénticas, sin redondeo.
+        """
+        graph = Graph.from_edges([(f"C{i}", f"C{(i * 7 + 3) % 30}", i % 5 + 1, 2, 3, 4)
+                                  for i in range(30)] +
+                                 [(f"C{i}", f"C{i + 1}", 3, 3, 3, 3) for i in range(29)])
+        dist, _ = floyd_warshall(graph, as_lists=True)
+        hierarchy = ContractionHierarchy(graph)
+        self.assertEqual([[hierarchy.distance(s, t) for t in range(30)] for s in range(30)], dist)
+
+    def test_self_loop_diagonal(self):
+        """
+        La diagonal con lazo es el ciclo más corto, como en Floyd-Warshall.
+        """
+        graph = Graph.from_edges([
+            ('A', 'A', 9, 9, 9, 9),
+            ('A', 'B', 1, 1, 1, 1),
+            ('B', 'A', 2, 2, 2, 2),
+            ('B', 'C', 1, 1, 1, 1),
+        ])
+        hierarchy = ContractionHierarchy(graph)
+        self.assertEqual(hierarchy.route(0, 0), (3, [0, 1, 0]))
+        self.assertEqual(hierarchy.route(1, 1), (0.0, [1]))
+        self.assertEqual(hierarchy.route(2, 0), (INF, []))
+
+    def test_closed_self_loop(self):
+        """
+        Un lazo cerrado por el clima deja la diagonal en infinito, como en
+        Floyd-Warshall, salvo que haya otro ciclo.
+        """
+        graph = Graph.from_edges([
+            ('A', 'A', 1, 1, 1, INF),
+            ('B', 'B', 1, 1, 1, INF),
+            ('B', 'C', 1, 1, 1, 1),
+            ('C', 'B', 2, 2, 2, 2),
+        ])
+        graph.set_weather_condition('tormenta')
+        dist, _ = floyd_warshall(graph, as_lists=True)
+        hierarchy = ContractionHierarchy(graph)
+        self.assertEqual([[hierarchy.distance(s, t) for t in range(3)] for s in range(3)], dist)
+        self.assertEqual(hierarchy.route(0, 0), (INF, []))
+        self.assertEqual(hierarchy.route(1, 1), (3, [1, 2, 1]))
+
+    def test_lazy_router_keeps_one_hierarchy_per_weather(self):
+        """
+        El enrutador conserva la jerarquía de cada clima hasta que cambia el grafo.
+        """
+        graph = generate_graph('grid', 25, seed=1)
+        router = LazyRouter(graph, method='hierarchy')
+        normal = router.hierarchy()
+        graph.set_weather_condition('nieve')
+        self.assertEqual(router.hierarchy().condition, None)
+        graph.set_weather_condition('normal')
+        self.assertIs(router.hierarchy(), normal)
+        graph.add_edge(graph.vertices[0], graph.vertices[24], 1, 1, 1, 1)
+        self.assertEqual(router.route(0, 24), (1, [0, 24]))
+        self.assertIsNot(router.hierarchy(), normal)
+
+if __name__ == '__main__':
+    unittest.main()
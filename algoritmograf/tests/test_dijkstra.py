@@ -0,0 +1,100 @@
+import unittest
+import random
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall
+from src.dijkstra import dijkstra, dijkstra_all_pairs
+from src.apsp import all_pairs_shortest_paths, choose_algorithm
+
+def random_graph(n, degree, seed):
+    """
+    Construye un grafo aleatorio con tiempos reales sin empates.
+    """
+    rng = random.Random(seed)
+    edges = []
+    for i in range(n):
+        for _ in range(degree):
+            times = [rng.uniform(1, 20) for _ in range(4)]
+            edges.append((f"C{i}", f"C{rng.randrange(n)}", *times))
+    return Graph.from_edges(edges)
+
+class TestDijkstra(unittest.TestCase):
+    """
+    Clase de pruebas para Dijkstra y la selección automática de algoritmo.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+        
+        Construye un grafo disperso aleatorio, con lazos incluidos.
+        """
+        self.graph = random_graph(80, 3, seed=11)
+        self.reference = floyd_warshall(self.graph, engine='python')
+
+    def assert_same_result(self, result):
+        """
+        Compara un resultado con el de Floyd-Warshall.
+        """
+        dist, path = result
+        self.assertEqual(path, self.reference[1])
+        for row, expected_row in zip(dist, self.reference[0]):
+            for value, expected in zip(row, expected_row):
+                self.assertAlmostEqual(value, expected)
+
+    def test_single_source(self):
+        """
+        Prueba Dijkstra desde un único origen.
+        """
+        dist, pred = dijkstra(self.graph, 5)
+        self.assertEqual(pred, self.reference[1][5])
+        self.assertEqual([round(d, 9) for d in dist], [round(d, 9) for d in self.reference[0][5]])
+
+    def test_closed_self_loop(self):
+        """
+        Prueba que un lazo cerrado por el clima deje la diagonal como en
+        Floyd-Warshall: infinita salvo que haya otro ciclo.
+        """
+        graph = Graph.from_edges([
+            ('A', 'A', 1, 1, 1, float('inf')),
+            ('B', 'B', 1, 1, 1, float('inf')),
+            ('B', 'C', 1, 1, 1, 1),
+            ('C', 'B', 2, 2, 2, 2),
+        ])
+        graph.set_weather_condition('tormenta')
+        dist, path = floyd_warshall(graph, engine='python')
+        self.assertEqual([dijkstra(graph, source)[0] for source in range(3)], dist)
+        self.assertEqual(dist[0][0], float('inf'))
+        self.assertEqual(dist[1][1], 3)
+        self.assertEqual(dijkstra_all_pairs(graph)[0], dist)
+
+    def test_all_pairs_matches_floyd(self):
+        """
+        Prueba que Dijkstra desde cada origen coincida con Floyd-Warshall.
+        """
+        self.assert_same_result(dijkstra_all_pairs(self.graph))
+
+    def test_parallel_sources(self):
+        """
+        Prueba el reparto de orígenes en un pool de procesos.
+        """
+        self.assert_same_result(dijkstra_all_pairs(self.graph, workers=2, chunk_size=16))
+
+    def test_algorithm_selection(self):
+        """
+        Prueba la elección automática y la elección explícita del algoritmo.
+        """
+        self.assertEqual(choose_algorithm(random_graph(400, 2, seed=3)), 'dijkstra')
+        self.assertEqual(choose_algorithm(random_graph(20, 10, seed=3)), 'floyd')
+        self.assert_same_result(all_pairs_shortest_paths(self.graph, algorithm='dijkstra'))
+        self.assert_same_result(all_pairs_shortest_paths(self.graph, algorithm='floyd'))
+        with self.assertRaises(ValueError):
+            all_pairs_shortest_paths(self.graph, algorithm='bellman')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.graph import Graph
-from src.floyd_warshall import floyd_warshall
+from src.floyd_warshall import floyd_warshall, available_engines
 from src.utils import find_graph_center
 
 class TestFloydWarshall(unittest.TestCase):
@@ -91,5 +91,27 @@ class TestFloydWarshall(unittest.TestCase):
         # El centro debería ser C porque minimiza la máxima distancia
         self.assertEqual(center, "C")
 
+    def test_engines_agree(self):
+        """
+        Prueba que todos los motores disponibles den el mismo resultado.
+        
+        Compara las matrices de distancias y caminos de cada motor con
+        las del motor de referencia en Python.
+        """
+        self.graph.add_vertex("E")
+        self.graph.add_edge("D", "E", 2, 3, 4, 5)
+        reference = floyd_warshall(self.graph, engine='python')
+        
+        for engine in available_engines():
+            with self.subTest(engine=engine):
+                self.assertEqual(floyd_warshall(self.graph, engine=engine), reference)
+
+    def test_unknown_engine(self):
+        """
+        Prueba que un motor inexistente se rechace explícitamente.
+        """
+        with self.assertRaises(ValueError):
+            floyd_warshall(self.graph, engine='cuantico')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,136 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.generators import generate_graph
+from src.dijkstra import dijkstra
+from src.forecast import Forecast, ForecastWindow, TimeDependentRouter, load_forecast
+import src.forecast as forecast_module
+
+INF = float('inf')
+
+def sample_graph():
+    """
+    Cadena A -> B -> C con un atajo A -> C; con tormenta todo tarda el cuádruple.
+    """
+    graph = Graph.from_edges([
+        ('A', 'B', 1, 2, 3, 4),
+        ('B', 'C', 1, 2, 3, 4),
+        ('A', 'C', 3.6, 3.6, 3.6, 3.6),
+    ])
+    graph.define_region('sur', ['A'])
+    return graph
+
+class TestForecast(unittest.TestCase):
+    """
+    Clase de pruebas para las rutas dependientes del pronóstico.
+    """
+
+    def test_condition_changes_mid_edge(self):
+        """
+        Un tramo empezado con tormenta se termina al ritmo del clima siguiente.
+        """
+        forecast = Forecast([ForecastWindow(0, 'tormenta'), ForecastWindow(2, 'normal')])
+        route = TimeDependentRouter(sample_graph(), forecast).route('A', 'C', departure=0)
+        # A -> B: 2 h de tormenta recorren la mitad; la otra mitad tarda 0.5 h
+        self.assertEqual(route.path, ['A', 'B', 'C'])
+        self.assertEqual(route.arrival, 3.5)
+        self.assertEqual([leg.weather for leg in route.legs], ['tormenta', 'normal'])
+        self.assertEqual(route.legs[0].arrival, 2.5)
+
+    def test_uniform_forecast_matches_dijkstra(self):
+        """
+        Con una sola ventana coincide con Dijkstra sobre esa condición.
+        """
+        graph = generate_graph('sparse', 150, seed=4)
+        graph.set_weather_condition('nieve')
+        expected, _ = dijkstra(graph, 0)
+        router = TimeDependentRouter(graph, Forecast([ForecastWindow(0, 'nieve')]))
+        arrival, _ = router.earliest_arrivals(0, 10.0)
+        for got, want in zip(arrival, expected):
+            self.assertAlmostEqual(got, want + 10.0 if want < INF else INF)
+
+    def test_fifo(self):
+        """
+        Salir más tarde nunca permite llegar antes.
+        """
+        graph = generate_graph('grid', 100, seed=2)
+        forecast = Forecast([ForecastWindow(0, 'tormenta'), ForecastWindow(1, 'normal'),
+                             ForecastWindow(3, 'nieve'), ForecastWindow(4, 'lluvia')])
+        router = TimeDependentRouter(graph, forecast)
+        previous = None
+        for step in range(30):
+            arrival, _ = router.earliest_arrivals(0, step * 0.2)
+            if previous is not None:
+                for before, after in zip(previous, arrival):
+                    self.assertLessEqual(before, after + 1e-9)
+            previous = arrival
+
+    def test_region_and_edge_windows(self):
+        """
+        Las condiciones por región y por tramo se aplican en su ventana.
+        """
+        graph = sample_graph()
+        forecast = Forecast([ForecastWindow(0, 'normal', regions={'sur': 'tormenta'},
+                                            edges={('A', 'C'): 'normal'})])
+        route = TimeDependentRouter(graph, forecast).route('A', 'C')
+        self.assertEqual(route.path, ['A', 'C'])
+        self.assertEqual(route.arrival, 3.6)
+        with self.assertRaises(ValueError):
+            TimeDependentRouter(graph, Forecast([ForecastWindow(0, regions={'norte': 'nieve'})]))
+        with self.assertRaises(ValueError):
+            Forecast([ForecastWindow(5), ForecastWindow(1)])
+
+    def test_weights_cached_until_graph_changes(self):
+        """
+        Los tiempos por ventana se calculan una vez por versión del grafo.
+        """
+        graph = sample_graph()
+        router = TimeDependentRouter(graph, Forecast([ForecastWindow(0)]))
+        weights = router._window_weights
+        router.route('A', 'C')
+        self.assertIs(router._window_weights, weights)
+        graph.add_edge('B', 'A', 1, 1, 1, 1)
+        self.assertEqual(router.route('B', 'A').arrival, 1)
+        self.assertIsNot(router._window_weights, weights)
+
+    def test_weights_follow_region_changes(self):
+        """
+        Redefinir una región recalcula los tiempos de sus ventanas.
+        """
+        graph = sample_graph()
+        graph.remove_edge('A', 'C')
+        router = TimeDependentRouter(graph, Forecast([ForecastWindow(0, regions={'sur': 'tormenta'})]))
+        self.assertEqual(router.route('A', 'C').arrival, 5)
+        graph.define_region('sur', ['A', 'B'])
+        self.assertEqual(router.route('A', 'C').arrival, 8)
+
+    def test_without_numpy_and_load(self):
+        """
+        Sin NumPy se obtienen los mismos tiempos; el pronóstico se lee de JSON.
+        """
+        data = [{'start': 0, 'weather': 'lluvia'},
+                {'start': 1, 'regions': {'sur': 'nieve'}, 'edges': [['B', 'C', 'tormenta']]}]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as file:
+            json.dump(data, file)
+        try:
+            forecast = load_forecast(file.name)
+        finally:
+            os.remove(file.name)
+        graph = sample_graph()
+        expected = TimeDependentRouter(graph, forecast).route('A', 'C')
+        original = forecast_module.np
+        forecast_module.np = None
+        try:
+            self.assertEqual(TimeDependentRouter(graph, forecast).route('A', 'C'), expected)
+        finally:
+            forecast_module.np = original
+
+if __name__ == '__main__':
+    unittest.main()
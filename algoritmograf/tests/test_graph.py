@@ -144,5 +144,71 @@ class TestGraph(unittest.TestCase):
         self.graph.set_weather_condition("normal")
         self.assertEqual(self.graph.adjacency_matrix[a_idx][b_idx], 5)
 
+    def test_bulk_construction(self):
+        """
+        Prueba la construcción de un grafo a partir de una lista de aristas.
+        
+        Verifica que el resultado sea igual al de agregar arista por arista.
+        """
+        edges = [("A", "B", 1, 2, 3, 4), ("B", "C", 5, 6, 7, 8), ("A", "B", 2, 3, 4, 5)]
+        graph = Graph.from_edges(edges)
+        for edge in edges:
+            self.graph.add_edge(*edge)
+        
+        self.assertEqual(graph.vertices, ["A", "B", "C"])
+        self.assertEqual(graph.get_edge_count(), 2)
+        self.assertEqual(graph.adjacency_matrix.to_list(), self.graph.adjacency_matrix.to_list())
+        self.assertEqual(dict(graph.weather_times), dict(self.graph.weather_times))
+        self.assertEqual(graph.vertex_index("C"), 2)
+        self.assertEqual(graph.vertex_index("Z"), -1)
+
+    def test_csr_adjacency(self):
+        """
+        Prueba la representación CSR de las aristas salientes y entrantes.
+        """
+        self.graph.add_edge("A", "B", 1, 2, 3, 4)
+        self.graph.add_edge("A", "C", 5, 6, 7, 8)
+        self.graph.add_edge("C", "B", 9, 10, 11, 12)
+        
+        indptr, indices, weights = self.graph.csr()
+        self.assertEqual(list(indptr), [0, 2, 2, 3])
+        self.assertEqual(list(indices), [1, 2, 1])
+        self.assertEqual(list(weights), [1, 5, 9])
+        
+        indptr, indices, weights = self.graph.csr('nieve', reverse=True)
+        self.assertEqual(list(indptr), [0, 0, 2, 3])
+        self.assertEqual(list(indices), [0, 2, 0])
+        self.assertEqual(list(weights), [3, 11, 7])
+
+    def test_removed_edge_slot_is_reused(self):
+        """
+        Prueba que el espacio de una arista eliminada se reutilice.
+        """
+        self.graph.add_edge("A", "B", 1, 2, 3, 4)
+        self.graph.add_edge("B", "C", 5, 6, 7, 8)
+        self.graph.remove_edge("A", "B")
+        self.graph.add_edge("C", "A", 9, 10, 11, 12)
+        
+        self.assertEqual(len(self.graph._times), 8)
+        self.assertEqual(self.graph.get_edge_count(), 2)
+        self.assertNotIn(("A", "B"), self.graph.weather_times)
+        self.assertEqual(self.graph.weather_times[("C", "A")]["tormenta"], 12)
+
+    def test_city_names_ignore_case(self):
+        """
+        Prueba que los nombres de ciudades no distingan mayúsculas.
+        
+        Verifica que "lima" y "Lima" sean la misma ciudad al agregar,
+        consultar y eliminar aristas.
+        """
+        self.graph.add_edge("Lima", "Quito", 5, 6, 7, 8)
+        self.graph.add_edge("lima", "QUITO", 4, 5, 6, 7)
+        
+        self.assertEqual(self.graph.vertices, ["Lima", "Quito"])
+        self.assertEqual(self.graph.weather_times[("LIMA", "quito")]["normal"], 4)
+        self.assertEqual(self.graph.find_cities("l"), ["Lima"])
+        self.assertTrue(self.graph.remove_edge("LIMA", "quito"))
+        self.assertEqual(self.graph.get_edge_count(), 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall
+from src.incremental import add_edge_incremental, remove_edge_incremental
+
+class TestIncrementalUpdate(unittest.TestCase):
+    """
+    Clase de pruebas para la actualización incremental de rutas.
+
+    Cada prueba compara el resultado incremental con un recálculo
+    completo de Floyd-Warshall sobre el mismo grafo.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+
+        Inicializa un grafo con un camino largo A -> B -> C -> D.
+        """
+        self.graph = Graph()
+        self.graph.add_edge("A", "B", 4, 5, 6, 7)
+        self.graph.add_edge("B", "C", 4, 5, 6, 7)
+        self.graph.add_edge("C", "D", 4, 5, 6, 7)
+        self.graph.add_edge("D", "A", 1, 2, 3, 4)
+        self.dist, self.path = floyd_warshall(self.graph, engine='python')
+
+    def add(self, from_vertex, to_vertex, weight):
+        """
+        Agrega una arista de forma incremental y devuelve el recálculo completo.
+        """
+        self.dist, self.path = add_edge_incremental(
+            self.graph, self.dist, self.path, from_vertex, to_vertex,
+            weight, weight + 1, weight + 2, weight + 3)
+        return floyd_warshall(self.graph, engine='python')
+
+    def test_new_shortcut(self):
+        """
+        Prueba una arista nueva que acorta varios caminos.
+        """
+        expected = self.add("A", "C", 1)
+        self.assertEqual(self.dist, expected[0])
+        self.assertEqual(self.path, expected[1])
+
+    def test_new_city(self):
+        """
+        Prueba una arista hacia una ciudad que no existía.
+        """
+        expected = self.add("D", "E", 2)
+        self.assertEqual(len(self.dist), 5)
+        self.assertEqual(self.dist, expected[0])
+        self.assertEqual(self.path, expected[1])
+
+    def test_more_expensive_edge(self):
+        """
+        Prueba que encarecer una arista recalcule todas las rutas.
+        """
+        expected = self.add("A", "B", 20)
+        self.assertEqual(self.dist, expected[0])
+        self.assertEqual(self.path, expected[1])
+
+    def test_remove_edge_on_shortest_path(self):
+        """
+        Prueba eliminar una arista usada por varios caminos más cortos.
+        """
+        self.add("A", "C", 5)
+        removed, self.dist, self.path = remove_edge_incremental(
+            self.graph, self.dist, self.path, "b", "c", max_affected_fraction=1.0)
+        expected = floyd_warshall(self.graph, engine='python')
+        self.assertTrue(removed)
+        self.assertEqual(self.dist, expected[0])
+        self.assertEqual(self.path, expected[1])
+
+    def test_remove_edge_disconnects(self):
+        """
+        Prueba eliminar la única arista que llega a una ciudad.
+        """
+        removed, self.dist, self.path = remove_edge_incremental(
+            self.graph, self.dist, self.path, "C", "D", max_affected_fraction=1.0)
+        d_idx = self.graph.vertices.index("D")
+        self.assertTrue(removed)
+        self.assertEqual(self.dist[0][d_idx], float('inf'))
+        self.assertEqual(self.path[0][d_idx], -1)
+        self.assertEqual(self.dist, floyd_warshall(self.graph, engine='python')[0])
+
+    def test_remove_missing_edge(self):
+        """
+        Prueba que eliminar una arista inexistente no altere las matrices.
+        """
+        before = [row.copy() for row in self.dist]
+        removed, self.dist, self.path = remove_edge_incremental(
+            self.graph, self.dist, self.path, "A", "D")
+        self.assertFalse(removed)
+        self.assertEqual(self.dist, before)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import io
+import sys
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.loader import load_graph
+
+class TestLoader(unittest.TestCase):
+    """
+    Clase de pruebas para la carga por bloques de archivos de aristas.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+        
+        Crea un archivo temporal con encabezado, comentarios, líneas
+        erróneas y una arista repetida.
+        """
+        self.lines = [
+            "Ciudad1 Ciudad2 tiempoNormal tiempoLluvia tiempoNieve tiempoTormenta",
+            "# comentario",
+            "Lima Quito 10 12 15 20",
+            "",
+            "Quito Bogota 5 6 7 8",
+            "Bogota Lima 1 2",
+            "// otro comentario",
+            "Bogota Caracas 3 x 5 6",
+            "lima quito 9 11 14 19",
+            "Caracas Lima 4 5 6 7",
+        ]
+        handle, self.filename = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, "w") as f:
+            f.write("\n".join(self.lines))
+
+    def tearDown(self):
+        """
+        Elimina el archivo temporal.
+        """
+        os.remove(self.filename)
+
+    def test_matches_edge_by_edge_loading(self):
+        """
+        Prueba que la carga por bloques equivalga a agregar arista por arista.
+        
+        Se usan bloques muy pequeños para que muchas líneas queden cortadas
+        entre dos lecturas.
+        """
+        expected = Graph()
+        expected.add_edge("Lima", "Quito", 10, 12, 15, 20)
+        expected.add_edge("Quito", "Bogota", 5, 6, 7, 8)
+        expected.add_edge("lima", "quito", 9, 11, 14, 19)
+        expected.add_edge("Caracas", "Lima", 4, 5, 6, 7)
+        
+        for chunk_size in (7, 64, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                with redirect_stdout(io.StringIO()):
+                    graph, stats = load_graph(self.filename, chunk_size=chunk_size)
+                self.assertEqual(graph.vertices, expected.vertices)
+                self.assertEqual(dict(graph.weather_times), dict(expected.weather_times))
+                self.assertEqual(stats.lines, len(self.lines))
+                self.assertEqual(stats.edges, 4)
+
+    def test_reports_bad_lines(self):
+        """
+        Prueba que cada línea errónea se informe con su número o contenido.
+        """
+        output = io.StringIO()
+        with redirect_stdout(output):
+            _, stats = load_graph(self.filename)
+        self.assertEqual(stats.errors, 2)
+        self.assertIn("Formato incorrecto en línea 6: Bogota Lima 1 2", output.getvalue())
+        self.assertIn("Error al convertir tiempos a números en línea: Bogota Caracas 3 x 5 6",
+                      output.getvalue())
+        self.assertGreater(stats.lines_per_second, 0)
+
+    def test_missing_file(self):
+        """
+        Prueba que un archivo inexistente produzca FileNotFoundError.
+        """
+        with self.assertRaises(FileNotFoundError):
+            load_graph(self.filename + ".no")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.name_index import NameIndex
+
+class TestNameIndex(unittest.TestCase):
+    """
+    Clase de pruebas para el índice de nombres de ciudades.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+        
+        Inicializa un índice con varias ciudades sudamericanas.
+        """
+        self.index = NameIndex()
+        for city in ["BuenosAires", "Bogota", "Brasilia", "Lima", "LaPaz", "Quito"]:
+            self.index.add(city)
+
+    def test_lookup_ignores_case(self):
+        """
+        Prueba que la búsqueda no distinga mayúsculas ni espacios extremos.
+        """
+        self.assertEqual(self.index.lookup("lima"), 3)
+        self.assertEqual(self.index.lookup("  QUITO "), 5)
+        self.assertEqual(self.index.lookup("Caracas"), -1)
+        self.assertEqual(self.index.add("LIMA"), (3, False))
+        self.assertEqual(len(self.index), 6)
+
+    def test_prefix_lookup(self):
+        """
+        Prueba la búsqueda de ciudades por prefijo.
+        """
+        self.assertEqual(self.index.with_prefix("b"), ["Bogota", "Brasilia", "BuenosAires"])
+        self.assertEqual(self.index.with_prefix("B", limit=1), ["Bogota"])
+        self.index.add("Barranquilla")
+        self.assertEqual(self.index.with_prefix("ba"), ["Barranquilla"])
+        self.assertEqual(self.index.with_prefix("x"), [])
+
+    def test_suggestions(self):
+        """
+        Prueba las sugerencias ante nombres mal escritos.
+        """
+        self.assertEqual(self.index.suggest("Bogta"), ["Bogota"])
+        self.assertEqual(self.index.suggest("Kito"), [])
+        self.assertEqual(self.index.suggest("Quitoo"), ["Quito"])
+
+if __name__ == '__main__':
+    unittest.main()
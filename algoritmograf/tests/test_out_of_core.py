@@ -0,0 +1,98 @@
+import unittest
+import io
+import sys
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.generators import generate_graph
+from src.apsp import all_pairs_shortest_paths
+from src.center import CenterIndex
+from src.utils import display_shortest_path, find_graph_center
+from src.out_of_core import OutOfCoreAPSP, np
+
+INF = float('inf')
+
+@unittest.skipIf(np is None, "NumPy no está instalado")
+class TestOutOfCore(unittest.TestCase):
+    """
+    Clase de pruebas para las rutas fuera de memoria.
+    """
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_matches_in_memory(self):
+        """
+        Las matrices en disco coinciden con las calculadas en memoria.
+        """
+        graph = generate_graph('sparse', 70, seed=5)
+        graph.set_weather_condition('lluvia')
+        dist, _ = all_pairs_shortest_paths(graph, algorithm='dijkstra')
+        store = OutOfCoreAPSP(self.directory, graph, band_size=16).compute()
+        self.assertTrue(store.complete)
+        self.assertEqual(store.dist.tolist(), dist)
+        self.assertEqual(store.eccentricities(), CenterIndex(dist).eccentricities())
+        distance, route = store.route(0, 69)
+        self.assertEqual(distance, dist[0][69])
+        if distance < INF:
+            self.assertEqual(route[0], 0)
+            self.assertEqual(route[-1], 69)
+
+    def test_resume_after_interruption(self):
+        """
+        Un cálculo interrumpido se reanuda calculando sólo las bandas que faltan.
+        """
+        graph = generate_graph('grid', 64, seed=1)
+        OutOfCoreAPSP(self.directory, graph, band_size=8).compute(max_bands=3)
+
+        reported = []
+        store = OutOfCoreAPSP(self.directory, graph, band_size=8)
+        self.assertEqual(store.pending_bands(), [3, 4, 5, 6, 7])
+        store.compute(progress=lambda done, total, seconds: reported.append((done, total)))
+        self.assertEqual(reported, [(4, 8), (5, 8), (6, 8), (7, 8), (8, 8)])
+
+        dist, _ = all_pairs_shortest_paths(graph, algorithm='dijkstra')
+        self.assertEqual(OutOfCoreAPSP.open(self.directory, graph).dist.tolist(), dist)
+
+    def test_changed_graph_starts_over(self):
+        """
+        Si el grafo o el clima cambian, el progreso anterior no se reutiliza.
+        """
+        graph = generate_graph('grid', 36, seed=2)
+        OutOfCoreAPSP(self.directory, graph, band_size=6).compute()
+        graph.set_weather_condition('nieve')
+        with self.assertRaises(ValueError):
+            OutOfCoreAPSP.open(self.directory, graph)
+        store = OutOfCoreAPSP(self.directory, graph, band_size=6)
+        self.assertEqual(len(store.pending_bands()), 6)
+        with self.assertRaises(RuntimeError):
+            store.route(0, 1)
+
+    def test_queries_with_display_functions(self):
+        """
+        Las vistas en disco sirven a display_shortest_path y al centro.
+        """
+        graph = Graph.from_edges([
+            ('A', 'B', 1, 2, 3, 4),
+            ('B', 'C', 1, 2, 3, 4),
+            ('C', 'D', 1, 2, 3, 4),
+            ('A', 'D', 10, 10, 10, 10),
+        ])
+        store = OutOfCoreAPSP(self.directory, graph, band_size=3).compute()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            display_shortest_path('A', 'D', store.dist, store.path, graph)
+        self.assertIn("A -> B -> C -> D", output.getvalue())
+        self.assertEqual(find_graph_center(store.dist, graph, store.center_index()), 'A')
+
+if __name__ == '__main__':
+    unittest.main()
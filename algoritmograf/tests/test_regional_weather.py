@@ -0,0 +1,135 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.generators import generate_graph
+from src.floyd_warshall import floyd_warshall
+from src.routing import LazyRouter
+import src.graph as graph_module
+
+INF = float('inf')
+
+def sample_graph():
+    """
+    Dos regiones: costa (A, B) y sierra (C, D).
+    """
+    graph = Graph.from_edges([
+        ('A', 'B', 1, 2, 3, 4),
+        ('B', 'C', 1, 2, 3, 4),
+        ('C', 'D', 1, 2, 3, 4),
+        ('D', 'A', 1, 2, 3, 4),
+    ])
+    graph.define_region('costa', ['A', 'B'])
+    graph.define_region('sierra', ['C', 'D'])
+    return graph
+
+class TestRegionalWeather(unittest.TestCase):
+    """
+    Clase de pruebas para el clima por región y por arista.
+    """
+
+    def test_region_weather_applies_to_outgoing_edges(self):
+        """
+        El clima de una región cambia sólo las aristas que salen de ella.
+        """
+        graph = sample_graph()
+        self.assertEqual(graph.set_region_weather('sierra', 'nieve'), 2)
+        self.assertEqual(graph.adjacency_matrix[0][1], 1)
+        self.assertEqual(graph.adjacency_matrix[1][2], 1)
+        self.assertEqual(graph.adjacency_matrix[2][3], 3)
+        self.assertEqual(graph.adjacency_matrix[3][0], 3)
+        self.assertEqual(graph.edge_weather('C', 'D'), 'nieve')
+        self.assertTrue(graph.has_mixed_weather())
+        # Repetir la asignación no rematerializa nada
+        self.assertEqual(graph.set_region_weather('sierra', 'nieve'), 0)
+
+    def test_routes_use_mixed_weather(self):
+        """
+        Floyd-Warshall y Dijkstra ven los tiempos de cada región.
+        """
+        graph = sample_graph()
+        graph.set_weather_conditions({'costa': 'lluvia', 'sierra': 'tormenta'})
+        for engine in ('python', 'numpy', 'blocked'):
+            with self.subTest(engine=engine):
+                dist, _ = floyd_warshall(graph, engine=engine, as_lists=True)
+                self.assertEqual(dist[0][3], 2 + 2 + 4)
+        router = LazyRouter(graph)
+        self.assertEqual(router.route(0, 3)[0], 8)
+        graph.set_region_weather('sierra', 'normal')
+        self.assertEqual(router.route(0, 3)[0], 5)
+
+    def test_global_weather_resets_regions(self):
+        """
+        set_weather_condition vuelve a un clima uniforme.
+        """
+        graph = sample_graph()
+        graph.set_region_weather('costa', 'nieve')
+        graph.set_weather_condition('lluvia')
+        self.assertFalse(graph.has_mixed_weather())
+        self.assertEqual(graph.region_weather(), {})
+        self.assertEqual(graph.weather_state, 'lluvia')
+        self.assertEqual([w for _, _, w in graph.edges()], [2, 2, 2, 2])
+
+    def test_edge_weather_and_new_edges(self):
+        """
+        Una arista puede tener clima propio y las nuevas heredan el de su región.
+        """
+        graph = sample_graph()
+        self.assertTrue(graph.set_edge_weather('A', 'B', 'tormenta'))
+        self.assertEqual(graph.adjacency_matrix[0][1], 4)
+        graph.set_region_weather('sierra', 'nieve')
+        graph.add_edge('C', 'A', 5, 6, 7, 8)
+        self.assertEqual(graph.edge_weather('C', 'A'), 'nieve')
+        self.assertEqual(graph.adjacency_matrix[2][0], 7)
+        graph.remove_edge('A', 'B')
+        graph.remove_edge('C', 'D')
+        graph.remove_edge('D', 'A')
+        graph.remove_edge('C', 'A')
+        self.assertFalse(graph.has_mixed_weather())
+        with self.assertRaises(ValueError):
+            graph.set_edge_weather('A', 'D', 'nieve')
+        with self.assertRaises(ValueError):
+            graph.set_region_weather('desierto', 'nieve')
+        with self.assertRaises(ValueError):
+            graph.define_region('norte', ['Z'])
+
+    def test_copy_keeps_regional_weather(self):
+        """
+        La copia conserva regiones y clima de cada arista.
+        """
+        graph = sample_graph()
+        graph.set_region_weather('costa', 'nieve')
+        graph.set_edge_weather('C', 'D', 'lluvia')
+        clone = graph.copy()
+        self.assertEqual(clone.regions(), graph.regions())
+        self.assertEqual(list(clone.edges()), list(graph.edges()))
+
+    def test_vectorized_matches_loop(self):
+        """
+        La asignación con NumPy da los mismos tiempos que arista a arista.
+        """
+        graph = generate_graph('grid', 400, seed=3)
+        graph.define_region('norte', graph.vertices[:200])
+        graph.set_region_weather('norte', 'tormenta')
+        expected = list(graph.edges())
+
+        original = graph_module.np
+        graph_module.np = None
+        try:
+            other = generate_graph('grid', 400, seed=3)
+            other.define_region('norte', other.vertices[:200])
+            other.set_region_weather('norte', 'tormenta')
+        finally:
+            graph_module.np = original
+        self.assertEqual(list(other.edges()), expected)
+        self.assertEqual(graph._off_weather, other._off_weather)
+        # Las aristas pueden seguir creciendo tras usar vistas de NumPy
+        graph.add_edge(graph.vertices[0], graph.vertices[399], 1, 2, 3, 4)
+        self.assertEqual(graph.edge_weather(graph.vertices[0], graph.vertices[399]), 'tormenta')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import io
+import sys
+import os
+from contextlib import redirect_stdout
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall
+from src.routing import LazyRouter
+from src.route_cache import RouteCache, Route, CacheInfo
+from src.utils import shortest_path, display_shortest_path
+
+INF = float('inf')
+
+class TestRouteCache(unittest.TestCase):
+    """
+    Clase de pruebas para la caché de rutas.
+    """
+
+    def setUp(self):
+        self.graph = Graph.from_edges([
+            ('A', 'B', 1, 2, 3, 4),
+            ('B', 'C', 1, 2, 3, 4),
+            ('C', 'D', 1, 2, 3, 4),
+            ('A', 'D', 10, 5, 10, 10),
+        ])
+
+    def test_hits_and_misses(self):
+        """
+        La segunda consulta del mismo par sale de la caché.
+        """
+        cache = RouteCache(self.graph)
+        router = LazyRouter(self.graph)
+        first = shortest_path('A', 'D', None, None, self.graph, router, cache)
+        self.assertEqual(first, Route('A', 'D', 3, ('A', 'B', 'C', 'D')))
+        self.assertIs(shortest_path('a', 'd', None, None, self.graph, router, cache), first)
+        self.assertEqual(cache.info(), CacheInfo(1, 1, 0, 0, 1, cache.maxsize))
+
+    def test_lru_eviction(self):
+        """
+        Sin lugar se descarta la ruta usada hace más tiempo.
+        """
+        cache = RouteCache(self.graph, maxsize=2)
+        for end in (1, 2):
+            cache.put(0, end, Route('A', self.graph.vertices[end], end, ()))
+        cache.get(0, 1)
+        cache.put(0, 3, Route('A', 'D', 3, ()))
+        self.assertIsNone(cache.get(0, 2))
+        self.assertIsNotNone(cache.get(0, 1))
+        self.assertEqual(cache.info().evictions, 1)
+        with self.assertRaises(ValueError):
+            RouteCache(self.graph, maxsize=0)
+
+    def test_invalidated_by_edge_changes(self):
+        """
+        Agregar o quitar aristas descarta las rutas guardadas.
+        """
+        cache = RouteCache(self.graph)
+        router = LazyRouter(self.graph)
+        shortest_path('A', 'D', None, None, self.graph, router, cache)
+        self.graph.add_edge('A', 'C', 1, 1, 1, 1)
+        route = shortest_path('A', 'D', None, None, self.graph, router, cache)
+        self.assertEqual(route.path, ('A', 'C', 'D'))
+        self.assertEqual(cache.info().invalidations, 1)
+        self.graph.remove_edge('C', 'D')
+        route = shortest_path('A', 'D', None, None, self.graph, router, cache)
+        self.assertEqual((route.distance, route.path), (10, ('A', 'D')))
+        self.assertEqual(cache.info().invalidations, 2)
+
+    def test_weather_is_part_of_the_key(self):
+        """
+        Cada clima tiene sus rutas y volver a uno reutiliza las suyas.
+        """
+        cache = RouteCache(self.graph)
+        router = LazyRouter(self.graph)
+        normal = shortest_path('A', 'D', None, None, self.graph, router, cache)
+        self.graph.set_weather_condition('lluvia')
+        rain = shortest_path('A', 'D', None, None, self.graph, router, cache)
+        self.assertEqual((rain.distance, rain.path), (5, ('A', 'D')))
+        self.graph.set_weather_condition('normal')
+        self.assertIs(shortest_path('A', 'D', None, None, self.graph, router, cache), normal)
+        self.assertEqual(cache.info(), CacheInfo(1, 2, 0, 0, 2, cache.maxsize))
+
+    def test_matrices_and_display(self):
+        """
+        La función pura sirve con matrices y display_shortest_path la usa.
+        """
+        dist, path = floyd_warshall(self.graph, as_lists=True)
+        self.assertEqual(shortest_path('D', 'A', dist, path, self.graph), Route('D', 'A', INF, ()))
+        with self.assertRaises(ValueError):
+            shortest_path('A', 'Z', dist, path, self.graph)
+        cache = RouteCache(self.graph)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            for _ in range(2):
+                display_shortest_path('A', 'D', dist, path, self.graph, cache=cache)
+            display_shortest_path('A', 'Z', dist, path, self.graph, cache=cache)
+        self.assertEqual(output.getvalue().count("Camino: A -> B -> C -> D"), 2)
+        self.assertIn("La ciudad 'Z' no existe", output.getvalue())
+        self.assertEqual(cache.info().hits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import random
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall
+from src.routing import bidirectional_dijkstra, astar, LandmarkHeuristic, LazyRouter
+
+class TestRouting(unittest.TestCase):
+    """
+    Clase de pruebas para las consultas de ruta punto a punto.
+    
+    Cada método se compara con las distancias de Floyd-Warshall en una
+    cuadrícula con algunas calles de un solo sentido.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+        
+        Construye una cuadrícula de 8×8 ciudades con tiempos aleatorios.
+        """
+        rng = random.Random(5)
+        self.graph = Graph()
+        for row in range(8):
+            for col in range(8):
+                for d_row, d_col in ((0, 1), (1, 0)):
+                    if row + d_row < 8 and col + d_col < 8:
+                        a = f"R{row}C{col}"
+                        b = f"R{row + d_row}C{col + d_col}"
+                        self.graph.add_edge(a, b, *[rng.uniform(1, 9) for _ in range(4)])
+                        if rng.random() < 0.8:
+                            self.graph.add_edge(b, a, *[rng.uniform(1, 9) for _ in range(4)])
+        self.dist, _ = floyd_warshall(self.graph, engine='python')
+        self.pairs = [(rng.randrange(64), rng.randrange(64)) for _ in range(60)]
+
+    def assert_valid_route(self, source, target, result):
+        """
+        Verifica la distancia y que el camino sume esa distancia.
+        """
+        distance, path = result
+        expected = self.dist[source][target]
+        if expected == float('inf'):
+            self.assertEqual((distance, path), (float('inf'), []))
+            return
+        self.assertAlmostEqual(distance, expected)
+        self.assertEqual((path[0], path[-1]), (source, target))
+        matrix = self.graph.adjacency_matrix
+        total = sum(matrix[a][b] for a, b in zip(path, path[1:]))
+        self.assertAlmostEqual(total, expected)
+
+    def test_bidirectional_dijkstra(self):
+        """
+        Prueba Dijkstra bidireccional contra Floyd-Warshall.
+        """
+        for source, target in self.pairs:
+            self.assert_valid_route(source, target, bidirectional_dijkstra(self.graph, source, target))
+
+    def test_astar_with_landmarks(self):
+        """
+        Prueba A* con la heurística de puntos de referencia.
+        """
+        landmarks = LandmarkHeuristic(self.graph, count=3)
+        self.assertEqual(len(landmarks.landmarks), 3)
+        for source, target in self.pairs:
+            heuristic = landmarks.for_target(target)
+            self.assertLessEqual(heuristic(source), self.dist[source][target] + 1e-9)
+            self.assert_valid_route(source, target, astar(self.graph, source, target, heuristic))
+
+    def test_lazy_router_memoizes_and_invalidates(self):
+        """
+        Prueba que el enrutador memorice árboles y los descarte al cambiar el grafo.
+        """
+        router = LazyRouter(self.graph, method='dijkstra', max_sources=2)
+        for source, target in self.pairs[:10]:
+            self.assert_valid_route(source, target, router.route(source, target))
+        self.assertLessEqual(len(router._trees), 2)
+        
+        tree = router.source_tree(0)
+        self.assertIs(router.source_tree(0), tree)
+        self.graph.set_weather_condition('nieve')
+        self.assertIsNot(router.source_tree(0), tree)
+
+    def test_lazy_router_methods(self):
+        """
+        Prueba los métodos punto a punto del enrutador.
+        """
+        for method in ('bidirectional', 'astar', 'hierarchy'):
+            router = LazyRouter(self.graph, method=method)
+            with self.subTest(method=method):
+                for source, target in self.pairs[:20]:
+                    self.assert_valid_route(source, target, router.route(source, target))
+        with self.assertRaises(ValueError):
+            LazyRouter(self.graph, method='teletransporte')
+
+    def test_self_loop_diagonal(self):
+        """
+        Prueba que de una ciudad a sí misma todos los métodos den la
+        diagonal de Floyd-Warshall: el ciclo más corto si tiene lazo.
+        """
+        self.graph.add_edge('R0C0', 'R0C0', 50, 50, 50, 50)
+        self.graph.add_edge('R0C1', 'R0C1', 1, 1, 1, float('inf'))
+        self.graph.add_edge('R7C7', 'R7C7', 0.5, 0.5, 0.5, 0.5)
+        sources = [self.graph.vertex_index(name) for name in ('R0C0', 'R0C1', 'R7C7', 'R3C3')]
+        for condition in ('normal', 'tormenta'):
+            self.graph.set_weather_condition(condition)
+            self.dist, _ = floyd_warshall(self.graph, engine='python')
+            routers = [LazyRouter(self.graph, method=method) for method in LazyRouter.METHODS]
+            for source in sources:
+                with self.subTest(condition=condition, source=source):
+                    self.assert_valid_route(source, source, bidirectional_dijkstra(self.graph, source, source))
+                    self.assert_valid_route(source, source, astar(self.graph, source, source))
+                    for router in routers:
+                        self.assert_valid_route(source, source, router.route(source, source))
+        self.assertLess(self.dist[sources[0]][sources[0]], 50)
+        self.assertEqual(bidirectional_dijkstra(self.graph, sources[2], sources[2]),
+                         (0.5, [sources[2], sources[2]]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.generators import generate_graph
+from src.scenarios import (ScenarioEvaluator, Scenario, apply_scenario, compare_distances,
+                           load_scenarios)
+import src.scenarios as scenarios_module
+
+INF = float('inf')
+
+def sample_graph():
+    """
+    Cadena A -> B -> C -> D con un atajo lento A -> D; con nieve todo tarda el triple.
+    """
+    return Graph.from_edges([
+        ('A', 'B', 1, 2, 3, 4),
+        ('B', 'C', 1, 2, 3, 4),
+        ('C', 'D', 1, 2, 3, 4),
+        ('A', 'D', 10, 10, 10, 10),
+    ])
+
+class TestScenarios(unittest.TestCase):
+    """
+    Clase de pruebas para la evaluación de escenarios hipotéticos.
+    """
+
+    def test_closure_during_snowstorm(self):
+        """
+        Cerrar un tramo con nieve desvía la ruta por el atajo.
+        """
+        graph = sample_graph()
+        result, = ScenarioEvaluator(graph, workers=1).evaluate(
+            [Scenario('cierre', 'nieve', closures=[('B', 'C')])])
+        self.assertEqual(result.weather, 'nieve')
+        # A->C, A->D, B->C y B->D cambian; todas menos A->D quedan sin ruta
+        self.assertEqual(result.changed_pairs, 4)
+        self.assertEqual(result.disconnected_pairs, 3)
+        self.assertEqual(result.max_increase, 1.0)  # A->D: 9 -> 10
+        self.assertEqual(result.changes[0].after, INF)
+        # El grafo base no se modifica
+        self.assertIn(('B', 'C'), graph.weather_times)
+        self.assertEqual(graph.current_weather, 'normal')
+
+    def test_override_reports_center(self):
+        """
+        Un tramo nuevo que cierra el ciclo conecta pares y mueve el centro.
+        """
+        result, = ScenarioEvaluator(sample_graph(), workers=1).evaluate(
+            [Scenario('retorno', overrides=[('D', 'B', 0.5), ('C', 'A', 0.5)])])
+        self.assertEqual((result.center_before, result.radius_before), ('A', 3))
+        # C llega a todas en 1.5 (C->A->B, C->D)
+        self.assertEqual((result.center_after, result.radius_after), ('C', 1.5))
+        self.assertEqual(result.connected_pairs, 6)
+
+    def test_override_keeps_other_weathers(self):
+        """
+        Un cambio de tiempo sólo afecta a la condición del escenario.
+        """
+        graph = apply_scenario(sample_graph(), Scenario('x', 'lluvia', overrides=[('A', 'B', 7)]))
+        self.assertEqual(graph.weather_times[('A', 'B')],
+                         {'normal': 1, 'lluvia': 7, 'nieve': 3, 'tormenta': 4})
+
+    def test_parallel_matches_serial(self):
+        """
+        El pool de procesos da los mismos resultados, en el mismo orden.
+        """
+        graph = generate_graph('grid', 36, seed=3)
+        edges = [(graph.vertices[u], graph.vertices[v]) for u, v, _ in graph.edges()]
+        scenarios = [Scenario(f"s{k}", ('normal', 'tormenta')[k % 2], closures=edges[3 * k:3 * k + 3])
+                     for k in range(6)]
+        serial = ScenarioEvaluator(graph, workers=1).evaluate(scenarios)
+        parallel = ScenarioEvaluator(graph, workers=2).evaluate(scenarios)
+        self.assertEqual(serial, parallel)
+        self.assertEqual([result.name for result in parallel], [s.name for s in scenarios])
+
+    def test_compare_without_numpy(self):
+        """
+        La comparación celda a celda coincide con la vectorizada.
+        """
+        baseline = [[0, 1, INF], [INF, 0, 2], [3, 4, 0]]
+        dist = [[0, 5, 6], [INF, 0, INF], [3, 4, 0]]
+        vertices = ['A', 'B', 'C']
+        expected = compare_distances(baseline, dist, vertices)
+        np = scenarios_module.np
+        scenarios_module.np = None
+        try:
+            self.assertEqual(compare_distances(baseline, dist, vertices), expected)
+        finally:
+            scenarios_module.np = np
+        self.assertEqual(expected[:4], (3, 1, 1, 4))
+
+    def test_invalid_scenarios(self):
+        """
+        Los escenarios que no se pueden aplicar se rechazan antes de evaluarlos.
+        """
+        evaluator = ScenarioEvaluator(sample_graph(), workers=1)
+        for scenario in (Scenario('x', 'granizo'),
+                         Scenario('x', closures=[('D', 'A')]),
+                         Scenario('x', overrides=[('A', 'Z', 1)]),
+                         Scenario('x', overrides=[('A', 'B', -1)])):
+            with self.subTest(scenario=scenario):
+                with self.assertRaises(ValueError):
+                    evaluator.evaluate([scenario])
+
+    def test_load_scenarios(self):
+        """
+        Los escenarios se leen de un archivo JSON.
+        """
+        data = [{'name': 'nieve', 'weather': 'nieve', 'closures': [['A', 'B']]},
+                {'overrides': [['A', 'D', '2.5']]}]
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'escenarios.json')
+            with open(filename, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            scenarios = load_scenarios(filename)
+        self.assertEqual(scenarios[0], Scenario('nieve', 'nieve', (('A', 'B'),), ()))
+        self.assertEqual(scenarios[1], Scenario('escenario 2', 'normal', (), (('A', 'D', 2.5),)))
+
+if __name__ == '__main__':
+    unittest.main()
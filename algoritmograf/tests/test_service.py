@@ -0,0 +1,184 @@
+import unittest
+import asyncio
+import io
+import json
+import sys
+import os
+from contextlib import redirect_stderr
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall
+from src.service import RouteService, RouteHTTPServer
+
+INF = float('inf')
+
+def sample_graph():
+    """
+    Cadena A -> B -> C -> D con un atajo lento A -> D.
+    """
+    return Graph.from_edges([
+        ('A', 'B', 1, 2, 3, 4),
+        ('B', 'C', 1, 2, 3, 4),
+        ('C', 'D', 1, 2, 3, 4),
+        ('A', 'D', 10, 10, 10, 10),
+    ])
+
+class TestRouteService(unittest.IsolatedAsyncioTestCase):
+    """
+    Clase de pruebas para el servicio de rutas y sus instantáneas.
+    """
+
+    async def asyncSetUp(self):
+        self.service = RouteService(sample_graph())
+        self.server = RouteHTTPServer(self.service)
+
+    async def asyncTearDown(self):
+        self.service.close()
+
+    async def request(self, method, target, body=None):
+        data = b'' if body is None else json.dumps(body).encode('utf-8')
+        status, payload = await self.server.dispatch(method, target, data)
+        return int(status), payload
+
+    async def test_route(self):
+        """
+        Una consulta devuelve distancia, camino y versión.
+        """
+        status, payload = await self.request('GET', '/route?from=a&to=D')
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['distance'], 3)
+        self.assertEqual(payload['path'], ['A', 'B', 'C', 'D'])
+        self.assertEqual(payload['version'], 1)
+        status, payload = await self.request('GET', '/route?from=D&to=A')
+        self.assertEqual(payload['status'], 'unreachable')
+
+    async def test_mutations_publish_new_snapshots(self):
+        """
+        Conexiones, cierres y cambios de clima publican versiones nuevas
+        sin modificar la instantánea que ya tenía un lector.
+        """
+        before = self.service.snapshot
+        status, payload = await self.request('POST', '/connections', {
+            'from': 'A', 'to': 'C', 'normal': 0.5, 'lluvia': 0.5, 'nieve': 0.5, 'tormenta': 0.5})
+        self.assertEqual((status, payload['version']), (200, 2))
+        _, route = await self.request('GET', '/route?from=A&to=D')
+        self.assertEqual(route['path'], ['A', 'C', 'D'])
+        # El lector que empezó antes sigue viendo la versión anterior intacta
+        self.assertEqual(before.route('A', 'D').distance, 3)
+
+        status, payload = await self.request('POST', '/closures', {'from': 'C', 'to': 'D'})
+        self.assertEqual((status, payload['version']), (200, 3))
+        _, route = await self.request('GET', '/route?from=A&to=D')
+        self.assertEqual(route['distance'], 10)
+
+        status, payload = await self.request('POST', '/weather', {'condition': 'tormenta'})
+        self.assertEqual(payload, {'version': 4, 'weather': 'tormenta'})
+        _, route = await self.request('GET', '/route?from=A&to=B')
+        self.assertEqual(route['distance'], 4)
+
+    async def test_matrices_match_full_recompute(self):
+        """
+        Las matrices publicadas tras varias modificaciones coinciden con
+        un cálculo completo sobre el grafo equivalente.
+        """
+        await self.service.add_connection('B', 'E', (2, 2, 2, 2))
+        await self.service.add_connection('E', 'A', (1, 1, 1, 1))
+        await self.service.close_connection('A', 'B')
+        await self.service.add_connection('C', 'D', (5, 5, 5, 5))  # Más caro: recálculo
+        snapshot = self.service.snapshot
+        expected, _ = floyd_warshall(snapshot.graph, engine='python')
+        self.assertEqual([list(row) for row in snapshot.dist], expected)
+
+    async def test_concurrent_mutations_are_serialized(self):
+        """
+        Las modificaciones simultáneas se aplican todas, una tras otra.
+        """
+        edges = [(f"X{k}", f"X{k + 1}") for k in range(10)]
+        await asyncio.gather(*(self.service.add_connection(a, b, (1, 1, 1, 1)) for a, b in edges))
+        snapshot = self.service.snapshot
+        self.assertEqual(snapshot.version, 11)
+        self.assertEqual(snapshot.route('X0', 'X10').distance, 10)
+
+    async def test_batch_and_center(self):
+        """
+        El lote y el centro responden sobre la misma instantánea.
+        """
+        status, payload = await self.request('POST', '/routes', {'pairs': [['A', 'C'], ['A', 'Z']]})
+        self.assertEqual(status, 200)
+        self.assertEqual([r['status'] for r in payload['results']], ['ok', 'unknown_city'])
+        # El enrutador por lotes se crea una vez por instantánea
+        router = self.service.snapshot.batch_router()
+        await self.request('POST', '/routes', {'pairs': [['B', 'D']]})
+        self.assertIs(self.service.snapshot.batch_router(), router)
+        status, payload = await self.request('GET', '/center?top=2')
+        self.assertEqual(status, 200)
+        # Sólo A alcanza a todas; D no alcanza a ninguna
+        self.assertEqual((payload['center'], payload['radius']), ('A', 3))
+        self.assertIsNone(payload['diameter'])
+        self.assertEqual(len(payload['top']), 2)
+
+    async def test_errors(self):
+        """
+        Las peticiones incorrectas reciben el código de estado adecuado.
+        """
+        cases = [
+            (('GET', '/nada'), 404),
+            (('DELETE', '/route'), 405),
+            (('GET', '/route?from=A'), 400),
+            (('POST', '/routes', {'pairs': 'A,B'}), 400),
+            (('POST', '/connections', {'from': 'A', 'to': 'B', 'normal': 'x',
+                                       'lluvia': 1, 'nieve': 1, 'tormenta': 1}), 400),
+            (('POST', '/closures', {'from': 'B', 'to': 'A'}), 404),
+            (('POST', '/weather', {'condition': 'granizo'}), 400),
+        ]
+        for request, expected in cases:
+            with self.subTest(request=request):
+                status, payload = await self.request(*request)
+                self.assertEqual(status, expected)
+                self.assertIn('error', payload)
+        status, _ = await self.server.dispatch('POST', '/closures', b'{no es json')
+        self.assertEqual(status, 400)
+
+    async def test_unexpected_error_is_500(self):
+        """
+        Un fallo inesperado de un manejador responde 500 y queda registrado.
+        """
+        async def broken(query, data):
+            raise RuntimeError('fallo')
+        self.server._routes[('GET', '/health')] = broken
+        output = io.StringIO()
+        with redirect_stderr(output):
+            status, payload = await self.request('GET', '/health')
+        self.assertEqual(status, 500)
+        self.assertIn('error', payload)
+        self.assertIn('RuntimeError: fallo', output.getvalue())
+
+    async def test_http_keep_alive(self):
+        """
+        Varias peticiones por la misma conexión TCP.
+        """
+        server = await self.server.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            for target in ('/health', '/route?from=A&to=B'):
+                writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('ascii'))
+                await writer.drain()
+                status_line = await reader.readline()
+                self.assertIn(b'200', status_line)
+                headers = {}
+                while (line := await reader.readline()) != b'\r\n':
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.lower()] = value.strip()
+                body = json.loads(await reader.readexactly(int(headers['content-length'])))
+                self.assertEqual(body['version'], 1)
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import io
+import sys
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall
+from src.weather_cache import WeatherScenarioCache
+from src.snapshot import file_digest, load_snapshot, save_snapshot
+from src.main import load_with_snapshot
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Clase de pruebas para las instantáneas binarias del grafo.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+        
+        Inicializa un grafo con una arista eliminada (hueco libre) y una
+        ruta para la instantánea.
+        """
+        self.graph = Graph()
+        self.graph.add_edge("Lima", "Quito", 10, 12, 15, 20)
+        self.graph.add_edge("Quito", "Bogota", 5, 6, 7, 8)
+        self.graph.add_edge("Bogota", "Lima", 3, 4, 5, 6)
+        self.graph.add_edge("Lima", "Bogota", 30, 30, 30, 30)
+        self.graph.add_edge("Bogota", "Caracas", 2, 2, 2, 2)
+        self.graph.remove_edge("Bogota", "Caracas")
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "grafo.snap")
+
+    def tearDown(self):
+        """
+        Elimina los archivos temporales.
+        """
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """
+        Prueba que el grafo y las matrices se recuperen sin cambios.
+        """
+        dist, path = floyd_warshall(self.graph, engine='python')
+        save_snapshot(self.filename, self.graph, {'normal': (dist, path)}, "abc")
+        
+        snapshot = load_snapshot(self.filename, "abc")
+        self.assertIsNotNone(snapshot)
+        self.assertEqual(snapshot.graph.vertices, self.graph.vertices)
+        self.assertEqual(dict(snapshot.graph.weather_times), dict(self.graph.weather_times))
+        self.assertEqual(snapshot.graph.get_edge_count(), self.graph.get_edge_count())
+        self.assertEqual(list(snapshot.matrices), ['normal'])
+        loaded_dist, loaded_path = snapshot.matrices['normal']
+        self.assertEqual([list(row) for row in loaded_dist], dist)
+        self.assertEqual([list(row) for row in loaded_path], path)
+
+    def test_rejects_other_source(self):
+        """
+        Prueba que se ignoren instantáneas de otro archivo o dañadas.
+        """
+        save_snapshot(self.filename, self.graph, {}, "abc")
+        self.assertIsNone(load_snapshot(self.filename, "otro"))
+        self.assertIsNotNone(load_snapshot(self.filename))
+        
+        with open(self.filename, 'r+b') as f:
+            f.truncate(40)
+        self.assertIsNone(load_snapshot(self.filename))
+        self.assertIsNone(load_snapshot(self.filename + ".no"))
+
+    def test_file_digest(self):
+        """
+        Prueba que el hash cambie con el contenido del archivo.
+        """
+        source = os.path.join(self.directory.name, "aristas.txt")
+        with open(source, 'w') as f:
+            f.write("Lima Quito 1 2 3 4\n")
+        first = file_digest(source)
+        self.assertEqual(file_digest(source, chunk_size=3), first)
+        with open(source, 'a') as f:
+            f.write("Quito Lima 1 2 3 4\n")
+        self.assertNotEqual(file_digest(source), first)
+
+    def test_seeded_cache_updates(self):
+        """
+        Prueba que las matrices cargadas admitan cambios incrementales.
+        
+        Los cambios se hacen en memoria (copia en escritura) y no alteran
+        el archivo de la instantánea.
+        """
+        dist, path = floyd_warshall(self.graph, engine='python')
+        save_snapshot(self.filename, self.graph, {'normal': (dist, path)}, "abc")
+        snapshot = load_snapshot(self.filename)
+        graph = snapshot.graph
+        cache = WeatherScenarioCache(graph, engine='python')
+        cache.seed('normal', *snapshot.matrices['normal'])
+        
+        cache.remove_edge("Quito", "Bogota")
+        cache.add_edge("Quito", "Caracas", 1, 1, 1, 1)
+        cache.add_edge("Caracas", "Bogota", 1, 1, 1, 1)
+        self.assertEqual(cache.cached_conditions(), ['normal'])
+        
+        expected_dist, _ = floyd_warshall(graph, engine='python')
+        updated_dist, _ = cache.get('normal')
+        self.assertEqual([list(row) for row in updated_dist], expected_dist)
+        
+        unchanged = load_snapshot(self.filename)
+        self.assertEqual([list(row) for row in unchanged.matrices['normal'][0]], dist)
+
+    def test_routes_added_after_batch_run(self):
+        """
+        Prueba que una instantánea guardada sin rutas (modo por lotes o
+        bajo demanda) se complete en la siguiente carga interactiva.
+        """
+        source = os.path.join(self.directory.name, "aristas.txt")
+        with open(source, 'w') as f:
+            f.write("Lima Quito 1 2 3 4\nQuito Bogota 1 2 3 4\n")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            load_with_snapshot(source, self.filename, precompute=False)
+            self.assertEqual(list(load_snapshot(self.filename).matrices), [])
+            load_with_snapshot(source, self.filename, precompute=True)
+            self.assertEqual(list(load_snapshot(self.filename).matrices), ['normal'])
+            output.truncate(0)
+            _, scenarios = load_with_snapshot(source, self.filename, precompute=True)
+        self.assertIn("rutas de: normal", output.getvalue())
+        self.assertNotIn("Calculando", output.getvalue())
+        dist, _ = scenarios.get('normal')
+        self.assertEqual(dist[0][2], 2)
+
+if __name__ == '__main__':
+    unittest.main()
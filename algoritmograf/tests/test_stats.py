@@ -0,0 +1,124 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph
+from src.floyd_warshall import floyd_warshall, np
+from src.dijkstra import dijkstra_all_pairs
+from src.apsp import all_pairs_shortest_paths
+from src.generators import generate_graph
+from src.stats import STATS, Stats, LatencyHistogram, MetricsDumper
+
+class TestStats(unittest.TestCase):
+    """
+    Clase de pruebas para la medición de fases, contadores y latencias.
+    """
+
+    def setUp(self):
+        STATS.reset()
+        STATS.enabled = True
+
+    def tearDown(self):
+        STATS.enabled = False
+        STATS.reset()
+
+    def test_disabled_records_nothing(self):
+        """
+        Desactivado, ningún punto de medición registra datos.
+        """
+        stats = Stats()
+        with stats.phase('fase'):
+            pass
+        stats.count('contador', 5)
+        stats.observe('consulta', 0.01)
+        data = stats.as_dict()
+        self.assertEqual((data['phases'], data['counters'], data['latencies']), ({}, {}, {}))
+
+    def test_phases_and_counters(self):
+        """
+        Las fases acumulan veces y tiempo; los contadores, cantidades.
+        """
+        stats = Stats(enabled=True)
+        for _ in range(3):
+            with stats.phase('fase'):
+                pass
+        stats.count('contador')
+        stats.count('contador', 4)
+        data = json.loads(stats.to_json())
+        self.assertEqual(data['phases']['fase']['count'], 3)
+        self.assertGreaterEqual(data['phases']['fase']['max_seconds'], 0)
+        self.assertEqual(data['counters'], {'contador': 5})
+
+    def test_histogram_quantiles(self):
+        """
+        Los cuantiles aproximados respetan el orden de las latencias.
+        """
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.observe(0.001)
+        for _ in range(10):
+            histogram.observe(0.5)
+        summary = histogram.as_dict()
+        self.assertEqual(summary['count'], 100)
+        self.assertLess(summary['p50_seconds'], 0.002)
+        self.assertGreaterEqual(summary['p99_seconds'], 0.5)
+        self.assertEqual(sum(bucket['count'] for bucket in summary['buckets']), 100)
+
+    def test_floyd_relaxation_counters(self):
+        """
+        Los motores cuentan las mismas relajaciones exitosas.
+        """
+        graph = generate_graph('sparse', 30, seed=2)
+        engines = ['python'] + (['numpy'] if np is not None else [])
+        counts = []
+        for engine in engines:
+            STATS.reset()
+            floyd_warshall(graph, engine=engine)
+            counts.append(STATS.counter('apsp.relaxations_succeeded'))
+            self.assertLessEqual(STATS.counter('apsp.relaxations_attempted'), 30 ** 3)
+        self.assertGreater(counts[0], 0)
+        self.assertEqual(len(set(counts)), 1)
+
+    def test_dijkstra_relaxation_counters(self):
+        """
+        Dijkstra intenta cada arista alcanzable una vez por origen.
+        """
+        graph = Graph.from_edges([('A', 'B', 1, 1, 1, 1), ('B', 'C', 1, 1, 1, 1),
+                                  ('A', 'C', 5, 5, 5, 5)])
+        dijkstra_all_pairs(graph)
+        # A recorre 3 aristas, B una y C ninguna; desde A, C mejora dos veces
+        self.assertEqual(STATS.counter('apsp.relaxations_attempted'), 4)
+        self.assertEqual(STATS.counter('apsp.relaxations_succeeded'), 4)
+
+    def test_pipeline_phases(self):
+        """
+        Rutas, cambio de clima y centro quedan registrados.
+        """
+        graph = generate_graph('grid', 16)
+        graph.set_weather_condition('lluvia')
+        all_pairs_shortest_paths(graph)
+        phases = STATS.as_dict()['phases']
+        for name in ('apsp', 'weather.switch', 'graph.csr'):
+            self.assertIn(name, phases)
+
+    def test_metrics_dumper(self):
+        """
+        El volcado periódico deja un archivo JSON con el estado final.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'metrics.json')
+            with MetricsDumper(STATS, filename, interval=0.01):
+                STATS.observe('query', 0.002)
+            with open(filename, encoding='utf-8') as file:
+                data = json.load(file)
+        self.assertEqual(data['latencies']['query']['count'], 1)
+        with self.assertRaises(ValueError):
+            MetricsDumper(STATS, filename, interval=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import random
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph, WEATHER_CONDITIONS
+from src.generators import generate_graph
+from src.floyd_warshall import floyd_warshall, reconstruct_path
+from src.weather_cache import WeatherScenarioCache
+from src.incremental import update_for_changed_edges
+
+INF = float('inf')
+
+class TestGraphTransaction(unittest.TestCase):
+    """
+    Clase de pruebas para las transacciones sobre el grafo.
+    """
+
+    def setUp(self):
+        self.graph = Graph.from_edges([
+            ('A', 'B', 1, 2, 3, 4),
+            ('B', 'C', 1, 2, 3, 4),
+            ('C', 'A', 5, 5, 5, 5),
+        ])
+
+    def test_commit_applies_everything_at_once(self):
+        """
+        Todos los cambios se aplican con un solo incremento de versión.
+        """
+        version = self.graph.version
+        with self.graph.transaction() as batch:
+            batch.remove_edge('a', 'b')
+            batch.add_edge('C', 'D', 2, 2, 2, 2)
+            batch.set_time('B', 'C', 'nieve', 9)
+            batch.add_edge('A', 'B', 7, 7, 7, 7)
+            batch.remove_edge('A', 'B')
+            batch.set_weather_condition('nieve')
+        delta = batch.delta
+        self.assertEqual(self.graph.version, version + 1)
+        self.assertEqual((delta.previous_version, delta.version), (version, version + 1))
+        self.assertEqual(delta.weather, 'nieve')
+        self.assertEqual(delta.edges, {
+            (0, 1): ((1, 2, 3, 4), None),
+            (1, 2): ((1, 2, 3, 4), (1, 2, 9, 4)),
+            (2, 3): (None, (2, 2, 2, 2)),
+        })
+        self.assertEqual(self.graph.adjacency_matrix[1][2], 9)
+        self.assertNotIn(('A', 'B'), self.graph.weather_times)
+
+    def test_invalid_batch_leaves_graph_untouched(self):
+        """
+        Si una operación no es válida no se aplica ninguna.
+        """
+        version = self.graph.version
+        batch = self.graph.transaction()
+        batch.add_edge('A', 'D', 1, 1, 1, 1)
+        batch.remove_edge('B', 'A')
+        batch.set_time('A', 'B', 'granizo', 1)
+        batch.add_edge('A', 'C', -1, 1, 1, 1)
+        batch.set_weather_condition('niebla')
+        self.assertEqual(len(batch.errors()), 4)
+        with self.assertRaises(ValueError):
+            batch.commit()
+        with self.assertRaises(RuntimeError):
+            batch.add_edge('A', 'D', 1, 1, 1, 1)
+        self.assertEqual(self.graph.version, version)
+        self.assertEqual(self.graph.vertices, ['A', 'B', 'C'])
+
+        with self.assertRaises(KeyError):
+            with self.graph.transaction() as batch:
+                batch.remove_edge('A', 'B')
+                raise KeyError('interrumpido')
+        self.assertIsNone(batch.delta)
+        self.assertIn(('A', 'B'), self.graph.weather_times)
+
+    def test_same_weather_clears_regional_weather(self):
+        """
+        Repetir el clima global con clima por región activo se informa en
+        el delta, porque los tiempos actuales cambian.
+        """
+        self.graph.define_region('norte', ['A'])
+        self.graph.set_region_weather('norte', 'tormenta')
+        self.assertEqual(self.graph.adjacency_matrix[0][1], 4)
+        with self.graph.transaction() as batch:
+            batch.set_weather_condition('normal')
+        self.assertEqual(batch.delta.weather, 'normal')
+        self.assertEqual(batch.delta.edges, {})
+        self.assertEqual(self.graph.adjacency_matrix[0][1], 1)
+
+        with self.graph.transaction() as batch:
+            batch.set_weather_condition('normal')
+        self.assertIsNone(batch.delta.weather)
+
+    def assert_matches_full_recompute(self, graph, dist, path, condition):
+        """
+        Compara las matrices con un cálculo completo en la misma condición.
+        """
+        view = graph.weather_view(condition)
+        expected, _ = floyd_warshall(view, engine='python')
+        n = len(graph.vertices)
+        matrix = view.adjacency_matrix
+        for i in range(n):
+            for j in range(n):
+                self.assertAlmostEqual(dist[i][j], expected[i][j])
+                if i != j and expected[i][j] < INF:
+                    route = reconstruct_path(path, i, j)
+                    total = sum(matrix[a][b] for a, b in zip(route, route[1:]))
+                    self.assertAlmostEqual(total, expected[i][j])
+
+    def test_cache_updates_once_per_batch(self):
+        """
+        Un lote de cierres, tramos nuevos y cambios de tiempo deja las
+        matrices de cada clima iguales a un cálculo completo.
+        """
+        random.seed(11)
+        for size in (2, 40):
+            graph = generate_graph('sparse', 80, seed=size)
+            scenarios = WeatherScenarioCache(graph, engine='python')
+            scenarios.precompute()
+            edges = [(graph.vertices[u], graph.vertices[v]) for u, v, _ in graph.edges()]
+            with scenarios.transaction() as batch:
+                for from_vertex, to_vertex in random.sample(edges, size):
+                    choice = random.random()
+                    if choice < 0.4:
+                        batch.remove_edge(from_vertex, to_vertex)
+                    elif choice < 0.7:
+                        batch.set_time(from_vertex, to_vertex, random.choice(WEATHER_CONDITIONS),
+                                       random.uniform(0, 20))
+                    else:
+                        batch.add_edge(to_vertex, from_vertex, *(random.uniform(1, 5) for _ in range(4)))
+                batch.add_edge(graph.vertices[0], 'Nueva', 1, 1, 1, 1)
+            for condition in WEATHER_CONDITIONS:
+                with self.subTest(size=size, condition=condition):
+                    self.assertIn(condition, scenarios.cached_conditions())
+                    self.assert_matches_full_recompute(graph, *scenarios.get(condition), condition)
+
+    def test_large_batch_recomputes_everything(self):
+        """
+        Con un lote grande en proporción al grafo se recalcula todo.
+        """
+        graph = generate_graph('grid', 25, seed=1)
+        dist, path = floyd_warshall(graph, engine='python')
+        changes = [(u, v, weight, weight + 1) for u, v, weight in graph.edges()]
+        for u, v, _, weight in changes:
+            graph.add_edge(graph.vertices[u], graph.vertices[v], weight, weight, weight, weight)
+        updated = update_for_changed_edges(graph, dist, path, changes, engine='python')
+        self.assertIsNot(updated[0], dist)
+        self.assertEqual(updated, floyd_warshall(graph, engine='python'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio principal al path para importar correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph import Graph, WEATHER_CONDITIONS
+from src.floyd_warshall import floyd_warshall
+from src.weather_cache import WeatherScenarioCache
+
+class TestWeatherScenarioCache(unittest.TestCase):
+    """
+    Clase de pruebas para la caché de rutas por condición climática.
+    """
+
+    def setUp(self):
+        """
+        Método que se ejecuta antes de cada prueba.
+
+        Inicializa un grafo donde la ruta más corta cambia con el clima.
+        """
+        self.graph = Graph()
+        self.graph.add_edge("A", "B", 1, 10, 10, 10)
+        self.graph.add_edge("B", "C", 1, 10, 10, 10)
+        self.graph.add_edge("A", "C", 5, 6, 7, 8)
+        self.graph.add_edge("C", "A", 2, 3, 4, 5)
+        self.cache = WeatherScenarioCache(self.graph, engine='python')
+
+    def expected(self, condition):
+        """
+        Calcula desde cero las matrices de una condición.
+        """
+        self.graph.set_weather_condition(condition)
+        return floyd_warshall(self.graph, engine='python')
+
+    def test_switch_reuses_matrices(self):
+        """
+        Prueba que volver a un clima ya calculado reutilice sus matrices.
+        """
+        normal = self.cache.get('normal')
+        self.cache.switch('nieve')
+        self.assertIs(self.cache.switch('normal')[0], normal[0])
+        self.assertEqual(self.cache.cached_conditions(), ['nieve', 'normal'])
+        self.assertIsNone(self.cache.switch('granizo'))
+
+    def test_each_condition_matches_full_recompute(self):
+        """
+        Prueba que cada condición coincida con un cálculo completo.
+        """
+        self.cache.precompute()
+        for condition in WEATHER_CONDITIONS:
+            with self.subTest(condition=condition):
+                cached = self.cache.get(condition)
+                self.assertEqual(cached, self.expected(condition))
+
+    def test_edge_mutations_update_all_conditions(self):
+        """
+        Prueba que agregar y eliminar aristas actualice todas las condiciones.
+        """
+        self.cache.precompute()
+        self.cache.add_edge("B", "D", 1, 1, 1, 1)
+        self.cache.add_edge("A", "C", 9, 1, 9, 1)
+        self.assertTrue(self.cache.remove_edge("b", "c"))
+        for condition in WEATHER_CONDITIONS:
+            with self.subTest(condition=condition):
+                self.assertEqual(self.cache.get(condition)[0], self.expected(condition)[0])
+
+    def test_external_mutation_invalidates(self):
+        """
+        Prueba que modificar el grafo directamente invalide la caché.
+        """
+        self.cache.precompute()
+        self.graph.add_edge("C", "B", 1, 1, 1, 1)
+        self.assertEqual(self.cache.cached_conditions(), [])
+
+    def test_memory_limit(self):
+        """
+        Prueba que la caché respete el límite de memoria.
+        """
+        single = WeatherScenarioCache(self.graph, engine='python')
+        single.get('normal')
+        limit = single.total_bytes()
+        bounded = WeatherScenarioCache(self.graph, engine='python', max_bytes=limit)
+        bounded.precompute()
+        self.assertEqual(bounded.cached_conditions(), ['tormenta'])
+        self.assertLessEqual(bounded.memory_report()['total'], limit)
+
+if __name__ == '__main__':
+    unittest.main()